@@ -1,13 +1,16 @@
 import asyncio
+import bisect
+import functools
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from database import db_manager
 from models import Order
-from task_persistence import save_task_execution
+from task_persistence import TaskData, save_task_execution, save_task_executions_bulk
 import json
 
 logging.basicConfig(level=logging.INFO)
@@ -25,17 +28,71 @@ class TaskExecution:
     orders_processed: int = 0
     missed: bool = False
 
+class MonitorSnapshot(NamedTuple):
+    """Consistent, immutable view of the monitor's system status"""
+    scheduler_running: bool
+    monitored_profiles: Tuple[str, ...]
+    paused_profiles: Tuple[str, ...]
+    task_timeout: int
+    max_history_size: int
+
 class EnhancedOrderMonitor:
     """Enhanced order monitor with missed task detection and recovery"""
     
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
+        self._snapshot_cache: Optional[MonitorSnapshot] = None
         self.is_running = False
         self.monitored_profiles = set()
-        self.task_history: Dict[str, List[TaskExecution]] = {}
+        self.paused_profiles = set()  # Monitored profiles whose job is paused
+        self.task_history: Dict[str, List[TaskExecution]] = {}  # Kept sorted by scheduled_time
+        self._history_epochs: Dict[str, List[float]] = {}  # Parallel scheduled_time epochs for bisect lookups
         self.last_successful_run: Dict[str, datetime] = {}
+        self._resumed_at: Dict[str, datetime] = {}  # Last resume per profile; paused time is not missed time
         self.max_history_size = 100
         self.task_timeout = 300  # 5 minutes timeout per task
+        self.clock = datetime.now  # Time source for task timestamps and gap detection
+    
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+    
+    @is_running.setter
+    def is_running(self, value: bool):
+        self._is_running = value
+        self._snapshot_cache = None
+    
+    @property
+    def task_timeout(self) -> int:
+        return self._task_timeout
+    
+    @task_timeout.setter
+    def task_timeout(self, value: int):
+        self._task_timeout = value
+        self._snapshot_cache = None
+    
+    @property
+    def max_history_size(self) -> int:
+        return self._max_history_size
+    
+    @max_history_size.setter
+    def max_history_size(self, value: int):
+        self._max_history_size = value
+        self._snapshot_cache = None
+    
+    def snapshot(self) -> MonitorSnapshot:
+        """Get the current system status, cached until monitoring state changes"""
+        snapshot = self._snapshot_cache
+        if snapshot is None:
+            snapshot = MonitorSnapshot(
+                scheduler_running=self._is_running,
+                monitored_profiles=tuple(sorted(self.monitored_profiles)),
+                paused_profiles=tuple(sorted(self.paused_profiles)),
+                task_timeout=self._task_timeout,
+                max_history_size=self._max_history_size
+            )
+            self._snapshot_cache = snapshot
+        return snapshot
         
     async def start_monitoring_for_profile(self, profile_name: str, interval_minutes: int = 5):
         """Start enhanced background order monitoring for a specific profile"""
@@ -47,6 +104,7 @@ class EnhancedOrderMonitor:
         # Initialize task history for profile
         if profile_name not in self.task_history:
             self.task_history[profile_name] = []
+            self._history_epochs[profile_name] = []
         
         # Add profile-specific job if not already monitoring this profile
         job_id = f'order_checker_{profile_name}'
@@ -62,6 +120,7 @@ class EnhancedOrderMonitor:
                 misfire_grace_time=60  # Allow 1 minute grace for missed tasks
             )
             self.monitored_profiles.add(profile_name)
+            self._snapshot_cache = None
             logger.info(f"Enhanced order monitoring started for profile {profile_name} - checking every {interval_minutes} minutes")
     
     async def stop_monitoring_for_profile(self, profile_name: str):
@@ -70,25 +129,51 @@ class EnhancedOrderMonitor:
         try:
             self.scheduler.remove_job(job_id)
             self.monitored_profiles.discard(profile_name)
+            self.paused_profiles.discard(profile_name)
+            self._snapshot_cache = None
             logger.info(f"Enhanced order monitoring stopped for profile {profile_name}")
         except Exception as e:
             logger.error(f"Error stopping monitoring for profile {profile_name}: {e}")
     
+    async def pause_profile(self, profile_name: str):
+        """Pause a profile's scheduled order checks, keeping its job, history and the scheduler itself"""
+        job_id = f'order_checker_{profile_name}'
+        try:
+            self.scheduler.pause_job(job_id)
+            self.paused_profiles.add(profile_name)
+            self._snapshot_cache = None
+            logger.info(f"Enhanced order monitoring paused for profile {profile_name}")
+        except Exception as e:
+            logger.error(f"Error pausing monitoring for profile {profile_name}: {e}")
+    
+    async def resume_profile(self, profile_name: str):
+        """Resume a profile's scheduled order checks after pause_profile"""
+        job_id = f'order_checker_{profile_name}'
+        try:
+            self.scheduler.resume_job(job_id)
+            self.paused_profiles.discard(profile_name)
+            self._resumed_at[profile_name] = self.clock()
+            self._snapshot_cache = None
+            logger.info(f"Enhanced order monitoring resumed for profile {profile_name}")
+        except Exception as e:
+            logger.error(f"Error resuming monitoring for profile {profile_name}: {e}")
+    
     async def stop_monitoring(self):
         """Stop all background order monitoring"""
         if self.is_running:
             self.scheduler.shutdown()
-            self.is_running = False
             self.monitored_profiles.clear()
+            self.paused_profiles.clear()
+            self.is_running = False
             logger.info("Enhanced order monitoring stopped")
     
     async def _execute_monitored_task(self, profile_name: str):
         """Execute a monitored task with tracking and error handling"""
-        scheduled_time = datetime.now()
+        scheduled_time = self.clock()
         task_execution = TaskExecution(
             profile_name=profile_name,
             scheduled_time=scheduled_time,
-            actual_start_time=datetime.now()
+            actual_start_time=self.clock()
         )
         
         try:
@@ -113,7 +198,7 @@ class EnhancedOrderMonitor:
             logger.info(f"Successfully completed order check for {profile_name}")
             
             # Update last successful run time
-            self.last_successful_run[profile_name] = datetime.now()
+            self.last_successful_run[profile_name] = self.clock()
             
             # Also check individual active orders from database for this profile
             active_orders = db_manager.get_active_orders_by_profile(profile_name)
@@ -133,7 +218,7 @@ class EnhancedOrderMonitor:
             logger.error(f"Error in enhanced order check for profile {profile_name}: {e}")
         
         finally:
-            task_execution.completion_time = datetime.now()
+            task_execution.completion_time = self.clock()
             
             # Close the driver when done
             try:
@@ -152,8 +237,12 @@ class EnhancedOrderMonitor:
             # First run for this profile
             return
         
+        # Intervals skipped while the profile was paused are not missed tasks
         last_run = self.last_successful_run[profile_name]
-        current_time = datetime.now()
+        resumed_at = self._resumed_at.get(profile_name)
+        if resumed_at and resumed_at > last_run:
+            last_run = resumed_at
+        current_time = self.clock()
         time_since_last_run = current_time - last_run
         
         # If more than 10 minutes have passed since last successful run, consider tasks missed
@@ -167,15 +256,16 @@ class EnhancedOrderMonitor:
                 logger.warning(f"Detected {missed_intervals} missed task intervals for profile {profile_name}")
                 
                 # Record missed tasks
-                for i in range(missed_intervals):
-                    missed_time = last_run + (expected_interval * (i + 1))
-                    missed_task = TaskExecution(
+                missed_tasks = [
+                    TaskExecution(
                         profile_name=profile_name,
-                        scheduled_time=missed_time,
+                        scheduled_time=last_run + (expected_interval * (i + 1)),
                         missed=True,
                         error_message="Task execution was missed"
                     )
-                    self._record_task_execution(missed_task)
+                    for i in range(missed_intervals)
+                ]
+                self._record_missed_tasks(profile_name, missed_tasks)
                 
                 # Attempt catch-up logic
                 await self._perform_catch_up_check(profile_name, time_since_last_run)
@@ -195,7 +285,7 @@ class EnhancedOrderMonitor:
             for order in active_orders:
                 try:
                     # Check if order might have completed during the gap
-                    order_age = datetime.now() - order.created_at
+                    order_age = self.clock() - order.created_at
                     
                     # If order is older than the gap, it might have completed
                     if order_age > time_gap:
@@ -210,35 +300,61 @@ class EnhancedOrderMonitor:
         except Exception as e:
             logger.error(f"Error performing catch-up check for {profile_name}: {e}")
     
-    def _record_task_execution(self, task_execution: TaskExecution):
-        """Record task execution in history and database"""
+    def _add_to_history(self, task_execution: TaskExecution):
+        """Add a task execution to the in-memory history"""
         profile_name = task_execution.profile_name
         
-        # Keep in-memory history for quick access
-        if profile_name not in self.task_history:
-            self.task_history[profile_name] = []
+        # Keep in-memory history for quick access, sorted by scheduled time
+        # (missed tasks are recorded after the fact, so inserts are not always appends)
+        history = self.task_history.setdefault(profile_name, [])
+        epochs = self._history_epochs.setdefault(profile_name, [])
         
-        self.task_history[profile_name].append(task_execution)
+        scheduled_epoch = task_execution.scheduled_time.timestamp()
+        index = bisect.bisect_right(epochs, scheduled_epoch)
+        epochs.insert(index, scheduled_epoch)
+        history.insert(index, task_execution)
         
         # Maintain history size limit
-        if len(self.task_history[profile_name]) > self.max_history_size:
-            self.task_history[profile_name] = self.task_history[profile_name][-self.max_history_size:]
+        excess = len(history) - self.max_history_size
+        if excess > 0:
+            del history[:excess]
+            del epochs[:excess]
+    
+    @staticmethod
+    def _task_data(task_execution: TaskExecution) -> TaskData:
+        """Convert a TaskExecution into the TaskData used by task_persistence"""
+        return TaskData(
+            profile_name=task_execution.profile_name,
+            scheduled_time=task_execution.scheduled_time,
+            actual_start_time=task_execution.actual_start_time,
+            completion_time=task_execution.completion_time,
+            success=task_execution.success,
+            missed=task_execution.missed,
+            error_message=task_execution.error_message,
+            orders_processed=task_execution.orders_processed
+        )
+    
+    def _record_missed_tasks(self, profile_name: str, missed_tasks: List[TaskExecution]):
+        """Record several missed tasks in history and save them to the database in one transaction"""
+        for missed_task in missed_tasks:
+            self._add_to_history(missed_task)
+            logger.warning(f"Recorded missed task for {profile_name} at {missed_task.scheduled_time}")
+        
+        try:
+            saved = save_task_executions_bulk([self._task_data(task) for task in missed_tasks])
+            if saved != len(missed_tasks):
+                logger.warning(f"Failed to save missed tasks to database for {profile_name}")
+        except Exception as e:
+            logger.error(f"Error saving missed tasks to database: {e}")
+    
+    def _record_task_execution(self, task_execution: TaskExecution):
+        """Record task execution in history and database"""
+        profile_name = task_execution.profile_name
+        self._add_to_history(task_execution)
         
         # Save to database for persistence
         try:
-            task_data = {
-                'profile_name': task_execution.profile_name,
-                'scheduled_time': task_execution.scheduled_time,
-                'actual_start_time': task_execution.actual_start_time,
-                'completion_time': task_execution.completion_time,
-                'success': task_execution.success,
-                'missed': task_execution.missed,
-                'error_message': task_execution.error_message,
-                'orders_processed': task_execution.orders_processed,
-                'task_type': 'order_check'
-            }
-            
-            task_id = save_task_execution(task_data)
+            task_id = save_task_execution(self._task_data(task_execution))
             if task_id:
                 logger.debug(f"Saved task execution {task_id} to database for {profile_name}")
             else:
@@ -434,49 +550,70 @@ class EnhancedOrderMonitor:
         
         for profile in profiles:
             profile_history = self.task_history.get(profile, [])
-            recent_tasks = [t for t in profile_history if t.scheduled_time > datetime.now() - timedelta(hours=1)]
             
-            successful_tasks = [t for t in recent_tasks if t.success and not t.missed]
-            failed_tasks = [t for t in recent_tasks if not t.success and not t.missed]
-            missed_tasks = [t for t in recent_tasks if t.missed]
+            # Count outcomes of the last hour in a single pass (history is sorted by scheduled time)
+            recent_start = bisect.bisect_right(self._history_epochs.get(profile, []), (self.clock() - timedelta(hours=1)).timestamp())
+            successful_tasks = failed_tasks = missed_tasks = 0
+            for task in profile_history[recent_start:]:
+                if task.missed:
+                    missed_tasks += 1
+                elif task.success:
+                    successful_tasks += 1
+                else:
+                    failed_tasks += 1
             
             last_successful = self.last_successful_run.get(profile)
             time_since_last_success = None
             if last_successful:
-                time_since_last_success = (datetime.now() - last_successful).total_seconds()
+                time_since_last_success = (self.clock() - last_successful).total_seconds()
             
             health_status["profiles"][profile] = {
                 "last_successful_run": last_successful.isoformat() if last_successful else None,
                 "time_since_last_success_seconds": time_since_last_success,
-                "recent_successful_tasks": len(successful_tasks),
-                "recent_failed_tasks": len(failed_tasks),
-                "recent_missed_tasks": len(missed_tasks),
+                "recent_successful_tasks": successful_tasks,
+                "recent_failed_tasks": failed_tasks,
+                "recent_missed_tasks": missed_tasks,
                 "total_task_history": len(profile_history),
-                "is_healthy": len(missed_tasks) == 0 and len(failed_tasks) < len(successful_tasks)
+                "is_healthy": missed_tasks == 0 and failed_tasks < successful_tasks
             }
         
         return health_status
     
     def get_task_execution_history(self, profile_name: str, limit: int = 20) -> List[dict]:
         """Get task execution history for a profile"""
+        return list(self.iter_task_execution_history(profile_name, limit))
+    
+    def iter_task_execution_history(self, profile_name: str, limit: int = 20) -> Iterator[dict]:
+        """Lazily yield serialized task execution history for a profile, oldest first"""
+        # Slice up front so later inserts/trims don't affect an in-progress iteration
+        for task in self.task_history.get(profile_name, [])[-limit:]:
+            yield self._serialize_task_execution(task)
+    
+    def get_missed_since(self, profile_name: str, cutoff_epoch: float) -> List[dict]:
+        """Get missed tasks for a profile scheduled at or after cutoff_epoch (seconds since epoch)"""
         if profile_name not in self.task_history:
             return []
         
-        history = self.task_history[profile_name][-limit:]
-        
+        start = bisect.bisect_left(self._history_epochs[profile_name], cutoff_epoch)
         return [
-            {
-                "scheduled_time": task.scheduled_time.isoformat(),
-                "actual_start_time": task.actual_start_time.isoformat() if task.actual_start_time else None,
-                "completion_time": task.completion_time.isoformat() if task.completion_time else None,
-                "success": task.success,
-                "missed": task.missed,
-                "error_message": task.error_message,
-                "orders_processed": task.orders_processed,
-                "duration_seconds": (task.completion_time - task.actual_start_time).total_seconds() if task.completion_time and task.actual_start_time else None
-            }
-            for task in history
+            self._serialize_task_execution(task)
+            for task in self.task_history[profile_name][start:]
+            if task.missed
         ]
+    
+    @staticmethod
+    def _serialize_task_execution(task: TaskExecution) -> dict:
+        """Convert a TaskExecution into an API-friendly dict"""
+        return {
+            "scheduled_time": task.scheduled_time.isoformat(),
+            "actual_start_time": task.actual_start_time.isoformat() if task.actual_start_time else None,
+            "completion_time": task.completion_time.isoformat() if task.completion_time else None,
+            "success": task.success,
+            "missed": task.missed,
+            "error_message": task.error_message,
+            "orders_processed": task.orders_processed,
+            "duration_seconds": (task.completion_time - task.actual_start_time).total_seconds() if task.completion_time and task.actual_start_time else None
+        }
 
 class QueueProcessor:
     """Processes queued bracket strategy executions per-profile"""
@@ -486,6 +623,7 @@ class QueueProcessor:
         self.is_running = False
         self.processing_profiles: Dict[str, bool] = {}
         self._check_interval_seconds = 10
+        self.clock = datetime.now  # Time source for the stale-item cutoff
 
     async def start(self):
         """Start the queue processing scheduler"""
@@ -519,7 +657,7 @@ class QueueProcessor:
         from models import QueuedExecution
         db = db_manager.SessionLocal()
         try:
-            stale_cutoff = datetime.now() - timedelta(minutes=10)
+            stale_cutoff = self.clock() - timedelta(minutes=10)
             stale_items = db.query(QueuedExecution).filter(
                 QueuedExecution.status == "IN_PROGRESS",
                 QueuedExecution.started_at < stale_cutoff
@@ -674,10 +812,28 @@ async def check_orders_for_profile(profile_name: str):
     """Manually trigger order check for a specific profile"""
     await enhanced_order_monitor._execute_monitored_task(profile_name)
 
-def get_background_task_health(profile_name: str = None) -> dict:
-    """Get health status of background tasks"""
+# Health snapshots are reused within the same half-second bucket so that
+# bursts of dashboard polling share one computation
+HEALTH_CACHE_BUCKETS_PER_SECOND = 2
+
+@functools.lru_cache(maxsize=64)
+def _health_cached(profile_name: Optional[str], bucket: int) -> dict:
+    """Compute health status; bucket only serves as part of the cache key"""
     return enhanced_order_monitor.get_task_health_status(profile_name)
 
+def get_background_task_health(profile_name: str = None) -> dict:
+    """Get health status of background tasks (cached for up to 500ms)"""
+    bucket = int(time.monotonic() * HEALTH_CACHE_BUCKETS_PER_SECOND)
+    return _health_cached(profile_name, bucket)
+
 def get_task_execution_history(profile_name: str, limit: int = 20) -> List[dict]:
     """Get task execution history for a profile"""
     return enhanced_order_monitor.get_task_execution_history(profile_name, limit)
+
+def iter_task_execution_history(profile_name: str, limit: int = 20) -> Iterator[dict]:
+    """Lazily yield task execution history for a profile"""
+    return enhanced_order_monitor.iter_task_execution_history(profile_name, limit)
+
+def get_missed_tasks_since(profile_name: str, cutoff_epoch: float) -> List[dict]:
+    """Get missed tasks for a profile scheduled at or after cutoff_epoch"""
+    return enhanced_order_monitor.get_missed_since(profile_name, cutoff_epoch)
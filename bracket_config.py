@@ -3,6 +3,9 @@ Bracket configuration for the multi-order system.
 This file contains all bracket-related parameters that can be easily modified.
 """
 
+from bisect import bisect_right
+from functools import cache
+
 # Market cap ranges for each bracket
 BRACKET_RANGES = {
     1: {"min": 20000, "max": 199999},
@@ -15,13 +18,13 @@ BRACKET_RANGES = {
 # Trade sizes for each bracket_id (order within bracket)
 # These are percentages of the total investment amount
 # Using distinct sizes for easier order identification: ~34.48%, ~32.26%, ~16.95%, ~16.39%
-TRADE_SIZES = [1/2.9, 1/3.1, 1/5.9, 1/6.1]  # bracket_id 1, 2, 3, 4
+TRADE_SIZES = (1/2.9, 1/3.1, 1/5.9, 1/6.1)  # bracket_id 1, 2, 3, 4
 
 # Take profit percentages for each bracket_id
-TAKE_PROFIT_PERCENTAGES = [1.12, 0.89, 0.81, 0.56]  # 112%, 89%, 81%, 56%
+TAKE_PROFIT_PERCENTAGES = (1.12, 0.89, 0.81, 0.56)  # 112%, 89%, 81%, 56%
 
 # Stop loss percentages for each bracket_id
-STOP_LOSS_PERCENTAGES = [-0.1622, -0.4046, -0.6623,-0.7744]
+STOP_LOSS_PERCENTAGES = (-0.1622, -0.4046, -0.6623, -0.7744)
 
 # Bracket-specific configurations
 BRACKET_CONFIG = {
@@ -52,27 +55,18 @@ BRACKET_CONFIG = {
     }
 }
 
+# Lower bound of brackets 2-5 plus the upper bound of bracket 5, in ascending order
+_BRACKET_THRESHOLDS = tuple(BRACKET_RANGES[bracket]["min"] for bracket in range(2, 6)) + (BRACKET_RANGES[5]["max"] + 1,)
+
 def calculate_bracket(market_cap: float) -> int:
     """Calculate bracket based on market cap"""
-    if market_cap >= 20000 and market_cap < 200000:
-        return 1
-    elif market_cap >= 200000 and market_cap < 2000000:
-        return 2
-    elif market_cap >= 2000000 and market_cap < 20000000:
-        return 3
-    elif market_cap >= 20000000 and market_cap < 120000000:
-        return 4
-    elif market_cap >= 120000000 and market_cap < 1200000000:
-        return 5
-    else:
-        # Default to bracket 1 for market caps outside defined ranges
-        return 1
+    index = bisect_right(_BRACKET_THRESHOLDS, market_cap)
+    if index < len(_BRACKET_THRESHOLDS):
+        return index + 1
+    # Default to bracket 1 for market caps outside defined ranges (NaN also ends up here)
+    return 1
 
-def get_bracket_info(bracket: int) -> dict:
-    """Get bracket information"""
-    if bracket not in BRACKET_CONFIG:
-        return BRACKET_CONFIG[1]  # Default to bracket 1
-    
+def _build_bracket_info(bracket: int) -> dict:
     config = BRACKET_CONFIG[bracket]
     range_info = BRACKET_RANGES[bracket]
     
@@ -85,6 +79,40 @@ def get_bracket_info(bracket: int) -> dict:
         "entries": config["entries"]
     }
 
+# Bracket information for each configured bracket, built once at import
+_BRACKET_INFO = {bracket: _build_bracket_info(bracket) for bracket in BRACKET_CONFIG}
+
+def get_bracket_info(bracket: int) -> dict:
+    """Get bracket information"""
+    if bracket not in _BRACKET_INFO:
+        return BRACKET_CONFIG[1]  # Default to bracket 1
+    
+    # Shallow copy so callers can't alter the shared entry
+    return _BRACKET_INFO[bracket].copy()
+
+def _build_order_templates(bracket: int) -> tuple:
+    """Per-bracket_id values of calculate_order_parameters that don't depend on the amount"""
+    config = BRACKET_CONFIG[bracket]
+    templates = []
+    
+    for i in range(4):  # bracket_ids 1-4
+        # Entry price (use market cap values directly)
+        entry_price = config["entries"][i]
+        
+        # Take profit calculation (use market cap values directly)
+        take_profit_price = entry_price + entry_price * TAKE_PROFIT_PERCENTAGES[i]
+        
+        # Stop loss (use market cap value directly)
+        stop_loss_price = config["stop_loss_market_cap"]
+        
+        templates.append((i + 1, entry_price, take_profit_price, stop_loss_price,
+                          TRADE_SIZES[i], TAKE_PROFIT_PERCENTAGES[i]))
+    
+    return tuple(templates)
+
+# Everything but the trade amount is fixed per bracket, so it is computed once at import
+_ORDER_TEMPLATES = {bracket: _build_order_templates(bracket) for bracket in BRACKET_CONFIG}
+
 def calculate_order_parameters(bracket: int, total_amount: float, current_price: float = None) -> list:
     """
     Calculate order parameters for all bracket_ids within a bracket
@@ -97,44 +125,30 @@ def calculate_order_parameters(bracket: int, total_amount: float, current_price:
     Returns:
         List of order parameters for bracket_ids 1-4
     """
-    if bracket not in BRACKET_CONFIG:
+    if bracket not in _ORDER_TEMPLATES:
         bracket = 1  # Default to bracket 1
     
-    config = BRACKET_CONFIG[bracket]
-    orders = []
-    
-    for i in range(4):  # bracket_ids 1-4
-        bracket_id = i + 1
-        
-        # Calculate trade size (amount)
-        trade_amount = total_amount * TRADE_SIZES[i]
-        
-        # Entry price (use market cap values directly)
-        entry_market_cap = config["entries"][i]
-        entry_price = entry_market_cap  # Use market cap as entry target
-        
-        # Take profit calculation (use market cap values directly)
-        take_profit_multiplier = TAKE_PROFIT_PERCENTAGES[i]
-        take_profit_price = entry_price + entry_price * take_profit_multiplier
-        
-        # Stop loss calculation (use market cap value directly)
-        stop_loss_market_cap = config["stop_loss_market_cap"]
-        stop_loss_price = stop_loss_market_cap  # Use market cap as stop loss target
-        
-        orders.append({
+    return [
+        {
             "bracket_id": bracket_id,
             "entry_price": entry_price,
             "take_profit": take_profit_price,
             "stop_loss": stop_loss_price,
-            "amount": trade_amount,
-            "trade_size_pct": TRADE_SIZES[i],
-            "take_profit_pct": TAKE_PROFIT_PERCENTAGES[i]
-        })
-    
-    return orders
+            "amount": total_amount * trade_size,
+            "trade_size_pct": trade_size,
+            "take_profit_pct": take_profit_pct
+        }
+        for bracket_id, entry_price, take_profit_price, stop_loss_price, trade_size, take_profit_pct
+        in _ORDER_TEMPLATES[bracket]
+    ]
 
-def validate_bracket_config():
-    """Validate that the bracket configuration is consistent"""
+@cache
+def validate_bracket_config() -> tuple:
+    """Validate that the bracket configuration is consistent
+    
+    The configuration is fixed at import, so the result is cached; call
+    validate_bracket_config.cache_clear() after changing it at runtime.
+    """
     errors = []
     
     # Check that all brackets have the required fields
@@ -166,7 +180,7 @@ def validate_bracket_config():
     if abs(total_trade_size - 1.0) > 0.001:
         errors.append(f"TRADE_SIZES should sum to 1.0, got {total_trade_size}")
     
-    return errors
+    return tuple(errors)
 
 import logging as _logging
 _logger = _logging.getLogger(__name__)
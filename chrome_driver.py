@@ -17,6 +17,7 @@ logger = logging.getLogger(__name__)
 class ChromeDriverManager:
     def __init__(self):
         self.drivers = {}  # Store active drivers by profile name
+        self.waits = {}  # Reusable WebDriverWaits by (profile name, timeout)
     
     def get_driver(self, profile_name: str):
         """Get or create a Chrome driver for the specified profile"""
@@ -54,11 +55,22 @@ class ChromeDriverManager:
         self.drivers[profile_name] = driver
         return driver
     
+    def get_wait(self, profile_name: str, timeout: float = 10) -> WebDriverWait:
+        """Get a reusable WebDriverWait on the profile's driver"""
+        key = (profile_name, timeout)
+        wait = self.waits.get(key)
+        if wait is None:
+            wait = self.waits[key] = WebDriverWait(self.get_driver(profile_name), timeout)
+        return wait
+    
     def close_driver(self, profile_name: str):
         """Close driver for specific profile"""
         if profile_name in self.drivers:
             self.drivers[profile_name].quit()
             del self.drivers[profile_name]
+        # Waits are bound to the closed driver
+        for key in [key for key in self.waits if key[0] == profile_name]:
+            del self.waits[key]
     
     def close_all_drivers(self):
         """Close all active drivers"""
@@ -38,6 +38,9 @@ class Config:
     API_HOST = "0.0.0.0"
     API_PORT = 8000
     API_RELOAD = False  # Disabled: auto-reload causes issues with log/db file changes
+    # Event loop / HTTP parser implementations for uvicorn (uvloop is not available on Windows)
+    API_LOOP = "asyncio" if sys.platform == "win32" else "uvloop"
+    API_HTTP = "httptools"
 
     # Chrome profiles configuration
     CHROME_PROFILES = {
@@ -0,0 +1,83 @@
+"""
+Marks the project root for pytest.
+
+pytest puts this directory on sys.path while loading this file, so the test
+modules import the application modules directly without adjusting sys.path.
+
+It also holds the shared database fixtures: the schema is created once per
+session and the canonical test coins/orders are seeded once per module.
+"""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def _schema():
+    """Create all database tables once for the whole test session"""
+    from database import create_tables
+
+    create_tables()
+
+
+@pytest.fixture(scope="module")
+def seeded_db(_schema):
+    """Seed the canonical test coins and orders once per module, returning the two coins"""
+    from test_enhanced_order_processing import setup_test_data
+
+    test_coin_1, test_coin_2 = setup_test_data()
+    if test_coin_1 is None or test_coin_2 is None:
+        pytest.fail("Failed to seed test data")
+    return test_coin_1, test_coin_2
+
+
+@pytest.fixture
+def db_savepoint(_schema):
+    """Route db_manager through one outer transaction that is rolled back after the test
+
+    Sessions join the transaction through a SAVEPOINT, so their commits only
+    release the savepoint and nothing the test writes outlives it.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    import database
+    from database import DATABASE_URL, db_manager
+
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+    if engine.dialect.name == "sqlite":
+        # Same WAL/relaxed-sync pragmas as the application engine, so commits append instead of fsyncing
+        event.listen(engine, "connect", database._set_sqlite_pragmas)
+
+        # pysqlite's own transaction handling breaks SAVEPOINT, so let SQLAlchemy emit BEGIN
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session_factory = sessionmaker(
+        autocommit=False, autoflush=False, bind=connection,
+        join_transaction_mode="create_savepoint"
+    )
+    try:
+        with patch.object(db_manager, "SessionLocal", session_factory):
+            yield session_factory
+    finally:
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Close the pooled database connections once all tests have run"""
+    # Only if a test actually imported the database module
+    database = sys.modules.get("database")
+    if database is not None:
+        database.engine.dispose()
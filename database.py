@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 from models import Base, Order, Profile, Coin, QueuedExecution
 from bracket_config import (
@@ -6,9 +7,11 @@ from bracket_config import (
     BRACKET_CONFIG, BRACKET_RANGES, TRADE_SIZES, TAKE_PROFIT_PERCENTAGES
 )
 from config import config
-from typing import List, Optional, Dict, Any, Generator
+from typing import List, Optional, Dict, Any, Generator, Iterable
 from contextlib import contextmanager
 import os
+import time
+import orjson
 import logging
 from datetime import datetime
 
@@ -17,7 +20,29 @@ logger = logging.getLogger(__name__)
 
 # Database configuration - use config for absolute path
 DATABASE_URL = config.DATABASE_URL
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    # Keep a warm set of connections for the many short db_manager sessions
+    # (file-backed SQLite uses QueuePool): 5 kept open, up to 20 under load
+    pool_size=5,
+    max_overflow=15,
+    # JSON columns are encoded/decoded with orjson
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL journaling so commits are cheaper and readers don't block on writers"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # Read pages through a 256 MB memory map
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
@@ -81,8 +106,13 @@ def init_profiles():
         db.close()
 
 class DatabaseManager:
+    # API key -> Profile lookups are reused for this many seconds (authentication runs on every request)
+    PROFILE_CACHE_TTL_SECONDS = 30
+    PROFILE_CACHE_MAX_SIZE = 256
+    
     def __init__(self):
         self.SessionLocal = SessionLocal
+        self._profile_cache: Dict[str, tuple] = {}  # api_key -> (expires_at, detached Profile)
     
     def create_order(self, order_data: dict) -> Order:
         """Create a new order"""
@@ -99,6 +129,22 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def bulk_create_orders(self, orders_data: List[dict]) -> int:
+        """Create several orders in one transaction, returning how many were created"""
+        if not orders_data:
+            return 0
+        
+        db = self.SessionLocal()
+        try:
+            db.bulk_insert_mappings(Order, orders_data)
+            db.commit()
+            return len(orders_data)
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    
     def get_active_orders(self) -> List[Order]:
         """Get all active orders"""
         db = self.SessionLocal()
@@ -107,6 +153,29 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def count_active_orders(self) -> int:
+        """Count active orders without loading them"""
+        db = self.SessionLocal()
+        try:
+            return db.query(func.count(Order.id)).filter(Order.status == "ACTIVE").scalar()
+        finally:
+            db.close()
+    
+    def iter_active_order_triggers(self, batch_size: int = 200) -> Generator[tuple, None, None]:
+        """Yield (id, trigger_condition, updated_at) for each active order, fetched in batches
+        
+        Only those three columns are selected, so no Order objects are built.
+        """
+        db = self.SessionLocal()
+        try:
+            rows = db.query(Order.id, Order.trigger_condition, Order.updated_at).filter(
+                Order.status == "ACTIVE"
+            ).order_by(Order.id).yield_per(batch_size)
+            for row in rows:
+                yield tuple(row)
+        finally:
+            db.close()
+    
     def update_order_status(self, order_id: int, status: str) -> bool:
         """Update order status with proper timestamp handling"""
         db = self.SessionLocal()
@@ -129,17 +198,42 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def bulk_update_order_status(self, order_ids: List[int], status: str) -> List[int]:
+        """Update the status of several orders in one UPDATE, returning the ids that exist and were updated"""
+        if not order_ids:
+            return []
+        
+        db = self.SessionLocal()
+        try:
+            updated_ids = [order_id for (order_id,) in db.query(Order.id).filter(Order.id.in_(order_ids))]
+            if updated_ids:
+                now = datetime.now()
+                values = {Order.status: status, Order.updated_at: now}
+                
+                # Set completed_at when marking as COMPLETED
+                if status == "COMPLETED":
+                    values[Order.completed_at] = now
+                
+                db.query(Order).filter(Order.id.in_(updated_ids)).update(values, synchronize_session=False)
+                db.commit()
+            return updated_ids
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    
     def update_order_trigger_condition(self, order_id: int, trigger_condition: str) -> bool:
         """Update order trigger condition with timestamp"""
         db = self.SessionLocal()
         try:
-            order = db.query(Order).filter(Order.id == order_id).first()
-            if order:
-                order.trigger_condition = trigger_condition
-                order.updated_at = datetime.now()
-                db.commit()
-                return True
-            return False
+            # One UPDATE; the order doesn't need to be loaded first
+            updated = db.query(Order).filter(Order.id == order_id).update(
+                {Order.trigger_condition: trigger_condition, Order.updated_at: datetime.now()},
+                synchronize_session=False
+            )
+            db.commit()
+            return updated > 0
         except Exception as e:
             db.rollback()
             raise e
@@ -199,6 +293,7 @@ class DatabaseManager:
                     from datetime import datetime
                     profile.last_login = datetime.now()
                 db.commit()
+                self._profile_cache.clear()
                 return True
             return False
         except Exception as e:
@@ -208,15 +303,28 @@ class DatabaseManager:
             db.close()
     
     def get_profile_by_api_key(self, api_key: str) -> Optional[Profile]:
-        """Get profile by API key"""
+        """Get profile by API key (active profiles are cached for PROFILE_CACHE_TTL_SECONDS)"""
+        now = time.monotonic()
+        cached = self._profile_cache.get(api_key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
         db = self.SessionLocal()
         try:
-            return db.query(Profile).filter(
+            profile = db.query(Profile).filter(
                 Profile.api_key == api_key,
                 Profile.is_active == True
             ).first()
         finally:
             db.close()
+        
+        if profile:
+            if len(self._profile_cache) >= self.PROFILE_CACHE_MAX_SIZE:
+                self._profile_cache.clear()
+            self._profile_cache[api_key] = (now + self.PROFILE_CACHE_TTL_SECONDS, profile)
+        else:
+            self._profile_cache.pop(api_key, None)
+        return profile
     
     def get_active_orders_by_profile(self, profile_name: str) -> List[Order]:
         """Get active orders for a specific profile"""
@@ -229,6 +337,18 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def get_active_orders_page(self, profile_name: str, limit: int = 100, after_id: int = 0) -> List[Order]:
+        """Get one page of active orders for a profile using keyset pagination on id"""
+        db = self.SessionLocal()
+        try:
+            return db.query(Order).filter(
+                Order.profile_name == profile_name,
+                Order.status == "ACTIVE",
+                Order.id > after_id
+            ).order_by(Order.id).limit(limit).all()
+        finally:
+            db.close()
+    
     def validate_api_key(self, api_key: str) -> bool:
         """Validate if API key exists and is active"""
         profile = self.get_profile_by_api_key(api_key)
@@ -286,6 +406,14 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def get_coins_page(self, limit: int = 100, after_id: int = 0) -> List[Coin]:
+        """Get one page of coins using keyset pagination on id"""
+        db = self.SessionLocal()
+        try:
+            return db.query(Coin).filter(Coin.id > after_id).order_by(Coin.id).limit(limit).all()
+        finally:
+            db.close()
+    
     # Enhanced order methods
     def create_order_with_coin(self, address: str, order_data: Dict[str, Any]) -> Order:
         """Create a new order with coin relationship"""
@@ -319,6 +447,42 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def create_or_update_coins(self, coins_data: Dict[str, Dict[str, Any]]) -> Dict[str, Coin]:
+        """Create or update several coins (address -> data) in one upsert, returning them by address
+        
+        Like create_or_update_coin, None values never overwrite existing data.
+        """
+        if not coins_data:
+            return {}
+        
+        db = self.SessionLocal()
+        try:
+            # Multi-row VALUES need the same columns in every row, so rows are grouped by
+            # the columns they set; columns a row leaves out keep their defaults on insert
+            rows_by_columns: Dict[tuple, List[Dict[str, Any]]] = {}
+            for address, data in coins_data.items():
+                values = {key: value for key, value in data.items() if key != "address" and key in Coin.__table__.c}
+                # The address always comes from the mapping key
+                rows_by_columns.setdefault(tuple(sorted(values)), []).append({**values, "address": address})
+            
+            for columns, rows in rows_by_columns.items():
+                stmt = sqlite_insert(Coin).values(rows)
+                set_ = {
+                    column: func.coalesce(getattr(stmt.excluded, column), getattr(Coin, column))
+                    for column in columns
+                }
+                set_["last_updated"] = datetime.now()
+                db.execute(stmt.on_conflict_do_update(index_elements=["address"], set_=set_))
+            db.commit()
+            
+            coins = db.query(Coin).filter(Coin.address.in_(list(coins_data))).all()
+            return {coin.address: coin for coin in coins}
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+    
     def get_orders_by_coin(self, coin_id: int) -> List[Order]:
         """Get all orders for a specific coin"""
         db = self.SessionLocal()
@@ -327,6 +491,21 @@ class DatabaseManager:
         finally:
             db.close()
     
+    def get_orders_by_coin_ids(self, coin_ids: Iterable[int]) -> Dict[int, List[Order]]:
+        """Get all orders for several coins in one query, grouped by coin id"""
+        orders_by_coin = {coin_id: [] for coin_id in coin_ids}
+        if not orders_by_coin:
+            return orders_by_coin
+        
+        db = self.SessionLocal()
+        try:
+            orders = db.query(Order).filter(Order.coin_id.in_(list(orders_by_coin))).order_by(Order.id).all()
+            for order in orders:
+                orders_by_coin[order.coin_id].append(order)
+            return orders_by_coin
+        finally:
+            db.close()
+    
     def get_active_orders_by_profile_with_coins(self, profile_name: str) -> List[Order]:
         """Get active orders with coin details for a specific profile"""
         db = self.SessionLocal()
@@ -368,23 +547,26 @@ class DatabaseManager:
         """Get the next available bracket_id (1-4) for a coin and profile"""
         db = self.SessionLocal()
         try:
-            # Get all active orders for this coin and profile
-            active_orders = db.query(Order).filter(
+            # Get the bracket_ids of all active orders for this coin and profile
+            used_bracket_ids = db.query(Order.bracket_id).filter(
                 Order.coin_id == coin_id,
                 Order.profile_name == profile_name,
-                Order.status == "ACTIVE"
+                Order.status == "ACTIVE",
+                Order.bracket_id.between(1, 4)
             ).all()
             
-            # Get used bracket_ids
-            used_bracket_ids = {order.bracket_id for order in active_orders}
+            # Bit (bracket_id - 1) is set for every used bracket_id
+            used_mask = 0
+            for (bracket_id,) in used_bracket_ids:
+                used_mask |= 1 << (bracket_id - 1)
             
-            # Find the first available bracket_id (1-4)
-            for bracket_id in range(1, 5):
-                if bracket_id not in used_bracket_ids:
-                    return bracket_id
+            # If all bracket_ids are used, return None
+            free_mask = ~used_mask & 0xF
+            if not free_mask:
+                return None
             
-            # If all bracket_ids are used, return None or raise an exception
-            return None
+            # The lowest free bit is the first available bracket_id (1-4)
+            return (free_mask & -free_mask).bit_length()
         finally:
             db.close()
     
@@ -594,14 +776,25 @@ class DatabaseManager:
         finally:
             db.close()
     
-    def get_active_orders_summary(self, profile_name: str) -> dict:
-        """Get a summary of active orders grouped by coin and bracket_id"""
+    def get_active_orders_summary(self, profile_name: str, limit: Optional[int] = None, after_coin_id: int = 0) -> dict:
+        """Get a summary of active orders grouped by coin and bracket_id
+        
+        When limit is given, only the first `limit` coins with id > after_coin_id are included.
+        """
         db = self.SessionLocal()
         try:
-            orders = db.query(Order).filter(
+            query = db.query(Order).filter(
                 Order.profile_name == profile_name,
-                Order.status == "ACTIVE"
-            ).all()
+                Order.status == "ACTIVE",
+                Order.coin_id > after_coin_id
+            )
+            if limit is not None:
+                coin_ids = [
+                    row[0] for row in query.with_entities(Order.coin_id).distinct()
+                    .order_by(Order.coin_id).limit(limit).all()
+                ]
+                query = query.filter(Order.coin_id.in_(coin_ids))
+            orders = query.order_by(Order.coin_id, Order.bracket_id).all()
             
             summary = {}
             for order in orders:
@@ -670,38 +863,25 @@ class DatabaseManager:
         """Clear all coins and orders for a specific profile"""
         db = self.SessionLocal()
         try:
-            # Get all orders for this profile
-            orders_to_clear = db.query(Order).filter(
-                Order.profile_name == profile_name
-            ).all()
-            
-            orders_cleared = len(orders_to_clear)
-            
-            # Get unique coin IDs from these orders
-            coin_ids_with_orders = set(order.coin_id for order in orders_to_clear)
-            
-            # Delete all orders for this profile
-            for order in orders_to_clear:
-                db.delete(order)
+            # Coins touched by this profile's orders (ids only, no ORM objects)
+            coin_ids_with_orders = [
+                row[0] for row in db.query(Order.coin_id).filter(
+                    Order.profile_name == profile_name
+                ).distinct().all()
+            ]
             
-            # Check which coins can be deleted (no remaining orders from other profiles)
-            coins_to_delete = []
-            for coin_id in coin_ids_with_orders:
-                remaining_orders = db.query(Order).filter(
-                    Order.coin_id == coin_id,
-                    Order.profile_name != profile_name
-                ).count()
-                
-                if remaining_orders == 0:
-                    coin = db.query(Coin).filter(Coin.id == coin_id).first()
-                    if coin:
-                        coins_to_delete.append(coin)
-            
-            # Delete coins with no remaining orders
-            for coin in coins_to_delete:
-                db.delete(coin)
+            # Delete all orders for this profile in one statement
+            orders_cleared = db.query(Order).filter(
+                Order.profile_name == profile_name
+            ).delete(synchronize_session=False)
             
-            coins_cleared = len(coins_to_delete)
+            # Delete coins with no remaining orders (from other profiles) in one statement
+            coins_cleared = 0
+            if coin_ids_with_orders:
+                coins_cleared = db.query(Coin).filter(
+                    Coin.id.in_(coin_ids_with_orders),
+                    ~Coin.orders.any()
+                ).delete(synchronize_session=False)
             
             db.commit()
             
@@ -11,9 +11,12 @@ This module handles the improved order processing functionality including:
 
 import asyncio
 import logging
+import math
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Sequence, Set
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -28,15 +31,37 @@ from bracket_config import calculate_bracket, BRACKET_CONFIG
 # Get logger (configured at application level in main.py)
 logger = logging.getLogger(__name__)
 
+# Column order of a BullX automation row's main_text
+_ROW_FIELDS = (
+    'side', 'type', 'token', 'order_amount', 'cost', 'avg_exec',
+    'expiry', 'wallets', 'transactions', 'trigger_condition', 'status'
+)
+_EMPTY_ROW_FIELDS = dict.fromkeys(_ROW_FIELDS, "")
+
+# Delete button of a row in the (filtered) automation orders list
+_DELETE_XPATH_TMPL = "//*[@id='root']/div[1]/div[2]/main/div/section/div[2]/div[2]/div/div/div/div[1]/a[{row}]/div[11]/div/button"
+
+@lru_cache(maxsize=512)
+def _is_sl_only_trigger(trigger_condition: str) -> bool:
+    """Same test as _check_trigger_condition_type's has_sl_only, cached since BullX shows few distinct triggers"""
+    trigger = trigger_condition.strip().rstrip(',').strip()
+    return "1 SL" in trigger and "1 TP" not in trigger
+
+@dataclass(slots=True, eq=False)
 class EnhancedOrderProcessor:
-    def __init__(self):
-        self.automator = bullx_automator
-        self.driver_manager = bullx_automator.driver_manager
-        self.orders_for_renewal = []  # Track orders marked for renewal
-        self.renewed_order_ids = set()  # Track order IDs already marked for renewal (prevents duplicates)
-        self.expired_coins = []  # Track coins with SL hit + any expired (cancel all + sell)
-        self.individual_expired_orders = []  # Track individually expired orders for renewal
-        self.current_selected_filter = None  # Track currently active filter button
+    automator: Any = field(default_factory=lambda: bullx_automator)
+    driver_manager: Any = field(init=False)
+    orders_for_renewal: List[Dict] = field(default_factory=list)  # Track orders marked for renewal
+    renewed_order_ids: Set[int] = field(default_factory=set)  # Track order IDs already marked for renewal (prevents duplicates)
+    expired_coins: List[Dict] = field(default_factory=list)  # Track coins with SL hit + any expired (cancel all + sell)
+    individual_expired_orders: List[Dict] = field(default_factory=list)  # Track individually expired orders for renewal
+    current_selected_filter: Optional[int] = None  # Track currently active filter button
+    prefetched_orders: Dict[int, List[Order]] = field(default_factory=dict)  # coin_id -> DB orders loaded in one batch for the current check
+    coin_cache: Dict[str, Optional[Coin]] = field(default_factory=dict)  # token -> Coin (or None) looked up during the current run
+    pending_completions: List[int] = field(default_factory=list)  # IDs of orders deleted from BullX, marked COMPLETED in one batch
+
+    def __post_init__(self):
+        self.driver_manager = self.automator.driver_manager
         
     async def process_orders_enhanced(self, profile_name: str) -> Dict:
         """
@@ -59,6 +84,9 @@ class EnhancedOrderProcessor:
             self.expired_coins = []
             self.individual_expired_orders = []
             self.current_selected_filter = None  # Reset filter tracking
+            self.prefetched_orders = {}
+            self.coin_cache = {}
+            self.pending_completions = []
             
             # Step 1: Check orders and detect conditions (TP + expired)
             logger.info("📋 Step 1: Checking orders and detecting conditions...")
@@ -135,7 +163,7 @@ class EnhancedOrderProcessor:
         Group by coin and batch delete operations.
         """
         try:
-            logger.info(f"🔍 Checking orders for TP detection...")
+            logger.info("🔍 Checking orders for TP detection...")
             
             # Use existing order checking functionality
             result = self.automator.check_orders(profile_name)
@@ -150,9 +178,9 @@ class EnhancedOrderProcessor:
                     # Close the driver gracefully
                     try:
                         self.driver_manager.close_driver(profile_name)
-                        logger.info(f"🔒 Closed browser driver for {profile_name}")
+                        logger.info("🔒 Closed browser driver for %s", profile_name)
                     except Exception as close_error:
-                        logger.warning(f"⚠️  Could not close driver: {close_error}")
+                        logger.warning("⚠️  Could not close driver: %s", close_error)
                     
                     return {
                         "success": True,
@@ -177,8 +205,9 @@ class EnhancedOrderProcessor:
                 button_index = button_info.get("button_index", "Unknown")
                 rows = button_info.get("rows", [])
                 
-                logger.info(f"📋 Processing Button {button_index}: {len(rows)} rows")
+                logger.info("📋 Processing Button %s: %s rows", button_index, len(rows))
                 
+                parsed_rows = []
                 for row_index, row in enumerate(rows):
                     try:
                         total_orders_checked += 1
@@ -188,32 +217,41 @@ class EnhancedOrderProcessor:
                         if not parsed_data:
                             continue
                         
-                        token = parsed_data.get('token', 'Unknown')
-                        trigger_condition = parsed_data.get('trigger_condition', '')
-                        
-                        logger.info(f"  🔸 Row {row_index + 1}: {token} - Trigger: {trigger_condition}")
-                        
-                        # Group orders by coin
-                        if token not in orders_by_coin:
-                            orders_by_coin[token] = []
-                        orders_by_coin[token].append({
-                            'parsed_data': parsed_data,
-                            'button_index': button_index,
-                            'row_index': row_index + 1,
-                            'is_tp': self._is_tp_condition(trigger_condition)
-                        })
-                        
-                        if self._is_tp_condition(trigger_condition):
-                            tp_detected_count += 1
+                        logger.info("  🔸 Row %s: %s - Trigger: %s", row_index + 1, parsed_data.get('token', 'Unknown'), parsed_data.get('trigger_condition', ''))
+                        parsed_rows.append((row_index + 1, parsed_data))
                         
                     except Exception as e:
-                        logger.error(f"    💥 Error processing row {row_index + 1}: {e}")
+                        logger.error("    💥 Error processing row %s: %s", row_index + 1, e)
+                
+                # Classify all of this button's trigger conditions in one pass
+                tp_flags = self.is_tp_condition_batch(
+                    [parsed_data.get('trigger_condition', '') for _, parsed_data in parsed_rows]
+                )
+                tp_detected_count += sum(tp_flags)
+                
+                # Group orders by coin
+                for (row_number, parsed_data), is_tp in zip(parsed_rows, tp_flags):
+                    orders_by_coin.setdefault(parsed_data.get('token', 'Unknown'), []).append({
+                        'parsed_data': parsed_data,
+                        'button_index': button_index,
+                        'row_index': row_number,
+                        'is_tp': is_tp
+                    })
             
-            # Process each coin's orders
-            for token, coin_orders in orders_by_coin.items():
-                await self._process_coin_orders(profile_name, token, coin_orders)
+            # Load the DB orders of every coin on the page in one query; each coin
+            # takes its list once, before its own processing writes to the database
+            coins = [self._find_coin_by_token(token) for token in orders_by_coin]
+            self.prefetched_orders = db_manager.get_orders_by_coin_ids(coin.id for coin in coins if coin)
             
-            logger.info(f"✅ Order check completed: {total_orders_checked} orders checked, {tp_detected_count} TP conditions detected")
+            # Process each coin's orders; whatever happens, every order already deleted
+            # from BullX is marked COMPLETED in one go
+            try:
+                for token, coin_orders in orders_by_coin.items():
+                    await self._process_coin_orders(profile_name, token, coin_orders)
+            finally:
+                self._flush_pending_completions()
+            
+            logger.info("✅ Order check completed: %s orders checked, %s TP conditions detected", total_orders_checked, tp_detected_count)
             
             return {
                 "success": True,
@@ -223,53 +261,53 @@ class EnhancedOrderProcessor:
             }
             
         except Exception as e:
-            logger.error(f"💥 Error in TP detection: {e}")
+            logger.error("💥 Error in TP detection: %s", e)
             return {"success": False, "error": str(e)}
     
     async def _process_coin_orders(self, profile_name: str, token: str, coin_orders: List[Dict]):
         """Process all orders for a specific coin, including missing order identification and processing"""
         try:
-            logger.info(f"\n🪙 Processing {len(coin_orders)} orders for {token}:")
+            logger.info('\n🪙 Processing %s orders for %s:', len(coin_orders), token)
             
             # Find coin in database
             coin = self._find_coin_by_token(token)
             if not coin:
-                logger.warning(f"  ❌ Could not find coin for token: {token}")
+                logger.warning("  ❌ Could not find coin for token: %s", token)
                 return
 
             # PRIORITY 0: Two-phase order identification for ALL orders
             # This prevents duplicate matches (same DB order matched multiple times)
             # Must run FIRST so reconciliation can use the results
-            logger.info(f"  🔍 PRIORITY 0: Identifying all orders (two-phase approach)...")
+            logger.info("  🔍 PRIORITY 0: Identifying all orders (two-phase approach)...")
             identification_results = await self._identify_all_orders_for_coin(coin, coin_orders, profile_name)
 
             # PRIORITY 0.5: Reconcile database with BullX (mark cancelled orders)
             # Uses identification results to find truly missing orders
             # This handles cases where orders were deleted from BullX but remain ACTIVE in DB
-            logger.info(f"  🔍 PRIORITY 0.5: Reconciling database with BullX...")
+            logger.info("  🔍 PRIORITY 0.5: Reconciling database with BullX...")
             reconciled_count = self._reconcile_database_with_identification(coin, identification_results, profile_name)
             if reconciled_count > 0:
-                logger.warning(f"  ⚠️  Reconciled {reconciled_count} orders (marked as CANCELLED in database)")
+                logger.warning("  ⚠️  Reconciled %s orders (marked as CANCELLED in database)", reconciled_count)
             else:
-                logger.info(f"  ✅ Database already in sync with BullX")
+                logger.info("  ✅ Database already in sync with BullX")
 
             # PRIORITY 0.75: Check for orphaned orders (on BullX but not matched to database)
             # Uses identification results instead of re-matching
-            logger.info(f"  🔍 PRIORITY 0.75: Checking for orphaned orders...")
+            logger.info("  🔍 PRIORITY 0.75: Checking for orphaned orders...")
             orphaned_orders = self._detect_orphaned_orders_from_results(coin_orders, identification_results)
             if orphaned_orders:
-                logger.critical(f"  🚨 ORPHANED ORDERS DETECTED: {len(orphaned_orders)} orders on BullX have no matching ACTIVE database record")
-                logger.critical(f"     These are likely from failed deletions - they should NOT be renewed")
+                logger.critical("  🚨 ORPHANED ORDERS DETECTED: %s orders on BullX have no matching ACTIVE database record", len(orphaned_orders))
+                logger.critical("     These are likely from failed deletions - they should NOT be renewed")
                 for orphan in orphaned_orders:
-                    logger.critical(f"       • Row {orphan['row_index']}: {orphan['parsed_data'].get('trigger_condition')}")
-                    logger.critical(f"         This order exists on BullX but not in database as ACTIVE")
+                    logger.critical("       • Row %s: %s", orphan['row_index'], orphan['parsed_data'].get('trigger_condition'))
+                    logger.critical("         This order exists on BullX but not in database as ACTIVE")
                 # For now, just log the orphans - manual cleanup recommended
                 # Future: Could auto-delete these orphaned orders
             else:
-                logger.info(f"  ✅ No orphaned orders detected")
+                logger.info("  ✅ No orphaned orders detected")
 
             # PRIORITY 1: Check for SL hit + any expired condition
-            logger.info(f"  🔍 PRIORITY 1: Checking for SL hit + any expired...")
+            logger.info("  🔍 PRIORITY 1: Checking for SL hit + any expired...")
             if self._check_sl_with_any_expired(coin_orders):
                 # This coin has SL hit + any expired - mark for expired cleanup (cancel all + sell)
                 expired_coin_info = {
@@ -280,18 +318,18 @@ class EnhancedOrderProcessor:
                     'token': token
                 }
                 self.expired_coins.append(expired_coin_info)
-                logger.info(f"  ⚠️  Coin marked for expired cleanup - SKIPPING further processing")
+                logger.info("  ⚠️  Coin marked for expired cleanup - SKIPPING further processing")
                 return  # Early return - skip all other checks
             
-            logger.info(f"  ✅ No SL hit with expired - checking for individual expired orders...")
+            logger.info("  ✅ No SL hit with expired - checking for individual expired orders...")
             
             # PRIORITY 2: Check for individually expired orders (no SL hit)
-            logger.info(f"  🔍 PRIORITY 2: Checking for individual expired orders...")
+            logger.info("  🔍 PRIORITY 2: Checking for individual expired orders...")
             individual_expired = self._get_individual_expired_orders(coin_orders)
             
             if individual_expired:
-                logger.info(f"  ⏰ Found {len(individual_expired)} individually expired orders")
-                logger.info(f"  📝 Marking expired orders for individual renewal...")
+                logger.info("  ⏰ Found %s individually expired orders", len(individual_expired))
+                logger.info("  📝 Marking expired orders for individual renewal...")
 
                 # Process each expired order for renewal
                 for expired_order_info in individual_expired:
@@ -310,19 +348,19 @@ class EnhancedOrderProcessor:
                                 'profile_name': profile_name
                             }
                             self.individual_expired_orders.append(expired_renewal_info)
-                            logger.info(f"     ✅ Expired order identified for renewal: Order ID {order_match['order'].id} (matched via {order_match.get('method', 'unknown')})")
+                            logger.info("     ✅ Expired order identified for renewal: Order ID %s (matched via %s)", order_match['order'].id, order_match.get('method', 'unknown'))
                         else:
-                            logger.warning(f"     ❌ Could not identify expired order in database (row {row_index})")
+                            logger.warning("     ❌ Could not identify expired order in database (row %s)", row_index)
 
                     except Exception as e:
-                        logger.error(f"     💥 Error processing expired order: {e}")
+                        logger.error("     💥 Error processing expired order: %s", e)
                 
                 # Don't return - continue to check for TP on non-expired orders
-                logger.info(f"  ℹ️  Will also check non-expired orders for TP conditions...")
+                logger.info("  ℹ️  Will also check non-expired orders for TP conditions...")
             else:
-                logger.info(f"  ✅ No individual expired orders found")
+                logger.info("  ✅ No individual expired orders found")
             
-            logger.info(f"  🔍 PRIORITY 3: Proceeding with normal TP and missing order processing...")
+            logger.info("  🔍 PRIORITY 3: Proceeding with normal TP and missing order processing...")
             
             # Check if we have less than 4 orders and identify missing ones
             missing_orders = []
@@ -330,7 +368,7 @@ class EnhancedOrderProcessor:
                 missing_orders = await self._identify_missing_orders(coin, coin_orders, profile_name)
             
             # Update trigger conditions for all orders during coin processing
-            logger.info(f"  📝 Updating trigger conditions for all {token} orders...")
+            logger.info("  📝 Updating trigger conditions for all %s orders...", token)
             await self._update_trigger_conditions_for_coin(profile_name, coin, coin_orders, identification_results)
             
             # Process TP conditions and prepare for deletion
@@ -338,7 +376,7 @@ class EnhancedOrderProcessor:
             for order_info in coin_orders:
                 if order_info['is_tp']:
                     row_index = order_info['row_index']
-                    logger.info(f" 🎯 TP DETECTED in row {row_index}!")
+                    logger.info(" 🎯 TP DETECTED in row %s!", row_index)
 
                     # Get identification result from two-phase identification
                     order_match = identification_results.get(row_index)
@@ -349,22 +387,22 @@ class EnhancedOrderProcessor:
                             'order_info': order_info,
                             'coin': coin
                         })
-                        logger.info(f"    ✅ Identified as Order ID {order_match['order'].id} (via {order_match.get('method', 'unknown')})")
+                        logger.info("    ✅ Identified as Order ID %s (via %s)", order_match['order'].id, order_match.get('method', 'unknown'))
                     else:
-                        logger.warning(f" ❌ Could not identify order in database for renewal (row {row_index})")
+                        logger.warning(" ❌ Could not identify order in database for renewal (row %s)", row_index)
             
             # Process missing orders (mark for renewal without BullX deletion)
             if missing_orders:
-                logger.info(f"  🔄 Processing {len(missing_orders)} missing orders for renewal...")
+                logger.info("  🔄 Processing %s missing orders for renewal...", len(missing_orders))
                 await self._process_missing_orders(profile_name, missing_orders)
             
             # Batch delete BullX entries for TP orders only
             if tp_orders:
-                logger.info(f"  🗑️  Batch deleting {len(tp_orders)} BullX entries for {token}...")
+                logger.info("  🗑️  Batch deleting %s BullX entries for %s...", len(tp_orders), token)
                 await self._batch_delete_bullx_entries(profile_name, tp_orders)
             
         except Exception as e:
-            logger.error(f"💥 Error processing coin orders for {token}: {e}")
+            logger.error("💥 Error processing coin orders for %s: %s", token, e)
     
     async def _identify_missing_orders(self, coin: Coin, coin_orders: List[Dict], profile_name: str) -> List[Dict]:
         """
@@ -390,12 +428,15 @@ class EnhancedOrderProcessor:
             # Expected bracket IDs: We always expect 4 orders (1, 2, 3, 4)
             expected_bracket_ids = {1, 2, 3, 4}
             
+            # All rows belong to this coin, so load its DB orders once for every lookup below
+            db_orders = db_manager.get_orders_by_coin(coin.id)
+            
             # Find which bracket IDs are present in BullX (from parsed orders)
             bullx_bracket_ids = set()
             for order_info in coin_orders:
                 parsed_data = order_info.get('parsed_data', {})
                 # Try to identify bracket_id from parsed data
-                order_match = self._identify_order(parsed_data, profile_name)
+                order_match = self._identify_order(parsed_data, profile_name, all_orders=db_orders)
                 if order_match and order_match.get('sub_id'):
                     bullx_bracket_ids.add(order_match['sub_id'])
             
@@ -417,7 +458,6 @@ class EnhancedOrderProcessor:
                     logger.info(f"      🔍 Missing Bracket ID {bracket_id}: Entry ${entry_price:,.0f}")
                     
                     # Try to find if there's a completed order with this bracket_id to get amount
-                    db_orders = db_manager.get_orders_by_coin(coin.id)
                     profile_orders = [o for o in db_orders if o.profile_name == profile_name and o.bracket_id == bracket_id]
                     
                     # Use amount from most recent order if available
@@ -528,19 +568,19 @@ class EnhancedOrderProcessor:
                 # Adjust row index based on previous deletions (rows shift up)
                 adjusted_row_index = original_row_index - deletions_made
                 
-                logger.info(f"    📝 Processing order {order.id} for deletion ({i+1}/{len(tp_orders_sorted)})...")
-                logger.info(f"       Original row: {original_row_index}, Adjusted row: {adjusted_row_index}, Deletions made: {deletions_made}")
+                logger.info("    📝 Processing order %s for deletion (%s/%s)...", order.id, i+1, len(tp_orders_sorted))
+                logger.info("       Original row: %s, Adjusted row: %s, Deletions made: %s", original_row_index, adjusted_row_index, deletions_made)
                 
                 # Re-click the filter button for this coin before each deletion
                 # This ensures we have the correct view and row indices after previous deletions
                 filter_success = await self._click_coin_filter_button(profile_name, button_index)
                 
                 if not filter_success:
-                    logger.error(f"    ❌ Failed to click filter button for {coin_name} - skipping deletion")
+                    logger.error("    ❌ Failed to click filter button for %s - skipping deletion", coin_name)
                     continue
                 
                 # Try to delete entry from BullX using adjusted row index (with verification)
-                logger.info(f"    🗑️  Attempting to delete BullX entry...")
+                logger.info("    🗑️  Attempting to delete BullX entry...")
                 deletion_clicked = await self._delete_bullx_entry(
                     profile_name,
                     button_index,
@@ -550,67 +590,87 @@ class EnhancedOrderProcessor:
                 )
                 
                 if not deletion_clicked:
-                    logger.error(f"    ❌ Failed to click delete button - skipping order {order.id}")
+                    logger.error("    ❌ Failed to click delete button - skipping order %s", order.id)
                     # Don't increment deletions_made since deletion didn't happen
                     continue
                 
                 # Wait for BullX to process the deletion
-                logger.info(f"    ⏳ Waiting for BullX to process deletion...")
+                logger.info("    ⏳ Waiting for BullX to process deletion...")
                 time.sleep(2)
                 
                 # Verify deletion by counting orders
-                logger.info(f"    🔍 Verifying deletion success by counting orders...")
+                logger.info("    🔍 Verifying deletion success by counting orders...")
                 order_count = await self._count_bullx_orders_for_coin(profile_name, button_index)
                 
                 if order_count == -1:
-                    logger.error(f"    ❌ Could not verify deletion (count failed) - skipping order {order.id}")
+                    logger.error("    ❌ Could not verify deletion (count failed) - skipping order %s", order.id)
                     # Don't increment deletions_made since we couldn't verify
                     continue
                 
                 if order_count < 4:
                     # Deletion successful - count is less than 4
-                    logger.info(f"    ✅ Deletion verified successful! Order count: {order_count} < 4")
+                    logger.info("    ✅ Deletion verified successful! Order count: %s < 4", order_count)
                     
-                    # Update database to COMPLETED
-                    db_update_success = db_manager.update_order_status(order.id, "COMPLETED")
+                    # Queue the COMPLETED update; _flush_pending_completions writes the batch
+                    self.pending_completions.append(order.id)
                     
-                    if db_update_success:
-                        logger.info(f"    ✅ Database updated - order {order.id} marked as COMPLETED")
-                        
-                        # Add to renewal list
-                        renewal_info = {
-                            'order_id': order.id,
-                            'coin_address': coin.address,
-                            'coin_name': coin.name,
-                            'parsed_data': order_info['parsed_data'],
-                            'button_index': button_index,
-                            'row_index': order_info['row_index'],
-                            'original_bracket': coin.bracket,
-                            'bracket_sub_id': order.bracket_id,
-                            'profile_name': order.profile_name,
-                            'amount': order.amount or 1.0
-                        }
-                        
-                        self.orders_for_renewal.append(renewal_info)
-                        successful_deletions.append(order.id)
-                        
-                        # Increment deletions counter since this deletion was successful
-                        deletions_made += 1
-                        logger.info(f"    ✅ Order {order.id} marked for renewal (total deletions: {deletions_made})")
-                    else:
-                        logger.error(f"    ❌ Database update failed for order {order.id}")
-                        # Don't increment deletions_made since we skip database update on failure
+                    # Add to renewal list
+                    renewal_info = {
+                        'order_id': order.id,
+                        'coin_address': coin.address,
+                        'coin_name': coin.name,
+                        'parsed_data': order_info['parsed_data'],
+                        'button_index': button_index,
+                        'row_index': order_info['row_index'],
+                        'original_bracket': coin.bracket,
+                        'bracket_sub_id': order.bracket_id,
+                        'profile_name': order.profile_name,
+                        'amount': order.amount or 1.0
+                    }
+                    
+                    self.orders_for_renewal.append(renewal_info)
+                    successful_deletions.append(order.id)
+                    
+                    # Increment deletions counter since this deletion was successful
+                    deletions_made += 1
+                    logger.info("    ✅ Order %s marked for renewal (total deletions: %s)", order.id, deletions_made)
                 else:
                     # Deletion failed - still 4 or more orders
-                    logger.error(f"    ❌ Deletion FAILED! Order count: {order_count} >= 4")
-                    logger.error(f"    ⚠️  BullX still shows {order_count} orders - order was not deleted")
-                    logger.error(f"    ⚠️  Skipping database update and renewal for order {order.id}")
+                    logger.error("    ❌ Deletion FAILED! Order count: %s >= 4", order_count)
+                    logger.error("    ⚠️  BullX still shows %s orders - order was not deleted", order_count)
+                    logger.error("    ⚠️  Skipping database update and renewal for order %s", order.id)
                     # Don't increment deletions_made since deletion failed
             
-            logger.info(f"  ✅ Successfully processed {len(successful_deletions)} orders for deletion")
+            logger.info("  ✅ Successfully processed %s orders for deletion", len(successful_deletions))
             
         except Exception as e:
-            logger.error(f"💥 Error in batch delete: {e}")
+            logger.error("💥 Error in batch delete: %s", e)
+    
+    def _flush_pending_completions(self) -> int:
+        """
+        Mark all queued orders as COMPLETED with a single bulk update.
+        Orders whose update did not go through are dropped from the renewal list,
+        so they are not replaced while still ACTIVE in the database.
+        """
+        if not self.pending_completions:
+            return 0
+        
+        order_ids, self.pending_completions = self.pending_completions, []
+        try:
+            updated_ids = set(db_manager.bulk_update_order_status(order_ids, "COMPLETED"))
+        except Exception as e:
+            logger.error("💥 Error updating orders %s to COMPLETED: %s", order_ids, e)
+            updated_ids = set()
+        
+        failed_ids = set(order_ids) - updated_ids
+        if failed_ids:
+            logger.error("❌ Database update failed for orders %s - skipping their renewal", sorted(failed_ids))
+            self.orders_for_renewal = [
+                renewal for renewal in self.orders_for_renewal if renewal['order_id'] not in failed_ids
+            ]
+        
+        logger.info("✅ Database updated - %s orders marked as COMPLETED", len(updated_ids))
+        return len(updated_ids)
     
     async def _click_coin_filter_button(self, profile_name: str, button_index: int, force: bool = False) -> bool:
         """
@@ -805,34 +865,21 @@ class EnhancedOrderProcessor:
             if not main_text:
                 return None
             
-            # Split the main text by newlines to get individual data points
-            lines = main_text.strip().split('\n')
-            lines = [line.strip() for line in lines if line.strip()]
+            # Split the main text by newlines to get individual data points;
+            # strip and drop blank lines with C-level map/filter rather than a Python loop
+            lines = list(filter(None, map(str.strip, main_text.split('\n'))))
             
             if len(lines) < 10:
-                logger.warning(f"Row has fewer than expected columns: {len(lines)}")
-            
-            # Parse according to BullX order structure
-            parsed = {
-                'raw_text': main_text,
-                'href': href,
-                'side': lines[0] if len(lines) > 0 else "",
-                'type': lines[1] if len(lines) > 1 else "",
-                'token': lines[2] if len(lines) > 2 else "",
-                'order_amount': lines[3] if len(lines) > 3 else "",
-                'cost': lines[4] if len(lines) > 4 else "",
-                'avg_exec': lines[5] if len(lines) > 5 else "",
-                'expiry': lines[6] if len(lines) > 6 else "",
-                'wallets': lines[7] if len(lines) > 7 else "",
-                'transactions': lines[8] if len(lines) > 8 else "",
-                'trigger_condition': lines[9] if len(lines) > 9 else "",
-                'status': lines[10] if len(lines) > 10 else ""
-            }
+                logger.warning("Row has fewer than expected columns: %s", len(lines))
+            
+            # Parse according to BullX order structure; missing columns stay ""
+            parsed = {'raw_text': main_text, 'href': href, **_EMPTY_ROW_FIELDS}
+            parsed.update(zip(_ROW_FIELDS, lines))
             
             return parsed
             
         except Exception as e:
-            logger.error(f"Error parsing row data: {e}")
+            logger.error("Error parsing row data: %s", e)
             return None
     
     def _check_trigger_condition_type(self, trigger_condition: str) -> Dict[str, bool]:
@@ -882,8 +929,12 @@ class EnhancedOrderProcessor:
         Check if trigger condition indicates TP has been met.
         According to requirements: trigger conditions = "1 SL" (only SL remains) means TP has been met.
         """
-        trigger_type = self._check_trigger_condition_type(trigger_condition)
-        return trigger_type['has_sl_only']
+        return _is_sl_only_trigger(trigger_condition or "")
+    
+    @classmethod
+    def is_tp_condition_batch(cls, trigger_conditions: Sequence[Optional[str]]) -> List[bool]:
+        """Classify many trigger conditions at once, in the same order (see _is_tp_condition)"""
+        return [_is_sl_only_trigger(trigger_condition or "") for trigger_condition in trigger_conditions]
     
     def _parse_trigger_condition_entry_price(self, trigger_condition: str) -> Optional[float]:
         """
@@ -938,7 +989,8 @@ class EnhancedOrderProcessor:
             logger.error(f"Error parsing trigger condition '{trigger_condition}': {e}")
             return None
     
-    def _identify_order(self, parsed_data: Dict[str, Any], profile_name: str) -> Optional[Dict[str, Any]]:
+    def _identify_order(self, parsed_data: Dict[str, Any], profile_name: str,
+                        all_orders: Optional[List[Order]] = None) -> Optional[Dict[str, Any]]:
         """Enhanced order identification with trigger condition storage and expiry time matching"""
         try:
             token = parsed_data.get('token', '')
@@ -946,21 +998,21 @@ class EnhancedOrderProcessor:
             expiry = parsed_data.get('expiry', '')
             
             if not token:
-                logger.debug(f"No token found in parsed data")
+                logger.debug("No token found in parsed data")
                 return None
             
-            logger.info(f"🔍 IDENTIFYING ORDER:")
-            logger.info(f"   Token: {token}")
-            logger.info(f"   Trigger: {trigger_condition}")
-            logger.info(f"   Expiry: {expiry}")
+            logger.info("🔍 IDENTIFYING ORDER:")
+            logger.info("   Token: %s", token)
+            logger.info("   Trigger: %s", trigger_condition)
+            logger.info("   Expiry: %s", expiry)
             
             # Find coin by token name
             coin = self._find_coin_by_token(token)
             if not coin:
-                logger.info(f"   ❌ Could not find coin for token: {token}")
+                logger.info("   ❌ Could not find coin for token: %s", token)
                 return None
             
-            logger.info(f"   ✅ Found coin: {coin.name or coin.address} (ID: {coin.id})")
+            logger.info("   ✅ Found coin: %s (ID: %s)", coin.name or coin.address, coin.id)
             
             # Use stored bracket from coin, or calculate from market_cap if not available
             stored_bracket = coin.bracket
@@ -976,42 +1028,43 @@ class EnhancedOrderProcessor:
                     )
                     logger.info(f"   📊 Calculated and stored bracket {stored_bracket} based on market_cap ${coin.market_cap:,.0f}")
                 else:
-                    logger.warning(f"   ❌ No bracket or market_cap stored for coin")
+                    logger.warning("   ❌ No bracket or market_cap stored for coin")
                     return None
             
             # Get bracket configuration entries for stored bracket
             if stored_bracket not in BRACKET_CONFIG:
-                logger.error(f"   ❌ Invalid bracket {stored_bracket} for coin")
+                logger.error("   ❌ Invalid bracket %s for coin", stored_bracket)
                 return None
             
             bracket_config = BRACKET_CONFIG[stored_bracket]
             bracket_entries = bracket_config['entries']  # [entry1, entry2, entry3, entry4]
             
-            logger.info(f"   📊 Using bracket {stored_bracket} with entries: {bracket_entries}")
+            logger.info("   📊 Using bracket %s with entries: %s", stored_bracket, bracket_entries)
             
-            # Get all active orders for this coin and profile
-            all_orders = db_manager.get_orders_by_coin(coin.id)
+            # Get all active orders for this coin and profile (callers may pass them preloaded)
+            if all_orders is None:
+                all_orders = db_manager.get_orders_by_coin(coin.id)
             active_orders = [o for o in all_orders if o.profile_name == profile_name and o.status == "ACTIVE"]
             
-            logger.info(f"   📋 Found {len(active_orders)} active orders in database")
+            logger.info("   📋 Found %s active orders in database", len(active_orders))
             
             # Method 1: Try to match by trigger condition (exact match)
             sub_id = None
             matched_order = None
             identification_method = None
             
-            logger.info(f"   🎯 METHOD 1: Trigger condition matching...")
+            logger.info("   🎯 METHOD 1: Trigger condition matching...")
             for order in active_orders:
                 if order.trigger_condition == trigger_condition:
                     sub_id = order.bracket_id
                     matched_order = order
                     identification_method = "trigger_condition_exact"
-                    logger.info(f"      ✅ Exact trigger match found: Order ID {order.id}, Bracket ID {sub_id}")
+                    logger.info("      ✅ Exact trigger match found: Order ID %s, Bracket ID %s", order.id, sub_id)
                     break
             
             # Method 2: Try to match by entry price from trigger condition
             if not sub_id:
-                logger.info(f"   🎯 METHOD 2: Entry price matching...")
+                logger.info("   🎯 METHOD 2: Entry price matching...")
                 entry_price = self._parse_trigger_condition_entry_price(trigger_condition)
                 if entry_price:
                     logger.info(f"      📊 Extracted entry price: ${entry_price:,.0f}")
@@ -1020,60 +1073,60 @@ class EnhancedOrderProcessor:
                         matched_order = self._get_order_by_coin_sub_id(coin.id, sub_id, profile_name)
                         if matched_order:
                             identification_method = "entry_price"
-                            logger.info(f"      ✅ Entry price match found: Order ID {matched_order.id}, Bracket ID {sub_id}")
+                            logger.info("      ✅ Entry price match found: Order ID %s, Bracket ID %s", matched_order.id, sub_id)
                         else:
-                            logger.info(f"      ❌ No order found for calculated sub_id {sub_id}")
+                            logger.info("      ❌ No order found for calculated sub_id %s", sub_id)
                             sub_id = None
                     else:
-                        logger.info(f"      ❌ Could not match entry price to bracket entries")
+                        logger.info("      ❌ Could not match entry price to bracket entries")
                 else:
-                    logger.info(f"      ❌ Could not extract entry price from trigger condition")
+                    logger.info("      ❌ Could not extract entry price from trigger condition")
             
             # Method 3: Try to match by expiry time (for cases where multiple orders exist)
             if not sub_id and len(active_orders) > 1:
-                logger.info(f"   🎯 METHOD 3: Expiry time matching...")
+                logger.info("   🎯 METHOD 3: Expiry time matching...")
                 expiry_seconds = self._parse_expiry_to_seconds(expiry)
                 if expiry_seconds is not None:
-                    logger.info(f"      ⏰ Parsed expiry: {expiry_seconds} seconds")
+                    logger.info("      ⏰ Parsed expiry: %s seconds", expiry_seconds)
                     best_match = self._match_by_expiry_time(active_orders, expiry_seconds, trigger_condition)
                     if best_match:
                         sub_id = best_match.bracket_id
                         matched_order = best_match
                         identification_method = "expiry_time"
-                        logger.info(f"      ✅ Expiry time match found: Order ID {best_match.id}, Bracket ID {sub_id}")
+                        logger.info("      ✅ Expiry time match found: Order ID %s, Bracket ID %s", best_match.id, sub_id)
                 else:
-                    logger.info(f"      ❌ Could not parse expiry time: '{expiry}'")
+                    logger.info("      ❌ Could not parse expiry time: '%s'", expiry)
             
             # Method 4: TP condition handling
             if not sub_id and self._is_tp_condition(trigger_condition):
-                logger.info(f"   🎯 METHOD 4: TP condition handling...")
+                logger.info("   🎯 METHOD 4: TP condition handling...")
                 # For TP conditions, try to find any active order and mark it
                 if active_orders:
                     matched_order = active_orders[0]  # Take first available
                     sub_id = matched_order.bracket_id
                     identification_method = "tp_fallback"
-                    logger.info(f"      ✅ TP fallback match: Order ID {matched_order.id}, Bracket ID {sub_id}")
+                    logger.info("      ✅ TP fallback match: Order ID %s, Bracket ID %s", matched_order.id, sub_id)
             
             # Method 5: Sequential fallback (last resort)
             if not sub_id and active_orders:
-                logger.info(f"   🎯 METHOD 5: Sequential fallback...")
+                logger.info("   🎯 METHOD 5: Sequential fallback...")
                 active_orders.sort(key=lambda x: x.bracket_id)
                 matched_order = active_orders[0]
                 sub_id = matched_order.bracket_id
                 identification_method = "sequential_fallback"
-                logger.info(f"      ⚠️  Sequential fallback: Order ID {matched_order.id}, Bracket ID {sub_id}")
+                logger.info("      ⚠️  Sequential fallback: Order ID %s, Bracket ID %s", matched_order.id, sub_id)
             
             # Note: Trigger condition updates are now handled separately during coin order processing
             
             # Final result
             if sub_id and matched_order:
-                logger.info(f"   ✅ IDENTIFICATION SUCCESSFUL:")
-                logger.info(f"      Method: {identification_method}")
-                logger.info(f"      Order ID: {matched_order.id}")
-                logger.info(f"      Bracket ID: {sub_id}")
-                logger.info(f"      Trigger: {trigger_condition}")
+                logger.info("   ✅ IDENTIFICATION SUCCESSFUL:")
+                logger.info("      Method: %s", identification_method)
+                logger.info("      Order ID: %s", matched_order.id)
+                logger.info("      Bracket ID: %s", sub_id)
+                logger.info("      Trigger: %s", trigger_condition)
             else:
-                logger.info(f"   ❌ IDENTIFICATION FAILED: No matching order found")
+                logger.info("   ❌ IDENTIFICATION FAILED: No matching order found")
             
             return {
                 'order': matched_order,
@@ -1086,7 +1139,7 @@ class EnhancedOrderProcessor:
             }
             
         except Exception as e:
-            logger.error(f"💥 Error identifying order: {e}")
+            logger.error("💥 Error identifying order: %s", e)
             return None
     
     def _try_strong_matching(
@@ -1127,7 +1180,7 @@ class EnhancedOrderProcessor:
 
                 # METHOD 1: Exact trigger condition match
                 if db_order.trigger_condition and db_order.trigger_condition == trigger_condition:
-                    logger.debug(f"     Strong match (trigger): Row → Order {db_order.id} (bracket {db_order.bracket_id})")
+                    logger.debug("     Strong match (trigger): Row → Order %s (bracket %s)", db_order.id, db_order.bracket_id)
                     return {
                         'status': 'success',
                         'order': db_order,
@@ -1144,7 +1197,7 @@ class EnhancedOrderProcessor:
                     bullx_type = self._check_trigger_condition_type(trigger_condition)
                     db_type = self._check_trigger_condition_type(db_order.trigger_condition)
                     if bullx_type['has_sl_only'] and db_type['has_both']:
-                        logger.debug(f"     Strong match (TP-hit): Row '1 SL' → Order {db_order.id} (bracket {db_order.bracket_id}) stored as '1 TP, 1 SL'")
+                        logger.debug("     Strong match (TP-hit): Row '1 SL' → Order %s (bracket %s) stored as '1 TP, 1 SL'", db_order.id, db_order.bracket_id)
                         return {
                             'status': 'success',
                             'order': db_order,
@@ -1159,7 +1212,7 @@ class EnhancedOrderProcessor:
                     expected_entry = bracket_entries[db_order.bracket_id - 1]
                     tolerance = 1000
                     if abs(entry_price - expected_entry) <= tolerance:
-                        logger.debug(f"     Strong match (entry): Row → Order {db_order.id} (bracket {db_order.bracket_id})")
+                        logger.debug("     Strong match (entry): Row → Order %s (bracket %s)", db_order.id, db_order.bracket_id)
                         return {
                             'status': 'success',
                             'order': db_order,
@@ -1172,7 +1225,7 @@ class EnhancedOrderProcessor:
             return None
 
         except Exception as e:
-            logger.error(f"     Error in strong matching: {e}")
+            logger.error("     Error in strong matching: %s", e)
             return None
 
     async def _reidentify_order_row_index(self, profile_name: str, button_index: int, order: Order, coin: Any) -> Optional[int]:
@@ -1374,16 +1427,16 @@ class EnhancedOrderProcessor:
             Dict mapping row_index to identification result
         """
         try:
-            logger.info(f"  🔍 Two-phase identification for {len(coin_orders)} BullX orders...")
+            logger.info("  🔍 Two-phase identification for %s BullX orders...", len(coin_orders))
 
             # Get all ACTIVE database orders for this coin and profile
-            db_orders = db_manager.get_orders_by_coin(coin.id)
+            db_orders = self._take_coin_orders(coin.id)
             active_db_orders = [
                 order for order in db_orders
                 if order.status == "ACTIVE" and order.profile_name == profile_name
             ]
 
-            logger.info(f"     Database has {len(active_db_orders)} ACTIVE orders")
+            logger.info("     Database has %s ACTIVE orders", len(active_db_orders))
 
             # Track matched database order IDs
             matched_order_ids = set()
@@ -1392,7 +1445,7 @@ class EnhancedOrderProcessor:
             identification_results = {}
 
             # PHASE 1: Strong matching (trigger condition, entry price)
-            logger.info(f"     📍 PHASE 1: Strong matching (trigger/entry price)...")
+            logger.info("     📍 PHASE 1: Strong matching (trigger/entry price)...")
             phase1_matches = 0
             for order_info in coin_orders:
                 row_index = order_info['row_index']
@@ -1409,12 +1462,12 @@ class EnhancedOrderProcessor:
                     identification_results[row_index] = match_result
                     matched_order_ids.add(match_result['order'].id)
                     phase1_matches += 1
-                    logger.info(f"        ✅ Row {row_index} → Order {match_result['order'].id} (bracket {match_result['bracket_id']}) via {match_result['method']}")
+                    logger.info("        ✅ Row %s → Order %s (bracket %s) via %s", row_index, match_result['order'].id, match_result['bracket_id'], match_result['method'])
 
-            logger.info(f"     ✅ Phase 1 complete: {phase1_matches}/{len(coin_orders)} orders matched")
+            logger.info("     ✅ Phase 1 complete: %s/%s orders matched", phase1_matches, len(coin_orders))
 
             # PHASE 2: Order amount matching for remaining orders
-            logger.info(f"     📍 PHASE 2: Order amount matching for remaining orders...")
+            logger.info("     📍 PHASE 2: Order amount matching for remaining orders...")
             phase2_matches = 0
             for order_info in coin_orders:
                 row_index = order_info['row_index']
@@ -1436,13 +1489,13 @@ class EnhancedOrderProcessor:
                     identification_results[row_index] = match_result
                     matched_order_ids.add(match_result['order'].id)
                     phase2_matches += 1
-                    logger.info(f"        ✅ Row {row_index} → Order {match_result['order'].id} (bracket {match_result['bracket_id']}) via order_amount")
+                    logger.info("        ✅ Row %s → Order %s (bracket %s) via order_amount", row_index, match_result['order'].id, match_result['bracket_id'])
 
-            logger.info(f"     ✅ Phase 2 complete: {phase2_matches} additional orders matched")
+            logger.info("     ✅ Phase 2 complete: %s additional orders matched", phase2_matches)
 
             # PHASE 3: Deterministic matching for remaining orders
             # If exactly 1 BullX order and 1 DB order remain, match them
-            logger.info(f"     📍 PHASE 3: Deterministic matching for remaining orders...")
+            logger.info("     📍 PHASE 3: Deterministic matching for remaining orders...")
             phase3_matches = 0
 
             # Get remaining unmatched BullX orders
@@ -1466,16 +1519,16 @@ class EnhancedOrderProcessor:
                     identification_results[row_index] = match_result
                     matched_order_ids.add(match_result['order'].id)
                     phase3_matches += 1
-                    logger.info(f"        ✅ Row {row_index} → Order {match_result['order'].id} (bracket {match_result['bracket_id']}) via deterministic")
+                    logger.info("        ✅ Row %s → Order %s (bracket %s) via deterministic", row_index, match_result['order'].id, match_result['bracket_id'])
                 else:
-                    logger.warning(f"        ❌ Row {row_index}: No match found (might be orphaned)")
+                    logger.warning("        ❌ Row %s: No match found (might be orphaned)", row_index)
             elif len(unmatched_bullx_orders) > 1:
                 # Multiple unmatched - can't use deterministic matching
                 for order_info in unmatched_bullx_orders:
-                    logger.warning(f"        ❌ Row {order_info['row_index']}: No match found (might be orphaned)")
+                    logger.warning("        ❌ Row %s: No match found (might be orphaned)", order_info['row_index'])
 
-            logger.info(f"     ✅ Phase 3 complete: {phase3_matches} additional orders matched")
-            logger.info(f"     📊 Total: {len(identification_results)}/{len(coin_orders)} orders identified")
+            logger.info("     ✅ Phase 3 complete: %s additional orders matched", phase3_matches)
+            logger.info("     📊 Total: %s/%s orders identified", len(identification_results), len(coin_orders))
 
             # Check for unmatched database orders (missing from BullX)
             unmatched_db_orders = [
@@ -1483,31 +1536,41 @@ class EnhancedOrderProcessor:
                 if order.id not in matched_order_ids
             ]
             if unmatched_db_orders:
-                logger.warning(f"     ⚠️  {len(unmatched_db_orders)} database orders NOT found on BullX:")
+                logger.warning("     ⚠️  %s database orders NOT found on BullX:", len(unmatched_db_orders))
                 for order in unmatched_db_orders:
-                    logger.warning(f"        Order {order.id} (bracket {order.bracket_id}) - exists in DB but not on BullX")
+                    logger.warning("        Order %s (bracket %s) - exists in DB but not on BullX", order.id, order.bracket_id)
 
             return identification_results
 
         except Exception as e:
-            logger.error(f"  💥 Error in two-phase identification: {e}")
+            logger.error("  💥 Error in two-phase identification: %s", e)
             return {}
 
+    def _take_coin_orders(self, coin_id: int) -> List[Order]:
+        """DB orders for a coin, using (and consuming) the batch-prefetched list when there is one"""
+        orders = self.prefetched_orders.pop(coin_id, None)
+        if orders is None:
+            orders = db_manager.get_orders_by_coin(coin_id)
+        return orders
+    
     def _find_coin_by_token(self, token: str) -> Optional[Coin]:
-        """Find coin by token name"""
+        """Find coin by token name (cached for the current processing run)"""
+        if token in self.coin_cache:
+            return self.coin_cache[token]
+        
         try:
             # Try exact name match first
             coin = db_manager.get_coin_by_name(token)
-            if coin:
-                return coin
-
-            # Try partial name match
-            all_coins = db_manager.get_all_coins()
-            for coin in all_coins:
-                if coin.name and token.lower() in coin.name.lower():
-                    return coin
-
-            return None
+            if not coin:
+                # Try partial name match
+                token_lower = token.lower()
+                coin = next(
+                    (c for c in db_manager.get_all_coins() if c.name and token_lower in c.name.lower()),
+                    None
+                )
+            
+            self.coin_cache[token] = coin
+            return coin
 
         except Exception as e:
             logger.error(f"Error finding coin by token '{token}': {e}")
@@ -1627,7 +1690,7 @@ class EnhancedOrderProcessor:
             TYPICAL_ORDER_DURATION_SECONDS = 72 * 3600  # 72 hours
             
             best_match = None
-            smallest_difference = float('inf')
+            smallest_difference = math.inf
             
             # Determine which timestamp to use based on trigger condition
             is_tp_condition = self._is_tp_condition(trigger_condition) or "TP" in trigger_condition.upper()
@@ -2088,7 +2151,7 @@ class EnhancedOrderProcessor:
             
             # Try fuzzy match for numeric values (including partial fill logic)
             best_match = None
-            smallest_difference = float('inf')
+            smallest_difference = math.inf
             
             for order in unmatched_orders:
                 if not order.order_amount:
@@ -2306,66 +2369,6 @@ class EnhancedOrderProcessor:
             logger.error(f"Error verifying with entry price: {e}")
             return True  # Assume correct if verification fails
     
-    async def _mark_order_for_renewal(self, order: Order, parsed_data: Dict[str, Any], 
-                                    button_index: int, row_index: int):
-        """Mark order for renewal and update database - only if BullX deletion succeeds"""
-        try:
-            logger.info(f"    📝 Processing order {order.id} for renewal...")
-            
-            # First, get coin information safely
-            coin = self._get_coin_safely(order)
-            if not coin:
-                logger.error(f"    ❌ Could not find coin for order {order.id}")
-                return
-            
-            logger.info(f"    🪙 Found coin: {coin.name or coin.address} (Bracket: {coin.bracket})")
-
-            # Try to delete entry from BullX first (with verification)
-            deletion_success = await self._delete_bullx_entry(
-                order.profile_name,  # type: ignore
-                button_index,
-                row_index,
-                expected_coin_address=coin.address,  # type: ignore
-                expected_bracket_id=order.bracket_id  # type: ignore
-            )
-            
-            if not deletion_success:
-                logger.error(f"    ❌ BullX deletion failed - skipping database update for order {order.id}")
-                return
-            
-            # Only update database if BullX deletion succeeded
-            logger.info(f"    📝 BullX deletion successful - updating database for order {order.id}")
-            db_update_success = db_manager.update_order_status(order.id, "COMPLETED")
-            
-            if not db_update_success:
-                logger.error(f"    ❌ Database update failed for order {order.id}")
-                return
-            
-            logger.info(f"    ✅ Updated order {order.id} status to COMPLETED")
-            
-            # Add to renewal list with additional information
-            renewal_info = {
-                'order_id': order.id,  # Store ID instead of object to avoid session issues
-                'coin_address': coin.address,
-                'coin_name': coin.name,
-                'parsed_data': parsed_data,
-                'button_index': button_index,
-                'row_index': row_index,
-                'original_bracket': coin.bracket,
-                'bracket_sub_id': order.bracket_id,
-                'profile_name': order.profile_name,
-                'amount': order.amount or 1.0
-            }
-            
-            self.orders_for_renewal.append(renewal_info)
-            
-            logger.info(f"    ✅ Order {order.id} successfully marked for renewal")
-            
-        except Exception as e:
-            logger.error(f"    💥 Error marking order for renewal: {e}")
-            import traceback
-            logger.error(f"    💥 Traceback: {traceback.format_exc()}")
-    
     def _check_sl_with_any_expired(self, coin_orders: List[Dict]) -> bool:
         """
         PRIORITY 1: Check if coin has SL hit ("1 TP") AND any expired orders.
@@ -2448,43 +2451,6 @@ class EnhancedOrderProcessor:
         """
         return self._check_sl_with_any_expired(coin_orders)
     
-    def _get_coin_safely(self, order: Order) -> Optional[Coin]:
-        """Safely get coin information without session issues"""
-        try:
-            # Method 1: Try to get coin by coin_id directly
-            from database import SessionLocal
-            db = SessionLocal()
-            try:
-                from models import Coin
-                coin = db.query(Coin).filter(Coin.id == order.coin_id).first()
-                if coin:
-                    # Create a detached copy to avoid session issues
-                    coin_data = {
-                        'id': coin.id,
-                        'name': coin.name,
-                        'address': coin.address,
-                        'bracket': coin.bracket,
-                        'market_cap': coin.market_cap
-                    }
-                    db.expunge(coin)  # Detach from session
-                    return coin
-            finally:
-                db.close()
-            
-            # Method 2: Fallback - try to access the relationship if it's already loaded
-            try:
-                if hasattr(order, 'coin') and order.coin:
-                    coin_address = order.coin.address
-                    return db_manager.get_coin_by_address(coin_address)
-            except Exception as e:
-                logger.debug(f"Could not access order.coin relationship: {e}")
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting coin safely: {e}")
-            return None
-    
     async def _process_individual_expired_orders(self, profile_name: str) -> Dict:
         """
         Process individual expired orders: Delete from BullX, update to EXPIRED, mark for renewal.
@@ -3130,7 +3096,7 @@ class EnhancedOrderProcessor:
                 orphaned = []
                 for bullx_order in coin_orders:
                     # Try to identify this BullX order in the database
-                    order_match = self._identify_order(bullx_order['parsed_data'], profile_name)
+                    order_match = self._identify_order(bullx_order['parsed_data'], profile_name, all_orders=db_orders)
 
                     if not order_match or order_match.get('status') != 'success':
                         # Could not match to any ACTIVE database order - it's orphaned
@@ -3511,13 +3477,13 @@ class EnhancedOrderProcessor:
                     return False
 
             # Construct the XPATH for the specific row
-            xpath = f"//*[@id='root']/div[1]/div[2]/main/div/section/div[2]/div[2]/div/div/div/div[1]/a[{row_index}]/div[11]/div/button"
+            xpath = _DELETE_XPATH_TMPL.format(row=row_index)
 
             logger.info(f"    🗑️  Deleting BullX entry for row {row_index}")
 
             try:
                 # Wait for the element to be clickable
-                delete_button = WebDriverWait(driver, 10).until(
+                delete_button = self.driver_manager.get_wait(profile_name, 10).until(
                     EC.element_to_be_clickable((By.XPATH, xpath))
                 )
 
@@ -3552,7 +3518,7 @@ class EnhancedOrderProcessor:
                 logger.info("📝 No orders marked for renewal")
                 return {"orders_replaced": 0, "renewal_details": []}
             
-            logger.info(f"📝 Processing {len(self.orders_for_renewal)} orders for renewal...")
+            logger.info("📝 Processing %s orders for renewal...", len(self.orders_for_renewal))
             
             renewal_details = []
             orders_replaced = 0
@@ -3573,9 +3539,9 @@ class EnhancedOrderProcessor:
                     coin_name = first_renewal['coin_name']
                     original_bracket = first_renewal['original_bracket']
                     
-                    logger.info(f"\n🪙 Processing renewals for {coin_name or coin_address}:")
-                    logger.info(f"   Original Bracket: {original_bracket}")
-                    logger.info(f"   Orders to replace: {len(coin_renewals)}")
+                    logger.info("\n🪙 Processing renewals for %s:", coin_name or coin_address)
+                    logger.info("   Original Bracket: %s", original_bracket)
+                    logger.info("   Orders to replace: %s", len(coin_renewals))
                     
                     coin_renewal_details = {
                         'coin_address': coin_address,
@@ -3592,7 +3558,7 @@ class EnhancedOrderProcessor:
                             bracket_sub_id = renewal_info['bracket_sub_id']
                             amount = renewal_info['amount']
                             
-                            logger.info(f"   🔄 Replacing order: ID {order_id}, Bracket Sub ID {bracket_sub_id}")
+                            logger.info("   🔄 Replacing order: ID %s, Bracket Sub ID %s", order_id, bracket_sub_id)
                             
                             # Add to replacement details
                             coin_renewal_details['orders_to_replace'].append({
@@ -3609,17 +3575,17 @@ class EnhancedOrderProcessor:
                             if new_order_result["success"]:
                                 orders_replaced += 1
                                 coin_renewal_details['new_orders_created'].append(new_order_result)
-                                logger.info(f"   ✅ Successfully created replacement order")
+                                logger.info("   ✅ Successfully created replacement order")
                             else:
-                                logger.error(f"   ❌ Failed to create replacement order: {new_order_result.get('error')}")
+                                logger.error("   ❌ Failed to create replacement order: %s", new_order_result.get('error'))
                                 
                         except Exception as e:
-                            logger.error(f"   💥 Error processing renewal for order {renewal_info['order_id']}: {e}")
+                            logger.error("   💥 Error processing renewal for order %s: %s", renewal_info['order_id'], e)
                     
                     renewal_details.append(coin_renewal_details)
                     
                 except Exception as e:
-                    logger.error(f"💥 Error processing renewals for coin {coin_address}: {e}")
+                    logger.error("💥 Error processing renewals for coin %s: %s", coin_address, e)
             
             return {
                 "orders_replaced": orders_replaced,
@@ -3627,7 +3593,7 @@ class EnhancedOrderProcessor:
             }
             
         except Exception as e:
-            logger.error(f"💥 Error processing renewal orders: {e}")
+            logger.error("💥 Error processing renewal orders: %s", e)
             return {"orders_replaced": 0, "renewal_details": [], "error": str(e)}
     
     async def _create_replacement_order(self, profile_name: str, coin_address: str, 
@@ -3635,11 +3601,13 @@ class EnhancedOrderProcessor:
                                       original_bracket: int = None) -> Dict:
         """Create a replacement order using bracket_order_placement with original bracket preservation"""
         try:
-            logger.info(f"      🔨 Creating replacement order for bracket sub ID {bracket_sub_id}...")
+            logger.info("      🔨 Creating replacement order for bracket sub ID %s...", bracket_sub_id)
             if original_bracket:
-                logger.info(f"         Using original bracket {original_bracket} (preserving bracket consistency)")
+                logger.info("         Using original bracket %s (preserving bracket consistency)", original_bracket)
             
-            # Use bracket_order_manager to replace the specific order with original bracket
+            # Use bracket_order_manager to replace the specific order with original bracket.
+            # Called synchronously on purpose: it drives the profile's Chrome driver, which
+            # the routers and queue processor also use, and the run's state must not interleave
             result = bracket_order_manager.replace_order(
                 profile_name=profile_name,
                 address=coin_address,
@@ -3649,14 +3617,14 @@ class EnhancedOrderProcessor:
             )
             
             if result["success"]:
-                logger.info(f"      ✅ Replacement order created successfully")
+                logger.info("      ✅ Replacement order created successfully")
                 return {
                     "success": True,
                     "bracket_sub_id": bracket_sub_id,
                     "order_details": result.get("order", {})
                 }
             else:
-                logger.error(f"      ❌ Failed to create replacement order: {result.get('error')}")
+                logger.error("      ❌ Failed to create replacement order: %s", result.get('error'))
                 return {
                     "success": False,
                     "bracket_sub_id": bracket_sub_id,
@@ -3664,7 +3632,7 @@ class EnhancedOrderProcessor:
                 }
                 
         except Exception as e:
-            logger.error(f"      💥 Error creating replacement order: {e}")
+            logger.error("      💥 Error creating replacement order: %s", e)
             return {
                 "success": False,
                 "bracket_sub_id": bracket_sub_id,
@@ -3674,15 +3642,15 @@ class EnhancedOrderProcessor:
     def _generate_processing_summary(self, check_result: Dict, renewal_results: Dict, expired_results: Dict = None, individual_expired_results: Dict = None) -> str:
         """Generate comprehensive processing summary"""
         try:
-            summary_lines = []
-            summary_lines.append("📊 ENHANCED ORDER PROCESSING SUMMARY")
-            summary_lines.append("=" * 50)
-            
             # Order checking summary
             total_checked = check_result.get("total_orders_checked", 0)
             tp_detected = check_result.get("tp_detected_count", 0)
-            summary_lines.append(f"📋 Orders Checked: {total_checked}")
-            summary_lines.append(f"🎯 TP Conditions Detected: {tp_detected}")
+            summary_lines = [
+                "📊 ENHANCED ORDER PROCESSING SUMMARY",
+                "=" * 50,
+                f"📋 Orders Checked: {total_checked}",
+                f"🎯 TP Conditions Detected: {tp_detected}"
+            ]
             
             # Expired coins summary (cancel all + sell)
             if expired_results:
@@ -3709,16 +3677,18 @@ class EnhancedOrderProcessor:
                     orders_to_replace = coin_detail.get('orders_to_replace', [])
                     new_orders = coin_detail.get('new_orders_created', [])
                     
-                    summary_lines.append(f"  • {coin_name} ({coin_address})")
-                    summary_lines.append(f"    Bracket: {original_bracket}")
-                    summary_lines.append(f"    Orders Replaced: {len(orders_to_replace)}")
-                    
-                    for order_info in orders_to_replace:
-                        bracket_sub_id = order_info.get('bracket_sub_id', 'Unknown')
-                        summary_lines.append(f"      - Bracket Sub ID {bracket_sub_id}")
+                    summary_lines.extend((
+                        f"  • {coin_name} ({coin_address})",
+                        f"    Bracket: {original_bracket}",
+                        f"    Orders Replaced: {len(orders_to_replace)}"
+                    ))
+                    summary_lines.extend(
+                        f"      - Bracket Sub ID {order_info.get('bracket_sub_id', 'Unknown')}"
+                        for order_info in orders_to_replace
+                    )
                     
-                    successful_new_orders = [o for o in new_orders if o.get('success')]
-                    summary_lines.append(f"    New Orders Created: {len(successful_new_orders)}")
+                    successful_new_orders = sum(1 for o in new_orders if o.get('success'))
+                    summary_lines.append(f"    New Orders Created: {successful_new_orders}")
             
             return "\n".join(summary_lines)
             
@@ -3741,4 +3711,6 @@ async def process_orders_enhanced(profile_name: str) -> Dict:
     Returns:
         Dict with processing results
     """
-    return await enhanced_order_processor.process_orders_enhanced(profile_name)
+    # A run keeps its tracking (orders_for_renewal, pending_completions, ...) on the
+    # processor, so each run gets its own instead of sharing one across overlapping runs
+    return await EnhancedOrderProcessor().process_orders_enhanced(profile_name)
@@ -237,5 +237,7 @@ if __name__ == "__main__":
         host=config.API_HOST,
         port=config.API_PORT,
         reload=config.API_RELOAD,  # Default False: auto-reload causes issues with log/db file changes
+        loop=config.API_LOOP,
+        http=config.API_HTTP,
         log_level=config.LOG_LEVEL.lower()
     )
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import List, Literal, Optional
+import asyncio
 import logging
 import os
 import re
+import time
+import orjson
 from datetime import datetime, date
 
 # Import our modules
@@ -20,7 +24,8 @@ from bracket_config import get_bracket_info as get_bracket_config_info, calculat
 from bracket_order_placement import bracket_order_manager
 from config import config
 from background_task_monitor import (
-    get_background_task_health, get_task_execution_history,
+    get_background_task_health, iter_task_execution_history,
+    get_missed_tasks_since,
     start_background_tasks_for_profile, stop_background_tasks_for_profile,
     enhanced_order_monitor, queue_processor
 )
@@ -34,13 +39,89 @@ router = APIRouter(
     prefix="/api/v1",
     tags=["secure"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
+# Profiles whose background tasks may be inspected/controlled by any authenticated profile.
+# Used as the {profile_name} path parameter type so FastAPI rejects unknown names with a 422.
+ProfileName = Literal["Saruman", "Gandalf"]
+
+def validate_profile_access(profile_name: ProfileName, current_profile: Profile = Depends(get_current_profile)) -> str:
+    """Dependency resolving the {profile_name} path parameter for an authenticated profile"""
+    return profile_name
+
+# Pre-serialized success bodies for hot control endpoints; placeholders are filled by
+# _render_template with JSON-escaped values so no dict is built or encoded per request
+_BACKGROUND_STARTED_TEMPLATE = orjson.dumps({
+    "success": True,
+    "message": "Background monitoring started for profile: __PROFILE__",
+    "profile_name": "__PROFILE__"
+})
+_BACKGROUND_STOPPED_TEMPLATE = orjson.dumps({
+    "success": True,
+    "message": "Background monitoring stopped for profile: __PROFILE__",
+    "profile_name": "__PROFILE__"
+})
+_MANUAL_CHECK_TEMPLATE = orjson.dumps({
+    "success": True,
+    "message": "Manual background check completed for profile: __PROFILE__",
+    "profile_name": "__PROFILE__"
+})
+_CLEAR_ALL_DATA_TEMPLATE = orjson.dumps({
+    "success": True,
+    "message": "Successfully cleared all data for profile __PROFILE__",
+    "coins_cleared": "__COINS_CLEARED__",
+    "orders_cleared": "__ORDERS_CLEARED__",
+    "profile": "__PROFILE__"
+})
+
+def _render_template(template: bytes, profile_name: str, **counts: int) -> Response:
+    """Fill a pre-serialized response template and wrap it in a JSON response"""
+    body = template.replace(b"__PROFILE__", orjson.dumps(profile_name)[1:-1])
+    for name, value in counts.items():
+        body = body.replace(b'"__' + name.upper().encode() + b'__"', b"%d" % value)
+    return Response(content=body, media_type="application/json")
+
+# Rows fetched from the database per chunk when streaming list responses
+STREAM_CHUNK_SIZE = 100
+
+def _stream_json_list(fetch_page, response_model, limit: Optional[int], after_id: int) -> StreamingResponse:
+    """Stream rows as a JSON array (all of them, or up to `limit`), fetching them in keyset-paginated chunks.
+    
+    The first chunk is fetched eagerly so database errors still surface as a 500
+    before the response has started.
+    """
+    def page_size(remaining: Optional[int]) -> int:
+        return STREAM_CHUNK_SIZE if remaining is None else min(remaining, STREAM_CHUNK_SIZE)
+    
+    first_chunk = fetch_page(page_size(limit), after_id)
+    
+    # A plain generator: Starlette iterates it in its threadpool, so the later
+    # fetch_page queries don't block the event loop
+    def generate():
+        chunk = first_chunk
+        remaining = limit
+        separator = b"["
+        while chunk:
+            for row in chunk:
+                yield separator + response_model.from_orm(row).model_dump_json().encode()
+                separator = b","
+            if remaining is not None:
+                remaining -= len(chunk)
+                if remaining <= 0:
+                    break
+            if len(chunk) < STREAM_CHUNK_SIZE:
+                break
+            chunk = fetch_page(page_size(remaining), chunk[-1].id)
+        yield b"[]" if separator == b"[" else b"]"
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
 @router.post("/login")
 async def login(current_profile: Profile = Depends(get_current_profile)):
     """Login endpoint - opens browser and navigates to BullX for login"""
     try:
-        logger.info(f"Login request for profile: {current_profile.name}")
+        logger.info("Login request for profile: %s", current_profile.name)
         
         # Attempt login
         success = bullx_automator.login(current_profile.name)
@@ -55,7 +136,7 @@ async def login(current_profile: Profile = Depends(get_current_profile)):
         else:
             raise HTTPException(status_code=500, detail="Login failed")
     except Exception as e:
-        logger.error(f"Login error: {e}")
+        logger.error("Login error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -63,7 +144,7 @@ async def login(current_profile: Profile = Depends(get_current_profile)):
 async def search_address(request: SearchRequest, current_profile: Profile = Depends(get_current_profile)):
     """Search for a specific address/token"""
     try:
-        logger.info(f"Search request for address: {request.address} using profile: {current_profile.name}")
+        logger.info("Search request for address: %s using profile: %s", request.address, current_profile.name)
         
         # Perform search
         success = bullx_automator.search_address(current_profile.name, request.address)
@@ -95,14 +176,14 @@ async def search_address(request: SearchRequest, current_profile: Profile = Depe
             raise HTTPException(status_code=500, detail="Search failed")
             
     except Exception as e:
-        logger.error(f"Search error: {e}")
+        logger.error("Search error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/strategy")
 async def execute_strategy(request: StrategyRequest, current_profile: Profile = Depends(get_current_profile)):
     """Execute a trading strategy"""
     try:
-        logger.info(f"Strategy execution request: Strategy {request.strategy_number} for {request.address}")
+        logger.info("Strategy execution request: Strategy %s for %s", request.strategy_number, request.address)
         
         # Validate order type
         if request.order_type.upper() not in ["BUY", "SELL"]:
@@ -158,17 +239,23 @@ async def execute_strategy(request: StrategyRequest, current_profile: Profile =
             raise HTTPException(status_code=500, detail="Strategy execution failed")
             
     except Exception as e:
-        logger.error(f"Strategy execution error: {e}")
+        logger.error("Strategy execution error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/orders", response_model=List[OrderResponse])
-async def get_orders(current_profile: Profile = Depends(get_current_profile)):
-    """Get active orders for the authenticated profile"""
+async def get_orders(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of orders to return (all when omitted)"),
+    after_id: int = Query(0, ge=0, description="Return orders with id greater than this (keyset cursor)"),
+    current_profile: Profile = Depends(get_current_profile)
+):
+    """Get active orders for the authenticated profile (streamed, paginated by id)"""
     try:
-        orders = db_manager.get_active_orders_by_profile(current_profile.name)
-        return [OrderResponse.from_orm(order) for order in orders]
+        return _stream_json_list(
+            lambda page_size, cursor: db_manager.get_active_orders_page(current_profile.name, page_size, cursor),
+            OrderResponse, limit, after_id
+        )
     except Exception as e:
-        logger.error(f"Error getting orders: {e}")
+        logger.error("Error getting orders: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/profile", response_model=ProfileResponse)
@@ -177,17 +264,20 @@ async def get_profile(current_profile: Profile = Depends(get_current_profile)):
     try:
         return ProfileResponse.from_orm(current_profile)
     except Exception as e:
-        logger.error(f"Error getting profile: {e}")
+        logger.error("Error getting profile: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/coins", response_model=List[CoinResponse])
-async def get_coins(current_profile: Profile = Depends(get_current_profile)):
-    """Get all coins in the database"""
+async def get_coins(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of coins to return (all when omitted)"),
+    after_id: int = Query(0, ge=0, description="Return coins with id greater than this (keyset cursor)"),
+    current_profile: Profile = Depends(get_current_profile)
+):
+    """Get coins in the database (streamed, paginated by id)"""
     try:
-        coins = db_manager.get_all_coins()
-        return [CoinResponse.from_orm(coin) for coin in coins]
+        return _stream_json_list(db_manager.get_coins_page, CoinResponse, limit, after_id)
     except Exception as e:
-        logger.error(f"Error getting coins: {e}")
+        logger.error("Error getting coins: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/coins/{address}", response_model=CoinResponse)
@@ -201,7 +291,7 @@ async def get_coin(address: str, current_profile: Profile = Depends(get_current_
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting coin: {e}")
+        logger.error("Error getting coin: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/coins/{address}/orders", response_model=List[OrderResponse])
@@ -231,7 +321,7 @@ async def get_coin_orders(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting coin orders: {e}")
+        logger.error("Error getting coin orders: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/close-driver")
@@ -244,7 +334,7 @@ async def close_driver(current_profile: Profile = Depends(get_current_profile)):
             "message": f"Chrome driver closed for profile: {current_profile.name}"
         }
     except Exception as e:
-        logger.error(f"Error closing driver: {e}")
+        logger.error("Error closing driver: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # New multi-order endpoints
@@ -252,28 +342,28 @@ async def close_driver(current_profile: Profile = Depends(get_current_profile)):
 async def create_multi_order(request: MultiOrderRequest, current_profile: Profile = Depends(get_current_profile)):
     """Create multiple orders for a coin (up to 4 orders with different bracket_ids)"""
     try:
-        logger.info(f"Multi-order request for address: {request.address} using profile: {current_profile.name}")
+        logger.info("Multi-order request for address: %s using profile: %s", request.address, current_profile.name)
         
         # Validate order type
         if request.order_type.upper() not in ["BUY", "SELL"]:
             raise HTTPException(status_code=400, detail="Order type must be 'BUY' or 'SELL'")
         
-        # Validate bracket_ids are unique and within range
-        bracket_ids = [order.bracket_id for order in request.orders]
-        if len(set(bracket_ids)) != len(bracket_ids):
-            raise HTTPException(status_code=400, detail="Bracket IDs must be unique")
-        
-        if not all(1 <= bid <= 4 for bid in bracket_ids):
-            raise HTTPException(status_code=400, detail="Bracket IDs must be between 1 and 4")
-        
         if len(request.orders) > 4:
             raise HTTPException(status_code=400, detail="Maximum 4 orders allowed per coin")
         
-        # Convert to dict format for database
+        # Validate bracket_ids (range + uniqueness via bitmask) and convert to dict format in one pass
+        seen_mask = 0
         sub_orders = []
         for order in request.orders:
+            bid = order.bracket_id
+            if bid < 1 or bid > 4:
+                raise HTTPException(status_code=400, detail="Bracket IDs must be between 1 and 4")
+            bit = 1 << bid
+            if seen_mask & bit:
+                raise HTTPException(status_code=400, detail="Bracket IDs must be unique")
+            seen_mask |= bit
             sub_orders.append({
-                'bracket_id': order.bracket_id,
+                'bracket_id': bid,
                 'entry_price': order.entry_price,
                 'take_profit': order.take_profit,
                 'stop_loss': order.stop_loss,
@@ -300,11 +390,13 @@ async def create_multi_order(request: MultiOrderRequest, current_profile: Profil
         else:
             raise HTTPException(status_code=500, detail="Multi-order creation failed")
             
+    except HTTPException:
+        raise
     except ValueError as e:
-        logger.error(f"Multi-order validation error: {e}")
+        logger.error("Multi-order validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Multi-order creation error: {e}")
+        logger.error("Multi-order creation error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/replace-order/{coin_address}/{bracket_id}")
@@ -316,7 +408,7 @@ async def replace_order(
 ):
     """Replace a completed/stopped order with a new one maintaining the same bracket_id"""
     try:
-        logger.info(f"Replace order request for {coin_address}, bracket_id: {bracket_id}")
+        logger.info("Replace order request for %s, bracket_id: %s", coin_address, bracket_id)
         
         # Validate bracket_id
         if not 1 <= bracket_id <= 4:
@@ -353,14 +445,18 @@ async def replace_order(
         }
         
     except Exception as e:
-        logger.error(f"Replace order error: {e}")
+        logger.error("Replace order error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/orders-summary")
-async def get_orders_summary(current_profile: Profile = Depends(get_current_profile)):
+async def get_orders_summary(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of coins to include"),
+    after_coin_id: int = Query(0, ge=0, description="Only include coins with id greater than this (keyset cursor)"),
+    current_profile: Profile = Depends(get_current_profile)
+):
     """Get a summary of active orders grouped by coin and bracket_id"""
     try:
-        summary = db_manager.get_active_orders_summary(current_profile.name)
+        summary = db_manager.get_active_orders_summary(current_profile.name, limit=limit, after_coin_id=after_coin_id)
         
         # Convert to a more API-friendly format
         formatted_summary = {}
@@ -381,7 +477,7 @@ async def get_orders_summary(current_profile: Profile = Depends(get_current_prof
         }
         
     except Exception as e:
-        logger.error(f"Error getting orders summary: {e}")
+        logger.error("Error getting orders summary: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/brackets", response_model=List[BracketInfo])
@@ -401,7 +497,7 @@ async def get_brackets_info(current_profile: Profile = Depends(get_current_profi
         return brackets
         
     except Exception as e:
-        logger.error(f"Error getting bracket info: {e}")
+        logger.error("Error getting bracket info: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/coins/{address}/next-bracket-id")
@@ -428,7 +524,7 @@ async def get_next_bracket_id(address: str, current_profile: Profile = Depends(g
         }
         
     except Exception as e:
-        logger.error(f"Error getting next bracket ID: {e}")
+        logger.error("Error getting next bracket ID: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # New bracket-based endpoints
@@ -442,7 +538,7 @@ async def create_auto_multi_order(
 ):
     """Create multiple orders automatically using bracket configuration"""
     try:
-        logger.info(f"Auto multi-order request for address: {address} using profile: {current_profile.name}")
+        logger.info("Auto multi-order request for address: %s using profile: %s", address, current_profile.name)
         
         # Validate order type
         if order_type.upper() not in ["BUY", "SELL"]:
@@ -474,10 +570,10 @@ async def create_auto_multi_order(
             raise HTTPException(status_code=500, detail="Auto multi-order creation failed")
             
     except ValueError as e:
-        logger.error(f"Auto multi-order validation error: {e}")
+        logger.error("Auto multi-order validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Auto multi-order creation error: {e}")
+        logger.error("Auto multi-order creation error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/coins/{address}/bracket-orders")
@@ -520,7 +616,7 @@ async def get_bracket_order_preview(
         }
         
     except Exception as e:
-        logger.error(f"Error getting bracket order preview: {e}")
+        logger.error("Error getting bracket order preview: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/bracket-config")
@@ -542,7 +638,7 @@ async def get_bracket_config(current_profile: Profile = Depends(get_current_prof
         }
         
     except Exception as e:
-        logger.error(f"Error getting bracket config: {e}")
+        logger.error("Error getting bracket config: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # New bracket order placement endpoints
@@ -555,7 +651,7 @@ async def execute_bracket_strategy(
 ):
     """Execute complete bracket strategy for a coin - places all 4 bracket orders"""
     try:
-        logger.info(f"Bracket strategy execution request for address: {address} using profile: {current_profile.name}")
+        logger.info("Bracket strategy execution request for address: %s using profile: %s", address, current_profile.name)
         
         # Validate total amount
         if total_amount <= 0:
@@ -590,7 +686,7 @@ async def execute_bracket_strategy(
             raise HTTPException(status_code=500, detail=f"Bracket strategy execution failed: {result['error']}")
             
     except Exception as e:
-        logger.error(f"Bracket strategy execution error: {e}")
+        logger.error("Bracket strategy execution error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/bracket-order-replace/{address}/{bracket_id}")
@@ -602,7 +698,7 @@ async def replace_bracket_order(
 ):
     """Replace a specific bracket order with a new one"""
     try:
-        logger.info(f"Replace bracket order request for {address}, bracket_id: {bracket_id}")
+        logger.info("Replace bracket order request for %s, bracket_id: %s", address, bracket_id)
         
         # Validate bracket_id
         if not 1 <= bracket_id <= 4:
@@ -631,7 +727,7 @@ async def replace_bracket_order(
             raise HTTPException(status_code=500, detail=f"Bracket order replacement failed: {result['error']}")
             
     except Exception as e:
-        logger.error(f"Bracket order replacement error: {e}")
+        logger.error("Bracket order replacement error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/bracket-preview/{address}")
@@ -642,7 +738,7 @@ async def get_bracket_strategy_preview(
 ):
     """Preview bracket orders that would be placed without actually placing them"""
     try:
-        logger.info(f"Bracket preview request for address: {address}")
+        logger.info("Bracket preview request for address: %s", address)
         
         # Validate total amount
         if total_amount <= 0:
@@ -670,7 +766,7 @@ async def get_bracket_strategy_preview(
             raise HTTPException(status_code=500, detail=f"Bracket preview failed: {preview['error']}")
             
     except Exception as e:
-        logger.error(f"Bracket preview error: {e}")
+        logger.error("Bracket preview error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/market-cap/{address}")
@@ -680,7 +776,7 @@ async def get_current_market_cap(
 ):
     """Get current market cap for a token"""
     try:
-        logger.info(f"Market cap request for address: {address}")
+        logger.info("Market cap request for address: %s", address)
         
         # Search for the address first to ensure we have current data
         search_success = bullx_automator.search_address(current_profile.name, address)
@@ -709,7 +805,7 @@ async def get_current_market_cap(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Market cap retrieval error: {e}")
+        logger.error("Market cap retrieval error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/check-orders")
@@ -719,7 +815,7 @@ async def check_orders(current_profile: Profile = Depends(get_current_profile)):
         # Import and use the enhanced background tasks function directly
         from background_tasks import check_orders_enhanced_for_profile
         
-        logger.info(f"API enhanced order check request for profile: {current_profile.name}")
+        logger.info("API enhanced order check request for profile: %s", current_profile.name)
         
         # Use the enhanced order processing function
         result = await check_orders_enhanced_for_profile(current_profile.name)
@@ -738,69 +834,58 @@ async def check_orders(current_profile: Profile = Depends(get_current_profile)):
             raise HTTPException(status_code=500, detail=f"Enhanced order check failed: {result.get('error')}")
             
     except Exception as e:
-        logger.error(f"Enhanced order check API error: {e}")
+        logger.error("Enhanced order check API error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _strategy3_multipliers(multiplier: float) -> dict:
+    """Build (entry, take_profit, stop_loss) multipliers for the market cap based strategy"""
+    return {
+        "BUY": (1 - 0.03 * multiplier, 1 + 0.08 * multiplier, 1 - 0.06 * multiplier),
+        "SELL": (1 + 0.03 * multiplier, 1 - 0.08 * multiplier, 1 + 0.06 * multiplier),
+    }
+
+# (entry_price, take_profit, stop_loss) multipliers relative to the base price,
+# keyed by strategy number and then order side
+STRATEGY_PRICE_MULTIPLIERS = {
+    1: {  # Conservative: enter 2% away, 5% profit, 5% loss
+        "BUY": (0.98, 1.05, 0.95),
+        "SELL": (1.02, 0.95, 1.05),
+    },
+    2: {  # Aggressive: enter 5% away, 15% profit, 10% loss
+        "BUY": (0.95, 1.15, 0.90),
+        "SELL": (1.05, 0.85, 1.10),
+    },
+}
+# Strategy 3 (market cap based): more conservative above 1M market cap, more aggressive below
+STRATEGY_3_LARGE_CAP_MULTIPLIERS = _strategy3_multipliers(0.5)
+STRATEGY_3_SMALL_CAP_MULTIPLIERS = _strategy3_multipliers(1.5)
+DEFAULT_STRATEGY_MULTIPLIERS = {
+    "BUY": (0.97, 1.10, 0.93),
+    "SELL": (1.03, 0.90, 1.07),
+}
+
 def calculate_strategy_prices(strategy_number: int, market_cap: float, order_type: str) -> dict:
     """Calculate default prices based on strategy and market cap"""
     # This is a basic implementation - you can customize based on your strategies
     
     base_price = 1.0  # This should be the current token price (you'll need to implement price fetching)
     
-    if strategy_number == 1:  # Conservative
-        if order_type.upper() == "BUY":
-            entry_price = base_price * 0.98  # Buy 2% below current price
-            take_profit = base_price * 1.05  # 5% profit
-            stop_loss = base_price * 0.95    # 5% loss
-        else:  # SELL
-            entry_price = base_price * 1.02  # Sell 2% above current price
-            take_profit = base_price * 0.95  # 5% profit (price goes down)
-            stop_loss = base_price * 1.05    # 5% loss (price goes up)
-    
-    elif strategy_number == 2:  # Aggressive
-        if order_type.upper() == "BUY":
-            entry_price = base_price * 0.95  # Buy 5% below current price
-            take_profit = base_price * 1.15  # 15% profit
-            stop_loss = base_price * 0.90    # 10% loss
-        else:  # SELL
-            entry_price = base_price * 1.05  # Sell 5% above current price
-            take_profit = base_price * 0.85  # 15% profit (price goes down)
-            stop_loss = base_price * 1.10    # 10% loss (price goes up)
-    
-    elif strategy_number == 3:  # Market cap based
-        if market_cap > 1000000:  # > 1M market cap
-            multiplier = 0.5  # More conservative for larger market cap
-        else:
-            multiplier = 1.5  # More aggressive for smaller market cap
-        
-        if order_type.upper() == "BUY":
-            entry_price = base_price * (1 - 0.03 * multiplier)
-            take_profit = base_price * (1 + 0.08 * multiplier)
-            stop_loss = base_price * (1 - 0.06 * multiplier)
-        else:  # SELL
-            entry_price = base_price * (1 + 0.03 * multiplier)
-            take_profit = base_price * (1 - 0.08 * multiplier)
-            stop_loss = base_price * (1 + 0.06 * multiplier)
-    
-    else:  # Default strategy
-        if order_type.upper() == "BUY":
-            entry_price = base_price * 0.97
-            take_profit = base_price * 1.10
-            stop_loss = base_price * 0.93
-        else:  # SELL
-            entry_price = base_price * 1.03
-            take_profit = base_price * 0.90
-            stop_loss = base_price * 1.07
+    side = "BUY" if order_type.upper() == "BUY" else "SELL"
+    if strategy_number == 3:
+        table = STRATEGY_3_LARGE_CAP_MULTIPLIERS if market_cap > 1000000 else STRATEGY_3_SMALL_CAP_MULTIPLIERS
+    else:
+        table = STRATEGY_PRICE_MULTIPLIERS.get(strategy_number, DEFAULT_STRATEGY_MULTIPLIERS)
+    entry_mult, tp_mult, sl_mult = table[side]
     
     return {
-        'entry_price': round(entry_price, 6),
-        'take_profit': round(take_profit, 6),
-        'stop_loss': round(stop_loss, 6)
+        'entry_price': round(base_price * entry_mult, 6),
+        'take_profit': round(base_price * tp_mult, 6),
+        'stop_loss': round(base_price * sl_mult, 6)
     }
 
 # Background Task Health Monitoring Endpoints
 @router.get("/background-tasks/health")
-async def get_background_task_health(
+async def get_background_task_health_status(
     profile_name: Optional[str] = Query(None, description="Get health for specific profile"),
     current_profile: Profile = Depends(get_current_profile)
 ):
@@ -818,24 +903,17 @@ async def get_background_task_health(
         }
         
     except Exception as e:
-        logger.error(f"Error getting background task health: {e}")
+        logger.error("Error getting background task health: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/background-tasks/history/{profile_name}")
 async def get_background_task_history(
-    profile_name: str,
-    limit: int = Query(20, description="Number of recent tasks to return", ge=1, le=100),
-    current_profile: Profile = Depends(get_current_profile)
+    profile_name: str = Depends(validate_profile_access),
+    limit: int = Query(20, description="Number of recent tasks to return", ge=1, le=100)
 ):
     """Get task execution history for a profile"""
     try:
-        # Validate profile access (users can only see their own profile or if they're admin)
-        if profile_name != current_profile.name:
-            # For now, allow access to both profiles - you might want to add admin check here
-            if profile_name not in ["Saruman", "Gandalf"]:
-                raise HTTPException(status_code=403, detail="Access denied to this profile")
-        
-        history = get_task_execution_history(profile_name, limit)
+        history = list(iter_task_execution_history(profile_name, limit))
         
         return {
             "success": True,
@@ -847,80 +925,77 @@ async def get_background_task_history(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting task execution history: {e}")
+        logger.error("Error getting task execution history: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/background-tasks/start/{profile_name}")
-async def start_background_monitoring(
-    profile_name: str,
-    current_profile: Profile = Depends(get_current_profile)
+@router.get("/background-tasks/history/{profile_name}/stream")
+async def stream_background_task_history(
+    profile_name: str = Depends(validate_profile_access),
+    limit: int = Query(20, description="Number of recent tasks to return", ge=1, le=100)
 ):
-    """Start background task monitoring for a specific profile"""
+    """Stream task execution history for a profile as NDJSON (one task per line)"""
     try:
-        # Validate profile access
-        if profile_name != current_profile.name:
-            if profile_name not in ["Saruman", "Gandalf"]:
-                raise HTTPException(status_code=403, detail="Access denied to this profile")
+        # Fetch the first task before responding, so a failing lookup is a 500 rather than a cut-off stream
+        tasks = iter_task_execution_history(profile_name, limit)
+        first_task = next(tasks, None)
         
+    except Exception as e:
+        logger.error("Error streaming task execution history: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    def generate():
+        if first_task is None:
+            return
+        yield orjson.dumps(first_task) + b"\n"
+        try:
+            for task in tasks:
+                yield orjson.dumps(task) + b"\n"
+        except Exception as e:
+            logger.error("Error streaming task execution history: %s", e)
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.post("/background-tasks/start/{profile_name}")
+async def start_background_monitoring(profile_name: str = Depends(validate_profile_access)):
+    """Start background task monitoring for a specific profile"""
+    try:
         await start_background_tasks_for_profile(profile_name)
         
-        return {
-            "success": True,
-            "message": f"Background monitoring started for profile: {profile_name}",
-            "profile_name": profile_name
-        }
+        return _render_template(_BACKGROUND_STARTED_TEMPLATE, profile_name)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error starting background monitoring: {e}")
+        logger.error("Error starting background monitoring: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/background-tasks/stop/{profile_name}")
-async def stop_background_monitoring(
-    profile_name: str,
-    current_profile: Profile = Depends(get_current_profile)
-):
+async def stop_background_monitoring(profile_name: str = Depends(validate_profile_access)):
     """Stop background task monitoring for a specific profile"""
     try:
-        # Validate profile access
-        if profile_name != current_profile.name:
-            if profile_name not in ["Saruman", "Gandalf"]:
-                raise HTTPException(status_code=403, detail="Access denied to this profile")
-        
         await stop_background_tasks_for_profile(profile_name)
         
-        return {
-            "success": True,
-            "message": f"Background monitoring stopped for profile: {profile_name}",
-            "profile_name": profile_name
-        }
+        return _render_template(_BACKGROUND_STOPPED_TEMPLATE, profile_name)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error stopping background monitoring: {e}")
+        logger.error("Error stopping background monitoring: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/background-tasks/manual-check/{profile_name}")
-async def manual_background_check(
-    profile_name: str,
-    current_profile: Profile = Depends(get_current_profile)
-):
+async def manual_background_check(profile_name: str = Depends(validate_profile_access)):
     """Manually trigger a background task check for a specific profile"""
     try:
-        # Validate profile access
-        if profile_name != current_profile.name:
-            if profile_name not in ["Saruman", "Gandalf"]:
-                raise HTTPException(status_code=403, detail="Access denied to this profile")
-        
         # Trigger manual check using the enhanced monitor
         await enhanced_order_monitor._execute_monitored_task(profile_name)
         
-        return {
-            "success": True,
-            "message": f"Manual background check completed for profile: {profile_name}",
-            "profile_name": profile_name
-        }
+        return _render_template(_MANUAL_CHECK_TEMPLATE, profile_name)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in manual background check: {e}")
+        logger.error("Error in manual background check: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/background-tasks/status")
@@ -931,12 +1006,14 @@ async def get_background_tasks_status(current_profile: Profile = Depends(get_cur
         health_status = get_background_task_health()
         
         # Get additional system info
+        snapshot = enhanced_order_monitor.snapshot()
         system_status = {
-            "scheduler_running": enhanced_order_monitor.is_running,
-            "monitored_profiles": list(enhanced_order_monitor.monitored_profiles),
-            "total_monitored_profiles": len(enhanced_order_monitor.monitored_profiles),
-            "task_timeout_seconds": enhanced_order_monitor.task_timeout,
-            "max_history_size": enhanced_order_monitor.max_history_size
+            "scheduler_running": snapshot.scheduler_running,
+            "monitored_profiles": snapshot.monitored_profiles,
+            "total_monitored_profiles": len(snapshot.monitored_profiles),
+            "paused_profiles": snapshot.paused_profiles,
+            "task_timeout_seconds": snapshot.task_timeout,
+            "max_history_size": snapshot.max_history_size
         }
         
         return {
@@ -946,35 +1023,19 @@ async def get_background_tasks_status(current_profile: Profile = Depends(get_cur
         }
         
     except Exception as e:
-        logger.error(f"Error getting background tasks status: {e}")
+        logger.error("Error getting background tasks status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/background-tasks/missed-tasks/{profile_name}")
 async def get_missed_tasks(
-    profile_name: str,
-    hours: int = Query(24, description="Look back this many hours for missed tasks", ge=1, le=168),
-    current_profile: Profile = Depends(get_current_profile)
+    profile_name: str = Depends(validate_profile_access),
+    hours: int = Query(24, description="Look back this many hours for missed tasks", ge=1, le=168)
 ):
     """Get missed tasks for a profile within a time window"""
     try:
-        # Validate profile access
-        if profile_name != current_profile.name:
-            if profile_name not in ["Saruman", "Gandalf"]:
-                raise HTTPException(status_code=403, detail="Access denied to this profile")
-        
-        # Get task history
-        history = get_task_execution_history(profile_name, limit=100)
-        
-        # Filter for missed tasks within the time window
-        from datetime import datetime, timedelta
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        
-        missed_tasks = []
-        for task in history:
-            if task.get("missed", False):
-                task_time = datetime.fromisoformat(task["scheduled_time"])
-                if task_time >= cutoff_time:
-                    missed_tasks.append(task)
+        # Missed tasks within the time window (history is indexed by scheduled time)
+        cutoff_epoch = time.time() - hours * 3600
+        missed_tasks = get_missed_tasks_since(profile_name, cutoff_epoch)
         
         return {
             "success": True,
@@ -987,7 +1048,7 @@ async def get_missed_tasks(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting missed tasks: {e}")
+        logger.error("Error getting missed tasks: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================
@@ -1001,8 +1062,7 @@ async def queue_bracket_strategy(
 ):
     """Add a bracket strategy execution to the queue"""
     try:
-        logger.info(f"Queue bracket strategy request: {request.address} "
-                    f"amount={request.total_amount} profile={current_profile.name}")
+        logger.info("Queue bracket strategy request: %s amount=%s profile=%s", request.address, request.total_amount, current_profile.name)
 
         if request.total_amount <= 0:
             raise HTTPException(status_code=400, detail="Total amount must be greater than 0")
@@ -1028,7 +1088,7 @@ async def queue_bracket_strategy(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Queue bracket strategy error: {e}")
+        logger.error("Queue bracket strategy error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1061,7 +1121,7 @@ async def get_queue(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Get queue error: {e}")
+        logger.error("Get queue error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1095,7 +1155,7 @@ async def cancel_queue_item(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Cancel queue item error: {e}")
+        logger.error("Cancel queue item error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1130,7 +1190,7 @@ async def retry_queue_item(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Retry queue item error: {e}")
+        logger.error("Retry queue item error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1147,7 +1207,7 @@ async def clear_completed_queue(
             "items_cleared": count
         }
     except Exception as e:
-        logger.error(f"Clear queue error: {e}")
+        logger.error("Clear queue error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1160,9 +1220,11 @@ async def clear_coin_data(
 ):
     """Clear coin data and/or orders from database"""
     try:
-        logger.info(f"Clear coin data request for address: {address}, orders_only: {clear_orders_only}, profile: {current_profile.name}")
+        logger.info("Clear coin data request for address: %s, orders_only: %s, profile: %s", address, clear_orders_only, current_profile.name)
         
-        result = db_manager.clear_coin_data(
+        # Run the blocking DELETEs off the event loop so other requests keep being served
+        result = await asyncio.to_thread(
+            db_manager.clear_coin_data,
             address=address,
             profile_name=current_profile.name,
             orders_only=clear_orders_only
@@ -1183,7 +1245,7 @@ async def clear_coin_data(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Clear coin data error: {e}")
+        logger.error("Clear coin data error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/clear-all-data")
@@ -1192,20 +1254,18 @@ async def clear_all_data(
 ):
     """Clear all coins and orders for the current profile"""
     try:
-        logger.info(f"Clear all data request for profile: {current_profile.name}")
+        logger.info("Clear all data request for profile: %s", current_profile.name)
         
-        result = db_manager.clear_all_profile_data(current_profile.name)
+        result = await asyncio.to_thread(db_manager.clear_all_profile_data, current_profile.name)
         
-        return {
-            "success": True,
-            "message": f"Successfully cleared all data for profile {current_profile.name}",
-            "coins_cleared": result["coins_cleared"],
-            "orders_cleared": result["orders_cleared"],
-            "profile": current_profile.name
-        }
+        return _render_template(
+            _CLEAR_ALL_DATA_TEMPLATE, current_profile.name,
+            coins_cleared=result["coins_cleared"],
+            orders_cleared=result["orders_cleared"]
+        )
         
     except Exception as e:
-        logger.error(f"Clear all data error: {e}")
+        logger.error("Clear all data error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1273,7 +1333,7 @@ def _read_recent_logs(log_file: str, lines: int = 50, level: str = "all") -> lis
         return entries
 
     except Exception as e:
-        logger.error(f"Error reading log file {log_file}: {e}")
+        logger.error("Error reading log file %s: %s", log_file, e)
         return []
 
 
@@ -1402,7 +1462,7 @@ async def get_monitoring_status(
         }
 
     except Exception as e:
-        logger.error(f"Error getting monitoring status: {e}")
+        logger.error("Error getting monitoring status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1430,7 +1490,7 @@ async def get_monitoring_logs(
         }
 
     except Exception as e:
-        logger.error(f"Error getting monitoring logs: {e}")
+        logger.error("Error getting monitoring logs: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1452,7 +1512,7 @@ async def clear_monitoring_logs(
             with open(log_file, "w", encoding="utf-8") as f:
                 f.write("")
 
-            logger.info(f"Log file cleared by {current_profile.name}: {log_file} ({lines_cleared} lines)")
+            logger.info("Log file cleared by %s: %s (%s lines)", current_profile.name, log_file, lines_cleared)
 
         return {
             "success": True,
@@ -1462,7 +1522,7 @@ async def clear_monitoring_logs(
         }
 
     except Exception as e:
-        logger.error(f"Error clearing logs: {e}")
+        logger.error("Error clearing logs: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1484,7 +1544,7 @@ async def list_health_reports(
             "reports": reports,
         }
     except Exception as e:
-        logger.error(f"Error listing health reports: {e}")
+        logger.error("Error listing health reports: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1512,7 +1572,7 @@ async def get_health_report(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting health report for {date_str}: {e}")
+        logger.error("Error getting health report for %s: %s", date_str, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1538,5 +1598,5 @@ async def generate_health_report(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating health report: {e}")
+        logger.error("Error generating health report: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
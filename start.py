@@ -7,6 +7,7 @@ This script starts the BullX automation API server with automatic virtual enviro
 
 import sys
 import os
+import hashlib
 import subprocess
 import logging
 import venv
@@ -16,6 +17,8 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 venv_path = current_dir / "venv"
+requirements_path = current_dir / "requirements.txt"
+deps_stamp_path = venv_path / ".deps_ok"
 
 def print_global_cleanup_command():
     """Print the command to remove global packages from requirements.txt"""
@@ -25,7 +28,7 @@ def print_global_cleanup_command():
     print("To remove packages from your global Python environment that are")
     print("listed in requirements.txt, run this command:")
     print()
-    print("pip uninstall fastapi uvicorn selenium webdriver-manager sqlalchemy pydantic python-multipart asyncio-mqtt apscheduler requests python-dotenv -y")
+    print("pip uninstall fastapi uvicorn uvloop httptools selenium webdriver-manager sqlalchemy pydantic orjson python-multipart asyncio-mqtt apscheduler requests python-dotenv -y")
     print()
     print("=" * 60)
 
@@ -58,10 +61,32 @@ def get_venv_pip():
     else:  # Unix/Linux/macOS
         return venv_path / "bin" / "pip"
 
+def get_requirements_hash():
+    """Hash requirements.txt so the dependency stamp is invalidated when it changes"""
+    try:
+        return hashlib.blake2b(requirements_path.read_bytes(), digest_size=8).hexdigest()
+    except OSError:
+        return None
+
+def write_dependencies_stamp():
+    """Record that dependencies for the current requirements.txt are installed"""
+    req_hash = get_requirements_hash()
+    if req_hash:
+        try:
+            deps_stamp_path.write_text(req_hash)
+        except OSError as e:
+            print(f"[WARN] Could not write dependency stamp: {e}")
+
 def check_dependencies():
     """Check if all required dependencies are installed in virtual environment"""
     venv_python = get_venv_python()
     
+    # Skip the subprocess check if requirements.txt hasn't changed since the last successful check
+    req_hash = get_requirements_hash()
+    if req_hash and deps_stamp_path.exists() and deps_stamp_path.read_text().strip() == req_hash:
+        print("[OK] All dependencies are installed (cached)")
+        return True
+    
     try:
         # Test imports using the virtual environment Python
         test_script = '''
@@ -71,6 +96,7 @@ try:
     import selenium
     import sqlalchemy
     import pydantic
+    import orjson
     import apscheduler
     print("[OK] All dependencies are installed")
     exit(0)
@@ -81,7 +107,10 @@ except ImportError as e:
         result = subprocess.run([str(venv_python), "-c", test_script], 
                               capture_output=True, text=True)
         print(result.stdout.strip())
-        return result.returncode == 0
+        if result.returncode == 0:
+            write_dependencies_stamp()
+            return True
+        return False
     except Exception as e:
         print(f"[FAIL] Error checking dependencies: {e}")
         return False
@@ -92,13 +121,32 @@ def install_dependencies():
     
     try:
         print("Installing dependencies in virtual environment...")
-        subprocess.check_call([str(venv_pip), "install", "-r", "requirements.txt"])
+        subprocess.check_call([str(venv_pip), "install", "-r", str(requirements_path)])
         print("[OK] Dependencies installed successfully")
+        write_dependencies_stamp()
         return True
     except subprocess.CalledProcessError as e:
         print(f"[FAIL] Failed to install dependencies: {e}")
         return False
 
+# Server bootstrap run by the venv interpreter (config must be read inside the venv,
+# where python-dotenv and the other dependencies are installed)
+UVICORN_BOOTSTRAP = """
+import sys
+sys.path.insert(0, '.')
+from config import config
+import uvicorn
+uvicorn.run(
+    'main:app',
+    host=config.API_HOST,
+    port=config.API_PORT,
+    reload=config.API_RELOAD,
+    loop=config.API_LOOP,
+    http=config.API_HTTP,
+    log_level=config.LOG_LEVEL.lower()
+)
+"""
+
 def start_application():
     """Start the application using the virtual environment"""
     venv_python = get_venv_python()
@@ -113,23 +161,16 @@ def start_application():
         # Start the server using virtual environment Python
         env = os.environ.copy()
         env['PYTHONPATH'] = str(current_dir)
-
-        subprocess.run([
-            str(venv_python), "-c",
-            """
-import sys
-sys.path.insert(0, '.')
-from config import config
-import uvicorn
-uvicorn.run(
-    'main:app',
-    host=config.API_HOST,
-    port=config.API_PORT,
-    reload=config.API_RELOAD,
-    log_level=config.LOG_LEVEL.lower()
-)
-"""
-        ], env=env)
+        argv = [str(venv_python), "-c", UVICORN_BOOTSTRAP]
+        
+        if os.name != 'nt':
+            # Replace this process with the venv interpreter: no parent/child Python pair
+            # and Ctrl+C goes straight to uvicorn
+            sys.stdout.flush()
+            os.execve(argv[0], argv, env)
+        
+        # Windows: execv does not replace the process in place, keep a child process
+        subprocess.run(argv, env=env)
         
     except KeyboardInterrupt:
         print("\n" + "=" * 50)
@@ -139,12 +180,56 @@ uvicorn.run(
         print(f"[FAIL] Error starting application: {e}")
         sys.exit(1)
 
+def is_running_in_virtualenv():
+    """Check whether this interpreter already runs inside a virtual environment"""
+    return sys.prefix != sys.base_prefix
+
+def start_application_inprocess():
+    """Start the application with the current interpreter (no venv bootstrap, no subprocess)"""
+    try:
+        from config import config
+        import uvicorn
+    except ImportError as e:
+        print(f"[FAIL] Missing dependency in current environment: {e}")
+        print("Install dependencies with: pip install -r requirements.txt")
+        sys.exit(1)
+    
+    print("Starting BullX Automation API in the current environment...")
+    print(f"API will be available at: http://localhost:{config.API_PORT}")
+    print(f"API documentation will be available at: http://localhost:{config.API_PORT}/docs")
+    print("Press Ctrl+C to stop the server")
+    print("-" * 50)
+    
+    os.chdir(current_dir)
+    try:
+        uvicorn.run(
+            'main:app',
+            host=config.API_HOST,
+            port=config.API_PORT,
+            reload=config.API_RELOAD,
+            loop=config.API_LOOP,
+            http=config.API_HTTP,
+            log_level=config.LOG_LEVEL.lower()
+        )
+    except KeyboardInterrupt:
+        pass
+    print("\n" + "=" * 50)
+    print("BullX Automation API stopped")
+    print("=" * 50)
+
 def main():
     """Main startup function"""
     print("=" * 50)
     print("BullX Automation API Startup")
     print("=" * 50)
     
+    # Skip the venv bootstrap when a virtual environment is already active
+    # or when explicitly requested (BULLX_SKIP_VENV=1)
+    if is_running_in_virtualenv() or os.getenv("BULLX_SKIP_VENV") == "1":
+        print("[OK] Using current Python environment (venv bootstrap skipped)")
+        start_application_inprocess()
+        return
+    
     # Show global cleanup command
     print_global_cleanup_command()
     
@@ -1,9 +1,14 @@
-import json
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, Generator, List, Optional, Union
+from contextlib import contextmanager
+from sqlalchemy import JSON, Column, Integer, String, DateTime, Boolean, Text, Float, Index, and_, case, func, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session
 from database import SessionLocal, engine
 from models import Base
 
@@ -13,10 +18,17 @@ logger = logging.getLogger(__name__)
 class TaskExecution(Base):
     """Database model for task execution history"""
     __tablename__ = "task_executions"
+    __table_args__ = (
+        # Composite indexes matching the read paths: history/statistics windows,
+        # missed-task lookups and the last-successful-run lookup
+        Index('ix_task_executions_profile_scheduled', 'profile_name', 'scheduled_time'),
+        Index('ix_task_executions_profile_missed_scheduled', 'profile_name', 'missed', 'scheduled_time'),
+        Index('ix_task_executions_profile_success_completion', 'profile_name', 'success', 'completion_time'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    profile_name = Column(String, nullable=False, index=True)
-    scheduled_time = Column(DateTime, nullable=False, index=True)
+    profile_name = Column(String, nullable=False)
+    scheduled_time = Column(DateTime, nullable=False)
     actual_start_time = Column(DateTime, nullable=True)
     completion_time = Column(DateTime, nullable=True)
     success = Column(Boolean, default=False)
@@ -25,193 +37,534 @@ class TaskExecution(Base):
     orders_processed = Column(Integer, default=0)
     duration_seconds = Column(Float, nullable=True)
     task_type = Column(String, default="order_check")  # For future extensibility
-    metadata_json = Column(Text, nullable=True)  # Store additional task-specific data
+    metadata_json = Column(JSON(none_as_null=True), nullable=True)  # Store additional task-specific data
     created_at = Column(DateTime, default=datetime.now)
 
+class TaskHourlyRollup(Base):
+    """Per-profile hourly task counts, updated on every save so statistics read hourly rows"""
+    __tablename__ = "task_hourly_rollups"
+    
+    profile_name = Column(String, primary_key=True)
+    hour_bucket = Column(DateTime, primary_key=True)  # scheduled_time truncated to the hour
+    total = Column(Integer, nullable=False, default=0)
+    success = Column(Integer, nullable=False, default=0)  # Successful and not missed
+    failed = Column(Integer, nullable=False, default=0)
+    missed = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)  # Over successful tasks with a duration
+    duration_count = Column(Integer, nullable=False, default=0)
+    last_success_time = Column(DateTime, nullable=True)  # Latest completion of a successful, not missed task
+
+_ROLLUP_COUNTERS = ("total", "success", "failed", "missed", "duration_sum", "duration_count")
+
+def _hour_bucket(value: datetime) -> datetime:
+    """Truncate a datetime to the start of its hour"""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+def _coerce_datetime(value) -> Optional[datetime]:
+    """Return value as a datetime, parsing ISO-8601 strings"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+@dataclass(slots=True)
+class TaskData:
+    """Parsed task execution data passed to the save methods"""
+    profile_name: str
+    scheduled_time: datetime
+    actual_start_time: Optional[datetime] = None
+    completion_time: Optional[datetime] = None
+    success: bool = False
+    missed: bool = False
+    error_message: Optional[str] = None
+    orders_processed: int = 0
+    task_type: str = "order_check"
+    total_buttons: Optional[int] = None
+    
+    @classmethod
+    def from_dict(cls, task_data: Dict) -> "TaskData":
+        """Build TaskData from a dict, parsing ISO-8601 timestamp strings"""
+        return cls(
+            profile_name=task_data['profile_name'],
+            scheduled_time=_coerce_datetime(task_data['scheduled_time']),
+            actual_start_time=_coerce_datetime(task_data.get('actual_start_time')),
+            completion_time=_coerce_datetime(task_data.get('completion_time')),
+            success=task_data.get('success', False),
+            missed=task_data.get('missed', False),
+            error_message=task_data.get('error_message'),
+            orders_processed=task_data.get('orders_processed', 0),
+            task_type=task_data.get('task_type', 'order_check'),
+            total_buttons=task_data.get('total_buttons')
+        )
+
+# Aggregate row used for profiles without any tasks in the statistics window
+_EMPTY_STATISTICS_ROW = SimpleNamespace(
+    total_tasks=0, successful_tasks=0, missed_tasks=0, duration_sum=0.0, duration_count=0,
+    last_successful=None
+)
+
 class TaskPersistenceManager:
     """Manages task execution persistence in database"""
     
+    # Seconds the list of profiles with task executions is reused before re-querying
+    KNOWN_PROFILES_TTL_SECONDS = 60
+    # Rows fetched per round trip when iterating task history
+    HISTORY_BATCH_SIZE = 100
+    # Task statistics are reused for identical (profile, window, as_of minute) requests
+    STATISTICS_CACHE_TTL_SECONDS = 30
+    STATISTICS_CACHE_MAX_SIZE = 256
+    
     def __init__(self):
         self.SessionLocal = SessionLocal
+        self._known_profiles: Optional[set] = None
+        self._known_profiles_loaded_at = 0.0
+        self._statistics_cache: Dict[tuple, tuple] = {}  # (profile, hours_back, as_of minute) -> (expires_at, stats)
+        self._statistics_cache_hits = 0
+        self._statistics_cache_misses = 0
         self._ensure_table_exists()
     
+    @contextmanager
+    def _session(self) -> Generator[Session, None, None]:
+        """Yield a session, rolling back on error and always closing it"""
+        db = self.SessionLocal()
+        try:
+            yield db
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def _get_known_profiles(self, db) -> List[str]:
+        """Get profile names with task executions (cached for KNOWN_PROFILES_TTL_SECONDS)"""
+        now = time.monotonic()
+        if self._known_profiles is None or now - self._known_profiles_loaded_at >= self.KNOWN_PROFILES_TTL_SECONDS:
+            self._known_profiles = {p[0] for p in db.query(TaskExecution.profile_name).distinct().all()}
+            self._known_profiles_loaded_at = now
+        return sorted(self._known_profiles)
+    
+    def _note_profiles_saved(self, profile_names):
+        """Keep the known profiles and statistics caches in sync after saving executions"""
+        profile_names = set(profile_names)
+        if self._known_profiles is not None:
+            self._known_profiles.update(profile_names)
+        if self._statistics_cache:
+            for key in [key for key in self._statistics_cache if key[0] in profile_names]:
+                del self._statistics_cache[key]
+    
+    def get_statistics_cache_info(self) -> Dict:
+        """Get hit/miss counters and size of the task statistics cache"""
+        return {
+            "hits": self._statistics_cache_hits,
+            "misses": self._statistics_cache_misses,
+            "size": len(self._statistics_cache),
+            "max_size": self.STATISTICS_CACHE_MAX_SIZE,
+            "ttl_seconds": self.STATISTICS_CACHE_TTL_SECONDS
+        }
+    
     def _ensure_table_exists(self):
-        """Ensure the task_executions table exists"""
+        """Ensure the task_executions and task_hourly_rollups tables exist"""
         try:
+            rollup_table_existed = inspect(engine).has_table(TaskHourlyRollup.__tablename__)
             Base.metadata.create_all(bind=engine)
+            # create_all skips indexes of tables that already exist, so add any new ones explicitly
+            for index in TaskExecution.__table__.indexes:
+                index.create(bind=engine, checkfirst=True)
             logger.info("Task execution table ensured")
+            
+            # Databases created before the rollup table existed need it filled from history
+            if not rollup_table_existed:
+                self.rebuild_hourly_rollups()
         except Exception as e:
             logger.error(f"Error creating task execution table: {e}")
     
-    def save_task_execution(self, task_data: Dict) -> Optional[int]:
-        """Save a task execution record to database"""
-        db = self.SessionLocal()
-        try:
-            # Calculate duration if both start and completion times are available
-            duration_seconds = None
-            if task_data.get('actual_start_time') and task_data.get('completion_time'):
-                start_time = task_data['actual_start_time']
-                end_time = task_data['completion_time']
-                if isinstance(start_time, str):
-                    start_time = datetime.fromisoformat(start_time)
-                if isinstance(end_time, str):
-                    end_time = datetime.fromisoformat(end_time)
-                duration_seconds = (end_time - start_time).total_seconds()
-            
-            # Prepare metadata
-            metadata = {}
-            if 'orders_processed' in task_data:
-                metadata['orders_processed'] = task_data['orders_processed']
-            if 'total_buttons' in task_data:
-                metadata['total_buttons'] = task_data['total_buttons']
+    @staticmethod
+    def _rollup_increments(rows) -> Dict[tuple, Dict]:
+        """Aggregate (profile_name, scheduled_time, completion_time, success, missed, duration_seconds)
+        rows per profile and hour"""
+        increments = {}
+        for profile_name, scheduled_time, completion_time, success, missed, duration_seconds in rows:
+            key = (profile_name, _hour_bucket(scheduled_time))
+            counters = increments.get(key)
+            if counters is None:
+                counters = increments[key] = dict.fromkeys(_ROLLUP_COUNTERS, 0)
+                counters["last_success_time"] = None
             
-            task_execution = TaskExecution(
-                profile_name=task_data['profile_name'],
-                scheduled_time=task_data['scheduled_time'] if isinstance(task_data['scheduled_time'], datetime) 
-                              else datetime.fromisoformat(task_data['scheduled_time']),
-                actual_start_time=task_data.get('actual_start_time'),
-                completion_time=task_data.get('completion_time'),
-                success=task_data.get('success', False),
-                missed=task_data.get('missed', False),
-                error_message=task_data.get('error_message'),
-                orders_processed=task_data.get('orders_processed', 0),
-                duration_seconds=duration_seconds,
-                task_type=task_data.get('task_type', 'order_check'),
-                metadata_json=json.dumps(metadata) if metadata else None
-            )
-            
-            db.add(task_execution)
-            db.commit()
-            db.refresh(task_execution)
+            counters["total"] += 1
+            if missed:
+                counters["missed"] += 1
+            elif success:
+                counters["success"] += 1
+                if completion_time and (counters["last_success_time"] is None
+                                        or completion_time > counters["last_success_time"]):
+                    counters["last_success_time"] = completion_time
+            else:
+                counters["failed"] += 1
+            if success and duration_seconds is not None:
+                counters["duration_sum"] += duration_seconds
+                counters["duration_count"] += 1
+        return increments
+    
+    @staticmethod
+    def _upsert_rollups(db, increments: Dict[tuple, Dict]):
+        """Add hourly increments to the rollup table in one INSERT ... ON CONFLICT DO UPDATE"""
+        if not increments:
+            return
+        
+        stmt = sqlite_insert(TaskHourlyRollup).values([
+            {"profile_name": profile_name, "hour_bucket": hour_bucket, **counters}
+            for (profile_name, hour_bucket), counters in increments.items()
+        ])
+        set_ = {
+            name: getattr(TaskHourlyRollup, name) + getattr(stmt.excluded, name)
+            for name in _ROLLUP_COUNTERS
+        }
+        # Keep the later of the stored and new success times (either may be NULL)
+        set_["last_success_time"] = case(
+            (stmt.excluded.last_success_time > TaskHourlyRollup.last_success_time, stmt.excluded.last_success_time),
+            else_=func.coalesce(TaskHourlyRollup.last_success_time, stmt.excluded.last_success_time)
+        )
+        stmt = stmt.on_conflict_do_update(index_elements=["profile_name", "hour_bucket"], set_=set_)
+        db.execute(stmt)
+    
+    @staticmethod
+    def _rollup_source(rows: List[Dict]):
+        """Yield the rollup fields of prepared TaskExecution rows"""
+        for row in rows:
+            yield (row['profile_name'], row['scheduled_time'], row['completion_time'],
+                   row['success'], row['missed'], row['duration_seconds'])
+    
+    def rebuild_hourly_rollups(self) -> int:
+        """Recompute the hourly rollup table from task_executions, returning the number of buckets"""
+        try:
+            with self._session() as db:
+                rows = db.query(
+                    TaskExecution.profile_name, TaskExecution.scheduled_time, TaskExecution.completion_time,
+                    TaskExecution.success, TaskExecution.missed, TaskExecution.duration_seconds
+                ).yield_per(1000)
+                increments = self._rollup_increments(rows)
+                
+                db.query(TaskHourlyRollup).delete(synchronize_session=False)
+                self._upsert_rollups(db, increments)
+                db.commit()
+                
+                logger.info(f"Rebuilt {len(increments)} hourly task rollups")
+                return len(increments)
             
-            logger.debug(f"Saved task execution {task_execution.id} for profile {task_data['profile_name']}")
-            return task_execution.id
+        except Exception as e:
+            logger.error(f"Error rebuilding hourly task rollups: {e}")
+            return 0
+    
+    @staticmethod
+    def _prepare_row(task_data: Union[TaskData, Dict]) -> Dict:
+        """Convert task data into TaskExecution column values"""
+        if not isinstance(task_data, TaskData):
+            task_data = TaskData.from_dict(task_data)
+        
+        start_time = task_data.actual_start_time
+        end_time = task_data.completion_time
+        
+        # Calculate duration if both start and completion times are available
+        duration_seconds = None
+        if start_time and end_time:
+            duration_seconds = end_time.timestamp() - start_time.timestamp()
+        
+        # Prepare metadata
+        metadata = {'orders_processed': task_data.orders_processed}
+        if task_data.total_buttons is not None:
+            metadata['total_buttons'] = task_data.total_buttons
+        
+        return {
+            'profile_name': task_data.profile_name,
+            'scheduled_time': task_data.scheduled_time,
+            'actual_start_time': start_time,
+            'completion_time': end_time,
+            'success': task_data.success,
+            'missed': task_data.missed,
+            'error_message': task_data.error_message,
+            'orders_processed': task_data.orders_processed,
+            'duration_seconds': duration_seconds,
+            'task_type': task_data.task_type,
+            'metadata_json': metadata
+        }
+    
+    def save_task_execution(self, task_data: Union[TaskData, Dict]) -> Optional[int]:
+        """Save a task execution record to database"""
+        try:
+            with self._session() as db:
+                row = self._prepare_row(task_data)
+                task_execution = TaskExecution(**row)
+                
+                db.add(task_execution)
+                self._upsert_rollups(db, self._rollup_increments(self._rollup_source([row])))
+                # The INSERT populates the id; read it before commit expires the instance
+                db.flush()
+                task_id = task_execution.id
+                db.commit()
+                self._note_profiles_saved((row['profile_name'],))
+                
+                logger.debug(f"Saved task execution {task_id} for profile {row['profile_name']}")
+                return task_id
             
         except Exception as e:
-            db.rollback()
             logger.error(f"Error saving task execution: {e}")
             return None
-        finally:
-            db.close()
+    
+    def save_task_executions_bulk(self, task_data_list: List[Union[TaskData, Dict]]) -> int:
+        """Save several task execution records in one transaction, returning how many were saved"""
+        if not task_data_list:
+            return 0
+        
+        try:
+            with self._session() as db:
+                rows = [self._prepare_row(task_data) for task_data in task_data_list]
+                db.bulk_insert_mappings(TaskExecution, rows)
+                self._upsert_rollups(db, self._rollup_increments(self._rollup_source(rows)))
+                db.commit()
+                self._note_profiles_saved(row['profile_name'] for row in rows)
+                
+                logger.debug(f"Saved {len(rows)} task executions in bulk")
+                return len(rows)
+            
+        except Exception as e:
+            logger.error(f"Error saving task executions in bulk: {e}")
+            return 0
+    
+    @staticmethod
+    def _history_entry(task: TaskExecution) -> Dict:
+        """Convert a TaskExecution row into a history dict
+        
+        Timestamps stay datetime objects; the API's ORJSONResponse formats them as ISO-8601.
+        """
+        task_dict = {
+            "id": task.id,
+            "profile_name": task.profile_name,
+            "scheduled_time": task.scheduled_time,
+            "actual_start_time": task.actual_start_time,
+            "completion_time": task.completion_time,
+            "success": task.success,
+            "missed": task.missed,
+            "error_message": task.error_message,
+            "orders_processed": task.orders_processed,
+            "duration_seconds": task.duration_seconds,
+            "task_type": task.task_type,
+            "created_at": task.created_at
+        }
+        
+        # Merge metadata if available (already decoded by the JSON column type)
+        if task.metadata_json:
+            task_dict.update(task.metadata_json)
+        
+        return task_dict
     
     def get_task_history(self, profile_name: str, limit: int = 50, 
                         include_missed: bool = True) -> List[Dict]:
-        """Get task execution history for a profile"""
-        db = self.SessionLocal()
+        """Get task execution history for a profile, fetching rows in batches"""
         try:
-            query = db.query(TaskExecution).filter(
-                TaskExecution.profile_name == profile_name
-            )
-            
-            if not include_missed:
-                query = query.filter(TaskExecution.missed == False)
-            
-            tasks = query.order_by(TaskExecution.scheduled_time.desc()).limit(limit).all()
-            
-            history = []
-            for task in tasks:
-                task_dict = {
-                    "id": task.id,
-                    "profile_name": task.profile_name,
-                    "scheduled_time": task.scheduled_time.isoformat(),
-                    "actual_start_time": task.actual_start_time.isoformat() if task.actual_start_time else None,
-                    "completion_time": task.completion_time.isoformat() if task.completion_time else None,
-                    "success": task.success,
-                    "missed": task.missed,
-                    "error_message": task.error_message,
-                    "orders_processed": task.orders_processed,
-                    "duration_seconds": task.duration_seconds,
-                    "task_type": task.task_type,
-                    "created_at": task.created_at.isoformat()
-                }
+            with self._session() as db:
+                query = db.query(TaskExecution).filter(
+                    TaskExecution.profile_name == profile_name
+                )
                 
-                # Parse metadata if available
-                if task.metadata_json:
-                    try:
-                        metadata = json.loads(task.metadata_json)
-                        task_dict.update(metadata)
-                    except json.JSONDecodeError:
-                        pass
+                if not include_missed:
+                    query = query.filter(TaskExecution.missed == False)
                 
-                history.append(task_dict)
-            
-            return history
+                query = query.order_by(TaskExecution.scheduled_time.desc()).limit(limit)
+                return [self._history_entry(task) for task in query.yield_per(self.HISTORY_BATCH_SIZE)]
             
         except Exception as e:
             logger.error(f"Error getting task history: {e}")
             return []
-        finally:
-            db.close()
     
-    def get_missed_tasks(self, profile_name: str, hours_back: int = 24) -> List[Dict]:
-        """Get missed tasks within a time window"""
-        db = self.SessionLocal()
+    def get_missed_tasks(self, profile_name: str, hours_back: int = 24,
+                         as_of: Optional[datetime] = None) -> List[Dict]:
+        """Get missed tasks within a time window ending at as_of (default: now)"""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=hours_back)
-            
-            missed_tasks = db.query(TaskExecution).filter(
-                TaskExecution.profile_name == profile_name,
-                TaskExecution.missed == True,
-                TaskExecution.scheduled_time >= cutoff_time
-            ).order_by(TaskExecution.scheduled_time.desc()).all()
-            
-            return [
-                {
-                    "id": task.id,
-                    "scheduled_time": task.scheduled_time.isoformat(),
-                    "error_message": task.error_message,
-                    "task_type": task.task_type
-                }
-                for task in missed_tasks
-            ]
+            with self._session() as db:
+                as_of = as_of or datetime.now()
+                cutoff_time = as_of - timedelta(hours=hours_back)
+                
+                # Only the returned columns are selected, skipping ORM entity construction
+                missed_tasks = db.query(
+                    TaskExecution.id, TaskExecution.scheduled_time,
+                    TaskExecution.error_message, TaskExecution.task_type
+                ).filter(
+                    TaskExecution.profile_name == profile_name,
+                    TaskExecution.missed == True,
+                    TaskExecution.scheduled_time >= cutoff_time,
+                    TaskExecution.scheduled_time <= as_of
+                ).order_by(TaskExecution.scheduled_time.desc()).all()
+                
+                return [
+                    {
+                        "id": task.id,
+                        "scheduled_time": task.scheduled_time,
+                        "error_message": task.error_message,
+                        "task_type": task.task_type
+                    }
+                    for task in missed_tasks
+                ]
             
         except Exception as e:
             logger.error(f"Error getting missed tasks: {e}")
             return []
-        finally:
-            db.close()
     
-    def get_task_statistics(self, profile_name: str, hours_back: int = 24) -> Dict:
-        """Get task execution statistics for a profile"""
-        db = self.SessionLocal()
+    @staticmethod
+    def _statistics_columns(as_of: datetime) -> tuple:
+        """Aggregate columns computing task statistics over the filtered raw rows"""
+        successful_duration = case((TaskExecution.success == True, TaskExecution.duration_seconds))
+        successful_completion = case((
+            and_(TaskExecution.success == True, TaskExecution.missed == False,
+                 TaskExecution.completion_time <= as_of),
+            TaskExecution.completion_time
+        ))
+        return (
+            func.count(TaskExecution.id).label("total_tasks"),
+            func.sum(case(
+                (and_(TaskExecution.success == True, TaskExecution.missed == False), 1), else_=0
+            )).label("successful_tasks"),
+            func.sum(case((TaskExecution.missed == True, 1), else_=0)).label("missed_tasks"),
+            func.sum(successful_duration).label("duration_sum"),
+            func.count(successful_duration).label("duration_count"),
+            func.max(successful_completion).label("last_successful"),
+        )
+    
+    @staticmethod
+    def _rollup_statistics_columns(first_full_hour: datetime, as_of: datetime) -> tuple:
+        """Aggregate columns computing the same statistics from hourly rollup rows
+        
+        Counts only include hours from first_full_hour on; the last successful
+        task is taken over all queried hours, so one query answers both.
+        """
+        in_window = TaskHourlyRollup.hour_bucket >= first_full_hour
+        last_success = case((TaskHourlyRollup.last_success_time <= as_of, TaskHourlyRollup.last_success_time))
+        return (
+            func.sum(case((in_window, TaskHourlyRollup.total), else_=0)).label("total_tasks"),
+            func.sum(case((in_window, TaskHourlyRollup.success), else_=0)).label("successful_tasks"),
+            func.sum(case((in_window, TaskHourlyRollup.missed), else_=0)).label("missed_tasks"),
+            func.sum(case((in_window, TaskHourlyRollup.duration_sum), else_=0)).label("duration_sum"),
+            func.sum(case((in_window, TaskHourlyRollup.duration_count), else_=0)).label("duration_count"),
+            func.max(last_success).label("last_successful"),
+        )
+    
+    def _window_statistics(self, db, cutoff_time: datetime, as_of: datetime,
+                           profile_name: Optional[str] = None) -> Dict[str, SimpleNamespace]:
+        """Per-profile aggregates for cutoff_time <= scheduled_time <= as_of, plus the last successful task
+        
+        Whole hours come from the rollup table, up to the last full hour before
+        as_of; the partial hours at either end of the window are aggregated from
+        raw task_executions rows.
+        """
+        first_full_hour = _hour_bucket(cutoff_time)
+        if first_full_hour < cutoff_time:
+            first_full_hour += timedelta(hours=1)
+        end_hour = _hour_bucket(as_of)  # The hour as_of falls in is not complete yet
+        
+        # (start, end, end inclusive, counted) of the partial hours taken from raw rows;
+        # rows in an uncounted range only contribute their last successful task
+        if end_hour >= first_full_hour:
+            raw_ranges = [(cutoff_time, first_full_hour, False, True), (end_hour, as_of, True, True)]
+        else:
+            # The whole window lies inside the hour as_of falls in
+            first_full_hour = end_hour
+            raw_ranges = [(end_hour, cutoff_time, False, False), (cutoff_time, as_of, True, True)]
+        
+        rollup_query = db.query(
+            TaskHourlyRollup.profile_name, *self._rollup_statistics_columns(first_full_hour, as_of)
+        ).filter(TaskHourlyRollup.hour_bucket < end_hour)
+        if profile_name is not None:
+            rollup_query = rollup_query.filter(TaskHourlyRollup.profile_name == profile_name)
+        results = [rollup_query.group_by(TaskHourlyRollup.profile_name).all()]
+        
+        for range_start, range_end, end_inclusive, counted in raw_ranges:
+            if range_start >= range_end and not end_inclusive:
+                continue
+            raw_query = db.query(TaskExecution.profile_name, *self._statistics_columns(as_of)).filter(
+                TaskExecution.scheduled_time >= range_start,
+                TaskExecution.scheduled_time <= range_end if end_inclusive
+                else TaskExecution.scheduled_time < range_end
+            )
+            if profile_name is not None:
+                raw_query = raw_query.filter(TaskExecution.profile_name == profile_name)
+            rows = raw_query.group_by(TaskExecution.profile_name).all()
+            if not counted:
+                rows = [
+                    SimpleNamespace(**{**vars(_EMPTY_STATISTICS_ROW), "profile_name": row.profile_name,
+                                       "last_successful": row.last_successful})
+                    for row in rows
+                ]
+            results.append(rows)
+        
+        window = {}
+        for rows in results:
+            for row in rows:
+                stats = window.get(row.profile_name)
+                if stats is None:
+                    stats = window[row.profile_name] = SimpleNamespace(**vars(_EMPTY_STATISTICS_ROW))
+                if row.last_successful is not None and (
+                    stats.last_successful is None or row.last_successful > stats.last_successful
+                ):
+                    stats.last_successful = row.last_successful
+                stats.total_tasks += row.total_tasks or 0
+                stats.successful_tasks += row.successful_tasks or 0
+                stats.missed_tasks += row.missed_tasks or 0
+                stats.duration_sum += row.duration_sum or 0.0
+                stats.duration_count += row.duration_count or 0
+        return window
+    
+    @staticmethod
+    def _build_statistics(profile_name: str, hours_back: int, row) -> Dict:
+        """Build the statistics dict from an aggregate row"""
+        total_tasks = row.total_tasks
+        successful_tasks = row.successful_tasks
+        missed_tasks = row.missed_tasks
+        failed_tasks = total_tasks - successful_tasks - missed_tasks
+        average_duration = row.duration_sum / row.duration_count if row.duration_count else 0
+        
+        return {
+            "profile_name": profile_name,
+            "time_window_hours": hours_back,
+            "total_tasks": total_tasks,
+            "successful_tasks": successful_tasks,
+            "failed_tasks": failed_tasks,
+            "missed_tasks": missed_tasks,
+            "success_rate": (successful_tasks / total_tasks * 100) if total_tasks > 0 else 0,
+            "average_duration_seconds": round(average_duration, 2),
+            "last_successful_task": row.last_successful,
+            "is_healthy": missed_tasks == 0 and failed_tasks < successful_tasks
+        }
+    
+    def get_task_statistics(self, profile_name: str, hours_back: int = 24,
+                            as_of: Optional[datetime] = None) -> Dict:
+        """Get task execution statistics for a profile over the window ending at as_of (default: now)
+        
+        Results are cached for STATISTICS_CACHE_TTL_SECONDS per as_of minute and
+        dropped when new executions are saved for the profile.
+        """
+        as_of = as_of or datetime.now()
+        cache_key = (profile_name, hours_back, as_of.replace(second=0, microsecond=0))
+        now = time.monotonic()
+        cached = self._statistics_cache.get(cache_key)
+        if cached and cached[0] > now:
+            self._statistics_cache_hits += 1
+            return dict(cached[1])
+        self._statistics_cache_misses += 1
+        
         try:
-            cutoff_time = datetime.now() - timedelta(hours=hours_back)
-            
-            # Get all tasks in the time window
-            tasks = db.query(TaskExecution).filter(
-                TaskExecution.profile_name == profile_name,
-                TaskExecution.scheduled_time >= cutoff_time
-            ).all()
-            
-            total_tasks = len(tasks)
-            successful_tasks = len([t for t in tasks if t.success and not t.missed])
-            failed_tasks = len([t for t in tasks if not t.success and not t.missed])
-            missed_tasks = len([t for t in tasks if t.missed])
-            
-            # Calculate average duration for successful tasks
-            successful_durations = [t.duration_seconds for t in tasks 
-                                  if t.success and t.duration_seconds is not None]
-            avg_duration = sum(successful_durations) / len(successful_durations) if successful_durations else 0
-            
-            # Get last successful task
-            last_successful = db.query(TaskExecution).filter(
-                TaskExecution.profile_name == profile_name,
-                TaskExecution.success == True,
-                TaskExecution.missed == False
-            ).order_by(TaskExecution.completion_time.desc()).first()
-            
-            return {
-                "profile_name": profile_name,
-                "time_window_hours": hours_back,
-                "total_tasks": total_tasks,
-                "successful_tasks": successful_tasks,
-                "failed_tasks": failed_tasks,
-                "missed_tasks": missed_tasks,
-                "success_rate": (successful_tasks / total_tasks * 100) if total_tasks > 0 else 0,
-                "average_duration_seconds": round(avg_duration, 2),
-                "last_successful_task": last_successful.completion_time.isoformat() if last_successful else None,
-                "is_healthy": missed_tasks == 0 and failed_tasks < successful_tasks
-            }
+            with self._session() as db:
+                cutoff_time = as_of - timedelta(hours=hours_back)
+                
+                # Counts and durations for the time window, mostly from hourly rollups, plus
+                # the last successful task up to as_of (not limited to the time window)
+                row = self._window_statistics(db, cutoff_time, as_of, profile_name).get(
+                    profile_name, _EMPTY_STATISTICS_ROW
+                )
+                
+                stats = self._build_statistics(profile_name, hours_back, row)
+                
+                if len(self._statistics_cache) >= self.STATISTICS_CACHE_MAX_SIZE:
+                    self._statistics_cache.clear()
+                self._statistics_cache[cache_key] = (now + self.STATISTICS_CACHE_TTL_SECONDS, stats)
+                return dict(stats)
             
         except Exception as e:
             logger.error(f"Error getting task statistics: {e}")
@@ -219,105 +572,122 @@ class TaskPersistenceManager:
                 "profile_name": profile_name,
                 "error": str(e)
             }
-        finally:
-            db.close()
     
-    def cleanup_old_tasks(self, days_to_keep: int = 30) -> int:
-        """Clean up old task execution records"""
-        db = self.SessionLocal()
+    def cleanup_old_tasks(self, days_to_keep: int = 30, as_of: Optional[datetime] = None) -> int:
+        """Clean up task execution records older than days_to_keep before as_of (default: now)"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            
-            deleted_count = db.query(TaskExecution).filter(
-                TaskExecution.created_at < cutoff_date
-            ).delete()
-            
-            db.commit()
-            logger.info(f"Cleaned up {deleted_count} old task execution records")
-            return deleted_count
+            with self._session() as db:
+                cutoff_date = (as_of or datetime.now()) - timedelta(days=days_to_keep)
+                
+                # Single DELETE ... WHERE; no session objects need syncing since none are loaded
+                deleted_count = db.query(TaskExecution).filter(
+                    TaskExecution.created_at < cutoff_date
+                ).delete(synchronize_session=False)
+                # Drop rollup hours that lie entirely before the cutoff
+                db.query(TaskHourlyRollup).filter(
+                    TaskHourlyRollup.hour_bucket < _hour_bucket(cutoff_date)
+                ).delete(synchronize_session=False)
+                
+                db.commit()
+                self._known_profiles = None  # Profiles may have lost all their records
+                self._statistics_cache.clear()
+                logger.info(f"Cleaned up {deleted_count} old task execution records")
+                return deleted_count
             
         except Exception as e:
-            db.rollback()
             logger.error(f"Error cleaning up old tasks: {e}")
             return 0
-        finally:
-            db.close()
     
-    def get_system_health_summary(self) -> Dict:
-        """Get overall system health summary"""
-        db = self.SessionLocal()
+    def get_system_health_summary(self, as_of: Optional[datetime] = None) -> Dict:
+        """Get overall system health summary as of a single point in time (default: now)"""
         try:
-            # Get all profiles that have task executions
-            profiles = db.query(TaskExecution.profile_name).distinct().all()
-            profile_names = [p[0] for p in profiles]
-            
-            system_summary = {
-                "total_profiles": len(profile_names),
-                "profiles": {},
-                "overall_health": True
-            }
-            
-            for profile_name in profile_names:
-                profile_stats = self.get_task_statistics(profile_name, hours_back=24)
-                system_summary["profiles"][profile_name] = profile_stats
+            with self._session() as db:
+                hours_back = 24
+                as_of = as_of or datetime.now()
+                cutoff_time = as_of - timedelta(hours=hours_back)
                 
-                # Update overall health
-                if not profile_stats.get("is_healthy", False):
-                    system_summary["overall_health"] = False
-            
-            return system_summary
+                # Get all profiles that have task executions
+                profile_names = self._get_known_profiles(db)
+                
+                # Per-profile window statistics and last successful runs, grouped over all profiles
+                window_rows = self._window_statistics(db, cutoff_time, as_of)
+                
+                system_summary = {
+                    "total_profiles": len(profile_names),
+                    "profiles": {},
+                    "overall_health": True
+                }
+                
+                for profile_name in profile_names:
+                    profile_stats = self._build_statistics(
+                        profile_name, hours_back,
+                        window_rows.get(profile_name, _EMPTY_STATISTICS_ROW)
+                    )
+                    system_summary["profiles"][profile_name] = profile_stats
+                
+                    # Update overall health
+                    if not profile_stats.get("is_healthy", False):
+                        system_summary["overall_health"] = False
+                
+                return system_summary
             
         except Exception as e:
             logger.error(f"Error getting system health summary: {e}")
             return {"error": str(e)}
-        finally:
-            db.close()
     
-    def find_recovery_candidates(self, profile_name: str, max_gap_minutes: int = 15) -> List[Dict]:
-        """Find tasks that might need recovery due to gaps in execution"""
-        db = self.SessionLocal()
+    def find_recovery_candidates(self, profile_name: str, max_gap_minutes: int = 15,
+                                 as_of: Optional[datetime] = None) -> List[Dict]:
+        """Find tasks that might need recovery due to gaps in execution in the 2 hours before as_of (default: now)"""
         try:
-            # Get recent successful tasks
-            recent_tasks = db.query(TaskExecution).filter(
-                TaskExecution.profile_name == profile_name,
-                TaskExecution.success == True,
-                TaskExecution.missed == False,
-                TaskExecution.completion_time >= datetime.now() - timedelta(hours=2)
-            ).order_by(TaskExecution.completion_time.desc()).limit(10).all()
-            
-            recovery_candidates = []
-            
-            for i in range(len(recent_tasks) - 1):
-                current_task = recent_tasks[i]
-                next_task = recent_tasks[i + 1]
+            with self._session() as db:
+                as_of = as_of or datetime.now()
                 
-                # Calculate gap between tasks
-                gap_minutes = (current_task.completion_time - next_task.completion_time).total_seconds() / 60
+                # Get recent successful tasks (only the timestamps are needed)
+                recent_tasks = db.query(TaskExecution.completion_time, TaskExecution.scheduled_time).filter(
+                    TaskExecution.profile_name == profile_name,
+                    TaskExecution.success == True,
+                    TaskExecution.missed == False,
+                    TaskExecution.completion_time >= as_of - timedelta(hours=2),
+                    TaskExecution.completion_time <= as_of
+                ).order_by(TaskExecution.completion_time.desc()).limit(10).all()
                 
-                if gap_minutes > max_gap_minutes:
+                # Gaps between consecutive completions (newest first), computed on epoch seconds
+                completion_epochs = [task.completion_time.timestamp() for task in recent_tasks]
+                gap_threshold_seconds = max_gap_minutes * 60
+                
+                recovery_candidates = []
+                
+                for i, (current_epoch, next_epoch) in enumerate(zip(completion_epochs, completion_epochs[1:])):
+                    gap_seconds = current_epoch - next_epoch
+                    if gap_seconds <= gap_threshold_seconds:
+                        continue
+                    
+                    gap_minutes = gap_seconds / 60
                     recovery_candidates.append({
-                        "gap_start": next_task.completion_time.isoformat(),
-                        "gap_end": current_task.scheduled_time.isoformat(),
+                        "gap_start": recent_tasks[i + 1].completion_time.isoformat(),
+                        "gap_end": recent_tasks[i].scheduled_time.isoformat(),
                         "gap_minutes": round(gap_minutes, 2),
                         "estimated_missed_tasks": int(gap_minutes / 5),  # Assuming 5-minute intervals
                         "priority": "high" if gap_minutes > 30 else "medium"
                     })
-            
-            return recovery_candidates
+                
+                return recovery_candidates
             
         except Exception as e:
             logger.error(f"Error finding recovery candidates: {e}")
             return []
-        finally:
-            db.close()
 
 # Global task persistence manager instance
 task_persistence_manager = TaskPersistenceManager()
 
-def save_task_execution(task_data: Dict) -> Optional[int]:
+def save_task_execution(task_data: Union[TaskData, Dict]) -> Optional[int]:
     """Convenience function to save task execution"""
     return task_persistence_manager.save_task_execution(task_data)
 
+def save_task_executions_bulk(task_data_list: List[Union[TaskData, Dict]]) -> int:
+    """Convenience function to save several task executions at once"""
+    return task_persistence_manager.save_task_executions_bulk(task_data_list)
+
 def get_task_history(profile_name: str, limit: int = 50) -> List[Dict]:
     """Convenience function to get task history"""
     return task_persistence_manager.get_task_history(profile_name, limit)
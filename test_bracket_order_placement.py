@@ -9,193 +9,212 @@ This test file verifies the functionality of:
 5. Preview generation
 """
 
+import functools
+import importlib.util
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch, MagicMock
 import sys
-import os
+import time
+from typing import List
 
-# Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pytest
+from pydantic import BaseModel, PositiveFloat, TypeAdapter, ValidationError
 
 from bracket_order_placement import BracketOrderPlacer, BracketOrderManager
-from bracket_config import calculate_bracket, get_bracket_info, calculate_order_parameters
+from bracket_config import (
+    calculate_bracket, get_bracket_info, calculate_order_parameters,
+    BRACKET_CONFIG, BRACKET_RANGES, TRADE_SIZES
+)
 from chrome_driver import BullXAutomator
 
+# Expected bracket for each test market cap, built once for the module
+EXPECTED_BRACKETS = {
+    50000: 1,
+    300000: 2,
+    5000000: 3,
+    50000000: 4,
+    500000000: 5,
+}
+
+# calculate_order_parameters is pure, so each (bracket, amount) pair is computed once per run
+_cached_order_parameters = functools.lru_cache(maxsize=None)(calculate_order_parameters)
+
+class OrderParam(BaseModel):
+    """Fields every entry returned by calculate_order_parameters must have"""
+    bracket_id: int
+    entry_price: float
+    take_profit: float
+    stop_loss: float
+    amount: PositiveFloat
+
+
+# Built once; validates a whole order parameter list in one call
+_ORDER_PARAMS_VALIDATOR = TypeAdapter(List[OrderParam])
+
+# BullXAutomator methods the placement flow calls; the tests stub only these
+_STUB_AUTOMATOR_METHODS = ("_ensure_logged_in", "search_address", "get_market_cap", "_extract_coin_data")
+
+
 class TestBracketOrderPlacement(unittest.TestCase):
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up immutable fixtures shared by all tests"""
+        cls._automator_spec = BullXAutomator
+        
+        # One manager for the class; tests only patch its placer temporarily
+        cls.manager = BracketOrderManager()
+        
+        # Driver handed out by every test's driver manager; no test asserts on its calls
+        cls._shared_driver = Mock()
+        
+        # Test data
+        cls.test_address = "0x1234567890abcdef1234567890abcdef12345678"
+        cls.test_profile = "TestProfile"
+        cls.test_amount = 1000.0
+    
     def setUp(self):
-        """Set up test fixtures"""
-        # Mock the BullXAutomator
-        self.mock_automator = Mock(spec=BullXAutomator)
+        """Set up the mutable mocks fresh for each test"""
+        # Lightweight BullXAutomator stub (a spec'd Mock introspects the whole class)
         self.mock_driver_manager = Mock()
-        self.mock_automator.driver_manager = self.mock_driver_manager
+        self.mock_driver_manager.get_driver.return_value = self._shared_driver
+        self.mock_automator = SimpleNamespace(
+            driver_manager=self.mock_driver_manager,
+            **{name: Mock() for name in _STUB_AUTOMATOR_METHODS}
+        )
         
         # Create the order placer with mocked automator
         self.order_placer = BracketOrderPlacer(self.mock_automator)
         
-        # Test data
-        self.test_address = "0x1234567890abcdef1234567890abcdef12345678"
-        self.test_profile = "TestProfile"
-        self.test_amount = 1000.0
-        
+        # Database access is patched for the whole test
+        db_patcher = patch('bracket_order_placement.db_manager')
+        self.mock_db = db_patcher.start()
+        self.addCleanup(db_patcher.stop)
+        self.mock_db.create_order_with_coin.return_value = {"order_id": 1}
+    
+    # (current_market_cap, entry_market_cap, expected_order_type)
+    MARKET_VS_LIMIT_CASES = [
+        (50000, 100000, "MARKET"),   # Current market cap < entry market cap = MARKET order
+        (100000, 50000, "LIMIT"),    # Current market cap > entry market cap = LIMIT order
+    ]
+    
+    # (bracket, bracket_id, expected_strategy_name)
+    STRATEGY_NAMING_CASES = [
+        (1, 1, "Bracket1_1"),
+        (2, 3, "Bracket2_3"),
+        (5, 4, "Bracket5_4"),
+    ]
+    
+    def _patched_placement_flow(self, limit=False):
+        """Patch the UI steps of the placement flow to succeed
+        
+        Returns the ExitStack holding the patches and a dict of the mocks by name.
+        The database is patched for every test in setUp (see self.mock_db).
+        """
+        stack = ExitStack()
+        order_step = '_setup_limit_order' if limit else '_place_market_order'
+        steps = ('_navigate_to_buy_interface', '_enter_order_amount', order_step,
+                 '_configure_auto_sell_strategy', '_confirm_order')
+        mocks = stack.enter_context(patch.multiple(self.order_placer, **dict.fromkeys(steps, DEFAULT)))
+        for mock in mocks.values():
+            mock.return_value = True
+        return stack, mocks
+    
+    def _place_test_order(self, bracket, bracket_id, current_market_cap, entry_market_cap):
+        """Place a single bracket order with the standard test targets"""
+        return self.order_placer._place_single_bracket_order(
+            profile_name=self.test_profile,
+            address=self.test_address,
+            bracket=bracket,
+            bracket_id=bracket_id,
+            current_market_cap=current_market_cap,
+            entry_market_cap=entry_market_cap,
+            take_profit_market_cap=150000,
+            stop_loss_market_cap=30000,
+            amount=250.0,
+            strategy_number=1
+        )
+    
+    def test_stub_matches_automator_api(self):
+        """Test that the stubbed methods still exist on BullXAutomator"""
+        spec_automator = Mock(spec=self._automator_spec)
+        for name in _STUB_AUTOMATOR_METHODS:
+            with self.subTest(method=name):
+                self.assertTrue(callable(getattr(spec_automator, name)))
+    
     def test_market_vs_limit_order_logic(self):
         """Test that market vs limit order logic works correctly"""
         
-        # Test case 1: Current market cap < entry market cap = MARKET order
-        current_mc = 50000
-        entry_mc = 100000
-        
         # Mock the automator methods
         self.mock_automator._ensure_logged_in.return_value = True
         self.mock_automator.search_address.return_value = True
-        self.mock_automator.get_market_cap.return_value = current_mc
         
-        # Mock driver and UI interactions
-        mock_driver = Mock()
-        self.mock_driver_manager.get_driver.return_value = mock_driver
-        
-        # Mock successful UI interactions
-        with patch.object(self.order_placer, '_navigate_to_buy_interface', return_value=True), \
-             patch.object(self.order_placer, '_enter_order_amount', return_value=True), \
-             patch.object(self.order_placer, '_place_market_order', return_value=True), \
-             patch.object(self.order_placer, '_configure_auto_sell_strategy', return_value=True), \
-             patch.object(self.order_placer, '_confirm_order', return_value=True), \
-             patch('bracket_order_placement.db_manager') as mock_db:
-            
-            mock_db.create_order_with_coin.return_value = {"order_id": 1}
-            
-            result = self.order_placer._place_single_bracket_order(
-                profile_name=self.test_profile,
-                address=self.test_address,
-                bracket=1,
-                bracket_id=1,
-                current_market_cap=current_mc,
-                entry_market_cap=entry_mc,
-                take_profit_market_cap=150000,
-                stop_loss_market_cap=30000,
-                amount=250.0,
-                strategy_number=1
-            )
-            
-            self.assertTrue(result["success"])
-            self.assertEqual(result["order"]["order_type"], "MARKET")
-            
-        # Test case 2: Current market cap > entry market cap = LIMIT order
-        current_mc = 100000
-        entry_mc = 50000
-        
-        self.mock_automator.get_market_cap.return_value = current_mc
-        
-        with patch.object(self.order_placer, '_navigate_to_buy_interface', return_value=True), \
-             patch.object(self.order_placer, '_enter_order_amount', return_value=True), \
-             patch.object(self.order_placer, '_setup_limit_order', return_value=True), \
-             patch.object(self.order_placer, '_configure_auto_sell_strategy', return_value=True), \
-             patch.object(self.order_placer, '_confirm_order', return_value=True), \
-             patch('bracket_order_placement.db_manager') as mock_db:
-            
-            mock_db.create_order_with_coin.return_value = {"order_id": 2}
-            
-            result = self.order_placer._place_single_bracket_order(
-                profile_name=self.test_profile,
-                address=self.test_address,
-                bracket=1,
-                bracket_id=2,
-                current_market_cap=current_mc,
-                entry_market_cap=entry_mc,
-                take_profit_market_cap=150000,
-                stop_loss_market_cap=30000,
-                amount=250.0,
-                strategy_number=1
-            )
-            
-            self.assertTrue(result["success"])
-            self.assertEqual(result["order"]["order_type"], "LIMIT")
+        for bracket_id, (current_mc, entry_mc, expected_type) in enumerate(self.MARKET_VS_LIMIT_CASES, start=1):
+            with self.subTest(current_mc=current_mc, entry_mc=entry_mc):
+                self.mock_automator.get_market_cap.return_value = current_mc
+                
+                # Mock successful UI interactions
+                stack, _ = self._patched_placement_flow(limit=expected_type == "LIMIT")
+                with stack:
+                    result = self._place_test_order(1, bracket_id, current_mc, entry_mc)
+                
+                self.assertTrue(result["success"])
+                self.assertEqual(result["order"]["order_type"], expected_type)
+    
+    def _assert_order_params_shape(self, order_params, total_amount):
+        """Assert the invariants every bracket's order parameters must satisfy"""
+        # Each order should have the required fields and a positive amount
+        try:
+            parsed = _ORDER_PARAMS_VALIDATOR.validate_python(order_params)
+        except ValidationError as e:
+            self.fail(f"Invalid order parameters: {e}")
+        
+        # Should have 4 orders numbered 1-4
+        self.assertEqual([order.bracket_id for order in parsed], [1, 2, 3, 4])
+        
+        # Total amounts should equal input amount
+        self.assertAlmostEqual(sum(order.amount for order in parsed), total_amount, places=2)
     
     def test_bracket_calculation_and_order_parameters(self):
         """Test bracket calculation and order parameter generation"""
         
-        # Test different market cap scenarios
-        test_cases = [
-            {"market_cap": 50000, "expected_bracket": 1},
-            {"market_cap": 300000, "expected_bracket": 2},
-            {"market_cap": 5000000, "expected_bracket": 3},
-            {"market_cap": 50000000, "expected_bracket": 4},
-            {"market_cap": 500000000, "expected_bracket": 5}
-        ]
-        
-        for case in test_cases:
-            bracket = calculate_bracket(case["market_cap"])
-            self.assertEqual(bracket, case["expected_bracket"])
-            
-            # Test order parameters calculation
-            order_params = calculate_order_parameters(bracket, self.test_amount)
-            
-            # Should have 4 orders
-            self.assertEqual(len(order_params), 4)
-            
-            # Each order should have required fields
-            for i, order in enumerate(order_params):
-                self.assertEqual(order["bracket_id"], i + 1)
-                self.assertIn("entry_price", order)
-                self.assertIn("take_profit", order)
-                self.assertIn("stop_loss", order)
-                self.assertIn("amount", order)
-                self.assertGreater(order["amount"], 0)
-            
-            # Total amounts should equal input amount
-            total_amount = sum(order["amount"] for order in order_params)
-            self.assertAlmostEqual(total_amount, self.test_amount, places=2)
+        for market_cap, expected_bracket in EXPECTED_BRACKETS.items():
+            with self.subTest(market_cap=market_cap):
+                bracket = calculate_bracket(market_cap)
+                self.assertEqual(bracket, expected_bracket)
+                
+                # Test order parameters calculation
+                self._assert_order_params_shape(
+                    _cached_order_parameters(bracket, self.test_amount), self.test_amount
+                )
     
     def test_strategy_naming_convention(self):
         """Test that strategy names are generated correctly"""
         
-        test_cases = [
-            {"bracket": 1, "bracket_id": 1, "expected": "Bracket1_1"},
-            {"bracket": 2, "bracket_id": 3, "expected": "Bracket2_3"},
-            {"bracket": 5, "bracket_id": 4, "expected": "Bracket5_4"}
-        ]
+        # Mock the necessary methods
+        self.mock_automator._ensure_logged_in.return_value = True
+        self.mock_automator.search_address.return_value = True
+        self.mock_automator.get_market_cap.return_value = 50000
         
-        for case in test_cases:
-            # Mock the necessary methods
-            self.mock_automator._ensure_logged_in.return_value = True
-            self.mock_automator.search_address.return_value = True
-            self.mock_automator.get_market_cap.return_value = 50000
-            
-            mock_driver = Mock()
-            self.mock_driver_manager.get_driver.return_value = mock_driver
-            
-            with patch.object(self.order_placer, '_navigate_to_buy_interface', return_value=True), \
-                 patch.object(self.order_placer, '_enter_order_amount', return_value=True), \
-                 patch.object(self.order_placer, '_place_market_order', return_value=True), \
-                 patch.object(self.order_placer, '_configure_auto_sell_strategy', return_value=True) as mock_config, \
-                 patch.object(self.order_placer, '_confirm_order', return_value=True), \
-                 patch('bracket_order_placement.db_manager') as mock_db:
-                
-                mock_db.create_order_with_coin.return_value = {"order_id": 1}
-                
-                result = self.order_placer._place_single_bracket_order(
-                    profile_name=self.test_profile,
-                    address=self.test_address,
-                    bracket=case["bracket"],
-                    bracket_id=case["bracket_id"],
-                    current_market_cap=50000,
-                    entry_market_cap=100000,
-                    take_profit_market_cap=150000,
-                    stop_loss_market_cap=30000,
-                    amount=250.0,
-                    strategy_number=1
-                )
+        for bracket, bracket_id, expected in self.STRATEGY_NAMING_CASES:
+            with self.subTest(bracket=bracket, bracket_id=bracket_id):
+                stack, mocks = self._patched_placement_flow()
+                with stack:
+                    self._place_test_order(bracket, bracket_id, 50000, 100000)
                 
                 # Verify strategy name was passed correctly
+                mock_config = mocks['_configure_auto_sell_strategy']
                 mock_config.assert_called_once()
                 args = mock_config.call_args[0]
                 strategy_name = args[1]  # Second argument is strategy_name
-                self.assertEqual(strategy_name, case["expected"])
+                self.assertEqual(strategy_name, expected)
     
     def test_bracket_order_manager_preview(self):
         """Test the bracket order manager preview functionality"""
         
-        manager = BracketOrderManager()
+        manager = self.manager
         
         # Mock the automator in the manager
         with patch.object(manager.order_placer, 'automator') as mock_automator:
@@ -220,46 +239,30 @@ class TestBracketOrderPlacement(unittest.TestCase):
                 self.assertIn("strategy_name", order)
                 self.assertTrue(order["strategy_name"].startswith("Bracket1_"))
     
+    # (_ensure_logged_in result, search_address result, market cap, expected error)
+    ERROR_HANDLING_CASES = [
+        (False, True, 100000, "Failed to login"),
+        (True, False, 100000, "Failed to search address"),
+        (True, True, 0, "Failed to get market cap"),
+    ]
+    
     def test_error_handling(self):
         """Test error handling in various scenarios"""
         
-        # Test login failure
-        self.mock_automator._ensure_logged_in.return_value = False
-        
-        result = self.order_placer.place_bracket_orders(
-            profile_name=self.test_profile,
-            address=self.test_address,
-            total_amount=self.test_amount
-        )
-        
-        self.assertFalse(result["success"])
-        self.assertIn("Failed to login", result["error"])
-        
-        # Test search failure
-        self.mock_automator._ensure_logged_in.return_value = True
-        self.mock_automator.search_address.return_value = False
-        
-        result = self.order_placer.place_bracket_orders(
-            profile_name=self.test_profile,
-            address=self.test_address,
-            total_amount=self.test_amount
-        )
-        
-        self.assertFalse(result["success"])
-        self.assertIn("Failed to search address", result["error"])
-        
-        # Test market cap retrieval failure
-        self.mock_automator.search_address.return_value = True
-        self.mock_automator.get_market_cap.return_value = 0
-        
-        result = self.order_placer.place_bracket_orders(
-            profile_name=self.test_profile,
-            address=self.test_address,
-            total_amount=self.test_amount
-        )
-        
-        self.assertFalse(result["success"])
-        self.assertIn("Failed to get market cap", result["error"])
+        for logged_in, found, market_cap, expected_error in self.ERROR_HANDLING_CASES:
+            with self.subTest(expected_error=expected_error):
+                self.mock_automator._ensure_logged_in.return_value = logged_in
+                self.mock_automator.search_address.return_value = found
+                self.mock_automator.get_market_cap.return_value = market_cap
+                
+                result = self.order_placer.place_bracket_orders(
+                    profile_name=self.test_profile,
+                    address=self.test_address,
+                    total_amount=self.test_amount
+                )
+                
+                self.assertFalse(result["success"])
+                self.assertIn(expected_error, result["error"])
     
     def test_order_replacement(self):
         """Test order replacement functionality"""
@@ -268,18 +271,8 @@ class TestBracketOrderPlacement(unittest.TestCase):
         self.mock_automator.search_address.return_value = True
         self.mock_automator.get_market_cap.return_value = 100000
         
-        mock_driver = Mock()
-        self.mock_driver_manager.get_driver.return_value = mock_driver
-        
-        with patch.object(self.order_placer, '_navigate_to_buy_interface', return_value=True), \
-             patch.object(self.order_placer, '_enter_order_amount', return_value=True), \
-             patch.object(self.order_placer, '_place_market_order', return_value=True), \
-             patch.object(self.order_placer, '_configure_auto_sell_strategy', return_value=True), \
-             patch.object(self.order_placer, '_confirm_order', return_value=True), \
-             patch('bracket_order_placement.db_manager') as mock_db:
-            
-            mock_db.create_order_with_coin.return_value = {"order_id": 1}
-            
+        stack, _ = self._patched_placement_flow()
+        with stack:
             result = self.order_placer.replace_bracket_order(
                 profile_name=self.test_profile,
                 address=self.test_address,
@@ -300,18 +293,8 @@ class TestBracketOrderPlacement(unittest.TestCase):
         self.mock_automator.search_address.return_value = True
         self.mock_automator.get_market_cap.return_value = 100000  # Bracket 1
         
-        mock_driver = Mock()
-        self.mock_driver_manager.get_driver.return_value = mock_driver
-        
-        with patch.object(self.order_placer, '_navigate_to_buy_interface', return_value=True), \
-             patch.object(self.order_placer, '_enter_order_amount', return_value=True), \
-             patch.object(self.order_placer, '_place_market_order', return_value=True), \
-             patch.object(self.order_placer, '_configure_auto_sell_strategy', return_value=True), \
-             patch.object(self.order_placer, '_confirm_order', return_value=True), \
-             patch('bracket_order_placement.db_manager') as mock_db:
-            
-            mock_db.create_order_with_coin.return_value = {"order_id": 1}
-            
+        stack, _ = self._patched_placement_flow()
+        with stack:
             result = self.order_placer.place_bracket_orders(
                 profile_name=self.test_profile,
                 address=self.test_address,
@@ -336,8 +319,6 @@ class TestBracketConfiguration(unittest.TestCase):
     
     def test_bracket_ranges(self):
         """Test that bracket ranges are correctly defined"""
-        from bracket_config import BRACKET_RANGES
-        
         # Should have 5 brackets
         self.assertEqual(len(BRACKET_RANGES), 5)
         
@@ -349,61 +330,51 @@ class TestBracketConfiguration(unittest.TestCase):
     
     def test_trade_sizes_sum_to_one(self):
         """Test that trade sizes sum to approximately 1.0"""
-        from bracket_config import TRADE_SIZES
-        
         total = sum(TRADE_SIZES)
         self.assertAlmostEqual(total, 1.0, places=3)
         self.assertEqual(len(TRADE_SIZES), 4)  # Should have 4 trade sizes
     
     def test_bracket_config_completeness(self):
         """Test that bracket configuration is complete"""
-        from bracket_config import BRACKET_CONFIG
-        
         # Should have configurations for brackets 1-5
         for bracket in range(1, 6):
-            self.assertIn(bracket, BRACKET_CONFIG)
-            
-            config = BRACKET_CONFIG[bracket]
-            self.assertIn("stop_loss_market_cap", config)
-            self.assertIn("entries", config)
-            self.assertIn("description", config)
-            
-            # Should have 4 entry points
-            self.assertEqual(len(config["entries"]), 4)
+            with self.subTest(bracket=bracket):
+                self.assertIn(bracket, BRACKET_CONFIG)
+                
+                config = BRACKET_CONFIG[bracket]
+                self.assertIn("stop_loss_market_cap", config)
+                self.assertIn("entries", config)
+                self.assertIn("description", config)
+                
+                # Should have 4 entry points
+                self.assertEqual(len(config["entries"]), 4)
 
 
-if __name__ == "__main__":
-    # Create a test suite
-    suite = unittest.TestSuite()
+class TestBracketCalculationPerformance(unittest.TestCase):
+    """Guard the pure bracket calculation path against performance regressions"""
     
-    # Add test cases
-    suite.addTest(unittest.makeSuite(TestBracketOrderPlacement))
-    suite.addTest(unittest.makeSuite(TestBracketConfiguration))
+    ITERATIONS = 200
+    # The whole run takes a few milliseconds today; the budget is loose enough
+    # that a loaded CI machine never trips it, only a gross regression does
+    TIME_BUDGET_SECONDS = 5.0
     
-    # Run the tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    # Print summary
-    print(f"\n{'='*60}")
-    print(f"Test Summary:")
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    
-    if result.failures:
-        print(f"\nFailures:")
-        for test, traceback in result.failures:
-            print(f"- {test}: {traceback}")
-    
-    if result.errors:
-        print(f"\nErrors:")
-        for test, traceback in result.errors:
-            print(f"- {test}: {traceback}")
+    def test_bracket_and_order_parameters_within_budget(self):
+        """Test that repeated bracket calculation plus order parameters finish within the time budget"""
+        start = time.perf_counter()
+        for _ in range(self.ITERATIONS):
+            for market_cap in EXPECTED_BRACKETS:
+                calculate_order_parameters(calculate_bracket(market_cap), 1000.0)
+        elapsed = time.perf_counter() - start
+        
+        self.assertLess(elapsed, self.TIME_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    # Quiet terminal output plus a JUnit XML report and the slowest tests for timing analysis
+    args = [__file__, "-q", "--junitxml=report.xml", "--durations=10"]
     
-    if result.wasSuccessful():
-        print(f"\n✅ All tests passed!")
-    else:
-        print(f"\n❌ Some tests failed!")
+    # Spread the tests over all CPU cores when pytest-xdist is installed
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto"]
     
-    print(f"{'='*60}")
+    sys.exit(pytest.main(args))
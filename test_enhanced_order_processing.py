@@ -6,40 +6,40 @@ This demonstrates how the function parses, identifies, and reports on order data
 
 import asyncio
 import logging
+from types import MappingProxyType
 from background_tasks import OrderMonitor
 from database import db_manager, create_tables
 from models import Coin, Order
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
 # Set up logging to see the detailed output
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def setup_test_data():
-    """Set up test data in the database"""
+    """Set up test data in the database (the tables must already exist)"""
     try:
-        # Create tables
-        create_tables()
-        
-        # Create test coins with brackets
-        test_coin_1 = db_manager.create_or_update_coin(
-            address="0x123abc",
-            data={
+        # Create test coins with brackets in one upsert
+        coins = db_manager.create_or_update_coins({
+            "0x123abc": {
                 "name": "TESTCOIN",
                 "market_cap": 500000,  # This will be bracket 2
                 "bracket": 2,
                 "current_price": 0.001
-            }
-        )
-        
-        test_coin_2 = db_manager.create_or_update_coin(
-            address="0x456def", 
-            data={
+            },
+            "0x456def": {
                 "name": "ANOTHERCOIN",
                 "market_cap": 50000,  # This will be bracket 1
                 "bracket": 1,
                 "current_price": 0.0005
             }
-        )
+        })
+        test_coin_1 = coins["0x123abc"]
+        test_coin_2 = coins["0x456def"]
         
         # Create test orders for the coins
         # For TESTCOIN (bracket 2), create orders with bracket 2 entries
@@ -85,8 +85,7 @@ def setup_test_data():
             }
         ]
         
-        for order_data in test_orders:
-            db_manager.create_order(order_data)
+        db_manager.bulk_create_orders(test_orders)
         
         logger.info("Test data setup complete")
         logger.info(f"Created coin: {test_coin_1.name} (ID: {test_coin_1.id}, Bracket: {test_coin_1.bracket})")
@@ -99,36 +98,36 @@ def setup_test_data():
         logger.error(f"Error setting up test data: {e}")
         return None, None
 
+# Sample order_info that simulates what would come from the BullX automation page, built once at import.
+# Each row has 11 columns: side, type, token, amount, cost, avg exec, expiry, wallets, transactions, trigger condition, status
+# Side: "S" or "B", Type: "Auto Sell" or "Buy Limit", etc. The mappings are read-only so callers can't alter the shared sample.
+_SAMPLE_ORDER_INFO = (
+    MappingProxyType({
+        "button_index": 1,
+        "rows": (
+            MappingProxyType({
+                "main_text": "B\nAuto Buy\nTESTCOIN\n100.0\n$50.00\n$0.0005\n12h 30m 15s\nWallet1\n5\nBuy below $131k\nActive",
+                "href": "https://bullx.io/order/123"
+            }),
+            MappingProxyType({
+                "main_text": "S\nAuto Sell\nTESTCOIN\n50.0 TESTCOIN\n$25.00\n$0.0005\n00h 00m 00s\nWallet1\n3\n1 TP, 1 SL\nCompleted",
+                "href": "https://bullx.io/order/124"
+            }),
+            MappingProxyType({
+                "main_text": "B\nBuy Limit\nTESTCOIN\n75.0\n$37.50\n$0.0005\n00h 00m 00s\nWallet1\n4\nBuy below $231k\nExpired",
+                "href": "https://bullx.io/order/125"
+            }),
+            MappingProxyType({
+                "main_text": "S\nAuto Sell\nANOTHERCOIN\n200.0\n$100.00\n$0.0005\n05h 15m 30s\nWallet2\n2\nBuy below $13.1k\nActive",
+                "href": "https://bullx.io/order/126"
+            })
+        )
+    }),
+)
+
 def create_sample_order_info():
-    """Create sample order_info data that simulates what would come from BullX automation page"""
-    
-    # This simulates the real structure with 11 columns: side, type, token, amount, cost, avg exec, expiry, wallets, transactions, trigger condition, status
-    # Side: "S" or "B", Type: "Auto Sell" or "Buy Limit", etc.
-    sample_order_info = [
-        {
-            "button_index": 1,
-            "rows": [
-                {
-                    "main_text": "B\nAuto Buy\nTESTCOIN\n100.0\n$50.00\n$0.0005\n12h 30m 15s\nWallet1\n5\nBuy below $131k\nActive",
-                    "href": "https://bullx.io/order/123"
-                },
-                {
-                    "main_text": "S\nAuto Sell\nTESTCOIN\n50.0 TESTCOIN\n$25.00\n$0.0005\n00h 00m 00s\nWallet1\n3\n1 TP, 1 SL\nCompleted",
-                    "href": "https://bullx.io/order/124"
-                },
-                {
-                    "main_text": "B\nBuy Limit\nTESTCOIN\n75.0\n$37.50\n$0.0005\n00h 00m 00s\nWallet1\n4\nBuy below $231k\nExpired",
-                    "href": "https://bullx.io/order/125"
-                },
-                {
-                    "main_text": "S\nAuto Sell\nANOTHERCOIN\n200.0\n$100.00\n$0.0005\n05h 15m 30s\nWallet2\n2\nBuy below $13.1k\nActive",
-                    "href": "https://bullx.io/order/126"
-                }
-            ]
-        }
-    ]
-    
-    return sample_order_info
+    """Return the shared sample order_info data that simulates the BullX automation page"""
+    return _SAMPLE_ORDER_INFO
 
 async def test_enhanced_processing():
     """Test the enhanced order processing function"""
@@ -157,7 +156,9 @@ async def test_enhanced_processing():
 
 async def main():
     """Main test function"""
+    create_tables()
     await test_enhanced_processing()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop when available (not on Windows), like the API server
+    (uvloop.run if uvloop else asyncio.run)(main())
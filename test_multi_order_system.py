@@ -3,20 +3,45 @@ Test script for the multi-order bracket system.
 This script tests the core functionality without requiring a full server setup.
 """
 
+import math
+import sys
+from bisect import bisect_right
+from types import MappingProxyType
+
+from bracket_config import TRADE_SIZES, calculate_order_parameters
+
+# Market cap range and description of brackets 1-5, in bracket order
+BRACKET_INFO = (
+    MappingProxyType({"min": 0, "max": 100000, "description": "Micro Cap (< 100K)"}),
+    MappingProxyType({"min": 100000, "max": 500000, "description": "Small Cap (100K - 500K)"}),
+    MappingProxyType({"min": 500000, "max": 1000000, "description": "Medium Cap (500K - 1M)"}),
+    MappingProxyType({"min": 1000000, "max": 5000000, "description": "Large Cap (1M - 5M)"}),
+    MappingProxyType({"min": 5000000, "max": math.inf, "description": "Mega Cap (> 5M)"}),
+)
+
+# Result line printed for each bracket calculation case
+BRACKET_ROW_TEMPLATE = "{status} Market Cap: ${market_cap:,} -> Bracket {bracket} ({description})"
+
+# (used bracket_ids as a set or bitmask, how they are printed, expected next bracket_id, description)
+NEXT_BRACKET_ID_CASES = (
+    (frozenset(), "[]", 1, "No orders active"),
+    (frozenset({1}), "[1]", 2, "Bracket 1 used"),
+    (frozenset({1, 3}), "[1, 3]", 2, "Brackets 1,3 used"),
+    (frozenset({2, 3, 4}), "[2, 3, 4]", 1, "Brackets 2,3,4 used"),
+    (frozenset({1, 2, 3, 4}), "[1, 2, 3, 4]", None, "All brackets used"),
+    (0b0000, "0000", 1, "No orders active (mask)"),
+    (0b0101, "0101", 2, "Brackets 1,3 used (mask)"),
+    (0b1110, "1110", 1, "Brackets 2,3,4 used (mask)"),
+    (0b1111, "1111", None, "All brackets used (mask)")
+)
+
 def test_bracket_calculation():
     """Test the bracket calculation logic"""
+    thresholds = (100000, 500000, 1000000, 5000000)  # 100K, 500K, 1M, 5M
+    
     def calculate_bracket(market_cap: float) -> int:
         """Calculate bracket based on market cap"""
-        if market_cap < 100000:  # < 100K
-            return 1
-        elif market_cap < 500000:  # 100K - 500K
-            return 2
-        elif market_cap < 1000000:  # 500K - 1M
-            return 3
-        elif market_cap < 5000000:  # 1M - 5M
-            return 4
-        else:  # > 5M
-            return 5
+        return bisect_right(thresholds, market_cap) + 1
     
     test_cases = [
         (50000, 1, "Micro Cap"),
@@ -34,6 +59,7 @@ def test_bracket_calculation():
     print("Testing bracket calculation...")
     all_passed = True
     
+    lines = []
     for market_cap, expected_bracket, description in test_cases:
         actual_bracket = calculate_bracket(market_cap)
         status = "✓" if actual_bracket == expected_bracket else "❌"
@@ -41,22 +67,18 @@ def test_bracket_calculation():
         if actual_bracket != expected_bracket:
             all_passed = False
         
-        print(f"{status} Market Cap: ${market_cap:,} -> Bracket {actual_bracket} ({description})")
+        lines.append(BRACKET_ROW_TEMPLATE.format(
+            status=status, market_cap=market_cap, bracket=actual_bracket, description=description
+        ))
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    return all_passed
+    assert all_passed, "Some market caps mapped to the wrong bracket"
 
 def test_bracket_info():
     """Test bracket information structure"""
     def get_bracket_info(bracket: int) -> dict:
         """Get bracket information"""
-        bracket_ranges = {
-            1: {"min": 0, "max": 100000, "description": "Micro Cap (< 100K)"},
-            2: {"min": 100000, "max": 500000, "description": "Small Cap (100K - 500K)"},
-            3: {"min": 500000, "max": 1000000, "description": "Medium Cap (500K - 1M)"},
-            4: {"min": 1000000, "max": 5000000, "description": "Large Cap (1M - 5M)"},
-            5: {"min": 5000000, "max": float('inf'), "description": "Mega Cap (> 5M)"}
-        }
-        return bracket_ranges.get(bracket, bracket_ranges[1])
+        return BRACKET_INFO[bracket - 1] if 1 <= bracket <= 5 else BRACKET_INFO[0]
     
     print("\nTesting bracket information...")
     
@@ -64,8 +86,6 @@ def test_bracket_info():
         info = get_bracket_info(bracket)
         print(f"✓ Bracket {bracket}: {info['description']} "
               f"(${info['min']:,} - ${info['max']:,})")
-    
-    return True
 
 def test_bracket_id_validation():
     """Test bracket_id validation logic"""
@@ -99,6 +119,7 @@ def test_bracket_id_validation():
     
     all_passed = True
     
+    lines = []
     for bracket_ids, expected_valid, description in test_cases:
         is_valid, message = validate_bracket_ids(bracket_ids)
         status = "✓" if is_valid == expected_valid else "❌"
@@ -106,104 +127,60 @@ def test_bracket_id_validation():
         if is_valid != expected_valid:
             all_passed = False
         
-        print(f"{status} {description}: {bracket_ids} -> {message}")
+        lines.append(f"{status} {description}: {bracket_ids} -> {message}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    return all_passed
+    assert all_passed, "Some bracket_id lists were validated incorrectly"
 
 def test_order_amount_calculation():
     """Test order amount calculation by bracket"""
-    def calculate_order_amounts_by_bracket(bracket: int, total_investment: float) -> list:
-        """Calculate order amounts based on bracket (market cap category)"""
-        
-        if bracket == 1:  # Micro Cap (< 100K) - High risk, smaller amounts
-            return [
-                total_investment * 0.15,  # 15% for bracket_id 1
-                total_investment * 0.20,  # 20% for bracket_id 2
-                total_investment * 0.25,  # 25% for bracket_id 3
-                total_investment * 0.40   # 40% for bracket_id 4
-            ]
-        
-        elif bracket == 2:  # Small Cap (100K - 500K) - Medium risk
-            return [
-                total_investment * 0.20,  # 20% for bracket_id 1
-                total_investment * 0.25,  # 25% for bracket_id 2
-                total_investment * 0.25,  # 25% for bracket_id 3
-                total_investment * 0.30   # 30% for bracket_id 4
-            ]
-        
-        elif bracket == 3:  # Medium Cap (500K - 1M) - Balanced
-            return [
-                total_investment * 0.25,  # 25% for each bracket_id
-                total_investment * 0.25,
-                total_investment * 0.25,
-                total_investment * 0.25
-            ]
-        
-        elif bracket == 4:  # Large Cap (1M - 5M) - Lower risk, larger amounts
-            return [
-                total_investment * 0.30,  # 30% for bracket_id 1
-                total_investment * 0.25,  # 25% for bracket_id 2
-                total_investment * 0.25,  # 25% for bracket_id 3
-                total_investment * 0.20   # 20% for bracket_id 4
-            ]
-        
-        else:  # Mega Cap (> 5M) - Very conservative
-            return [
-                total_investment * 0.40,  # 40% for bracket_id 1
-                total_investment * 0.30,  # 30% for bracket_id 2
-                total_investment * 0.20,  # 20% for bracket_id 3
-                total_investment * 0.10   # 10% for bracket_id 4
-            ]
-    
     print("\nTesting order amount calculation...")
     
     total_investment = 1000  # $1000 test investment
+    # Every bracket splits the investment by the same TRADE_SIZES
+    expected_total = total_investment * sum(TRADE_SIZES)
     
     for bracket in range(1, 6):
-        amounts = calculate_order_amounts_by_bracket(bracket, total_investment)
-        total_percentage = sum(amounts) / total_investment
+        amounts = [order["amount"] for order in calculate_order_parameters(bracket, total_investment)]
+        total = sum(amounts)
         
         print(f"✓ Bracket {bracket}: {[f'${amt:.0f}' for amt in amounts]} "
-              f"(Total: {total_percentage:.0%})")
+              f"(Total: ${total:.2f})")
         
-        # Verify total adds up to 100%
-        if abs(total_percentage - 1.0) > 0.001:  # Allow for small floating point errors
-            print(f"❌ Warning: Bracket {bracket} percentages don't add up to 100%")
-            return False
-    
-    return True
+        # Verify the amounts returned for the four bracket_ids add up to the trade size total
+        assert math.isclose(total, expected_total, abs_tol=0.01), \
+            f"Bracket {bracket} amounts total ${total:.2f}, expected ${expected_total:.2f}"
 
 def test_next_bracket_id_logic():
     """Test the logic for finding next available bracket_id"""
-    def get_next_bracket_id(used_bracket_ids: set) -> int:
-        """Get the next available bracket_id (1-4)"""
-        for bracket_id in range(1, 5):
-            if bracket_id not in used_bracket_ids:
-                return bracket_id
-        return None  # All bracket_ids are used
+    def get_next_bracket_id(used_bracket_ids) -> int:
+        """Get the next available bracket_id (1-4) from a set of used ids or a bitmask of them"""
+        if isinstance(used_bracket_ids, int):
+            used_mask = used_bracket_ids
+        else:
+            used_mask = sum(1 << (bracket_id - 1) for bracket_id in used_bracket_ids)
+        
+        free_mask = ~used_mask & 0xF
+        if not free_mask:
+            return None  # All bracket_ids are used
+        return (free_mask & -free_mask).bit_length()  # Lowest free bit
     
     print("\nTesting next bracket_id logic...")
     
-    test_cases = [
-        (set(), 1, "No orders active"),
-        ({1}, 2, "Bracket 1 used"),
-        ({1, 3}, 2, "Brackets 1,3 used"),
-        ({2, 3, 4}, 1, "Brackets 2,3,4 used"),
-        ({1, 2, 3, 4}, None, "All brackets used")
-    ]
-    
     all_passed = True
     
-    for used_ids, expected, description in test_cases:
+    lines = []
+    for used_ids, used_label, expected, description in NEXT_BRACKET_ID_CASES:
         result = get_next_bracket_id(used_ids)
         status = "✓" if result == expected else "❌"
         
         if result != expected:
             all_passed = False
         
-        print(f"{status} {description}: Used {sorted(used_ids)} -> Next: {result}")
+        lines.append(f"{status} {description}: Used {used_label} -> Next: {result}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    return all_passed
+    assert all_passed, "Some next bracket_id lookups returned the wrong id"
 
 def run_all_tests():
     """Run all tests"""
@@ -223,8 +200,11 @@ def run_all_tests():
     
     for test_name, test_func in tests:
         try:
-            result = test_func()
-            results.append((test_name, result))
+            test_func()
+            results.append((test_name, True))
+        except AssertionError as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
         except Exception as e:
             print(f"❌ {test_name} failed with error: {e}")
             results.append((test_name, False))
@@ -233,14 +213,12 @@ def run_all_tests():
     print("Test Results Summary")
     print("=" * 60)
     
-    passed = 0
+    passed = sum(1 for _, result in results if result)
     total = len(results)
     
-    for test_name, result in results:
-        status = "✓ PASSED" if result else "❌ FAILED"
-        print(f"{status}: {test_name}")
-        if result:
-            passed += 1
+    sys.stdout.write("\n".join(
+        f"{'✓ PASSED' if result else '❌ FAILED'}: {test_name}" for test_name, result in results
+    ) + "\n")
     
     print(f"\nOverall: {passed}/{total} tests passed")
     
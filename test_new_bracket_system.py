@@ -2,12 +2,26 @@
 Test script for the updated bracket system with new market cap ranges and configurations.
 """
 
+import sys
+
 from bracket_config import (
     calculate_bracket, get_bracket_info, calculate_order_parameters,
     BRACKET_CONFIG, BRACKET_RANGES, TRADE_SIZES, TAKE_PROFIT_PERCENTAGES,
     validate_bracket_config
 )
 
+# Result line printed for each bracket calculation case
+BRACKET_ROW_TEMPLATE = "{status} Market Cap: ${market_cap:,} -> Bracket {bracket} ({description})"
+
+# (min, max, description) of brackets 1-5, in bracket order
+EXPECTED_BRACKET_RANGES = (
+    (20000, 199999, "Micro Cap (20K - 200K)"),
+    (200000, 1999999, "Small Cap (200K - 2M)"),
+    (2000000, 19999999, "Medium Cap (2M - 20M)"),
+    (20000000, 119999999, "Large Cap (20M - 120M)"),
+    (120000000, 1199999999, "Mega Cap (120M - 1.2B)")
+)
+
 def test_new_bracket_calculation():
     """Test the new bracket calculation logic"""
     print("Testing new bracket calculation...")
@@ -46,36 +60,32 @@ def test_new_bracket_calculation():
         (2000000000, 1, "Above maximum - defaults to 1")
     ]
     
-    all_passed = True
+    # Classify every market cap in one pass, then compare the whole column at once
+    market_caps, expected_brackets, descriptions = zip(*test_cases)
+    actual_brackets = tuple(map(calculate_bracket, market_caps))
+    all_passed = actual_brackets == expected_brackets
     
-    for market_cap, expected_bracket, description in test_cases:
-        actual_bracket = calculate_bracket(market_cap)
+    lines = []
+    for market_cap, expected_bracket, actual_bracket, description in zip(
+        market_caps, expected_brackets, actual_brackets, descriptions
+    ):
         status = "✓" if actual_bracket == expected_bracket else "❌"
-        
-        if actual_bracket != expected_bracket:
-            all_passed = False
-        
-        print(f"{status} Market Cap: ${market_cap:,} -> Bracket {actual_bracket} ({description})")
+        lines.append(BRACKET_ROW_TEMPLATE.format(
+            status=status, market_cap=market_cap, bracket=actual_bracket, description=description
+        ))
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    return all_passed
+    assert all_passed, "Some market caps mapped to the wrong bracket"
 
 def test_bracket_info():
     """Test bracket information with new ranges"""
     print("\nTesting bracket information...")
     
-    expected_ranges = {
-        1: (20000, 199999, "Micro Cap (20K - 200K)"),
-        2: (200000, 1999999, "Small Cap (200K - 2M)"),
-        3: (2000000, 19999999, "Medium Cap (2M - 20M)"),
-        4: (20000000, 119999999, "Large Cap (20M - 120M)"),
-        5: (120000000, 1199999999, "Mega Cap (120M - 1.2B)")
-    }
-    
     all_passed = True
     
     for bracket in range(1, 6):
         info = get_bracket_info(bracket)
-        expected_min, expected_max, expected_desc = expected_ranges[bracket]
+        expected_min, expected_max, expected_desc = EXPECTED_BRACKET_RANGES[bracket - 1]
         
         if (info["min_market_cap"] == expected_min and 
             info["max_market_cap"] == expected_max and 
@@ -86,14 +96,14 @@ def test_bracket_info():
             print(f"❌ Bracket {bracket}: Expected {expected_desc}, got {info['description']}")
             all_passed = False
     
-    return all_passed
+    assert all_passed, "Some bracket ranges or descriptions do not match"
 
 def test_trade_sizes_and_take_profits():
     """Test trade sizes and take profit percentages"""
     print("\nTesting trade sizes and take profit percentages...")
     
     expected_trade_sizes = [0.3333, 0.3333, 0.1667, 0.1667]
-    expected_take_profits = [1.12, 0.89, 0.81, 0.56]  # 112%, 89%, 81%, 56%
+    expected_take_profits = (1.12, 0.89, 0.81, 0.56)  # 112%, 89%, 81%, 56%
     
     print("Trade sizes (should sum to ~1.0):")
     total_trade_size = sum(TRADE_SIZES)
@@ -106,8 +116,9 @@ def test_trade_sizes_and_take_profits():
     for i, tp in enumerate(TAKE_PROFIT_PERCENTAGES):
         print(f"  Bracket ID {i+1}: {tp:.2f} ({tp*100:.1f}%)")
     
-    # Validate
-    trade_sizes_ok = abs(total_trade_size - 1.0) < 0.001
+    # Validate in whole basis points (10000 = 100%); the sizes are reciprocals, so allow 10 bp (0.1%)
+    total_trade_size_bp = sum(round(size * 10000) for size in TRADE_SIZES)
+    trade_sizes_ok = abs(total_trade_size_bp - 10000) <= 10
     take_profits_ok = TAKE_PROFIT_PERCENTAGES == expected_take_profits
     
     status_trade = "✓" if trade_sizes_ok else "❌"
@@ -116,7 +127,8 @@ def test_trade_sizes_and_take_profits():
     print(f"\n{status_trade} Trade sizes sum to 100%: {trade_sizes_ok}")
     print(f"{status_tp} Take profit percentages match expected: {take_profits_ok}")
     
-    return trade_sizes_ok and take_profits_ok
+    assert trade_sizes_ok, "Trade sizes do not sum to 100%"
+    assert take_profits_ok, "Take profit percentages do not match"
 
 def test_bracket_specific_configs():
     """Test bracket-specific configurations"""
@@ -148,7 +160,7 @@ def test_bracket_specific_configs():
         print(f"    Stop loss MC: {config['stop_loss_market_cap']:,}")
         print(f"    Entries: {config['entries']}")
     
-    return all_passed
+    assert all_passed, "Some bracket stop losses or entries do not match"
 
 def test_order_parameter_calculation():
     """Test order parameter calculation"""
@@ -162,7 +174,7 @@ def test_order_parameter_calculation():
     
     order_params = calculate_order_parameters(bracket, total_amount)
     
-    expected_amounts = [333.3, 333.3, 166.7, 166.7]  # Based on trade sizes
+    expected_amounts = [total_amount * size for size in TRADE_SIZES]  # Based on trade sizes
     
     all_passed = True
     
@@ -187,7 +199,7 @@ def test_order_parameter_calculation():
         print(f"      Take Profit: {take_profit:,}")
         print(f"      Stop Loss: {stop_loss:,}")
     
-    return all_passed
+    assert all_passed, "Some order amounts do not match the trade sizes"
 
 def test_config_validation():
     """Test configuration validation"""
@@ -197,12 +209,12 @@ def test_config_validation():
     
     if not errors:
         print("✓ Configuration validation passed - no errors found")
-        return True
     else:
         print("❌ Configuration validation failed:")
         for error in errors:
             print(f"    - {error}")
-        return False
+    
+    assert not errors, f"{len(errors)} configuration error(s) found"
 
 def run_all_tests():
     """Run all tests for the new bracket system"""
@@ -223,8 +235,11 @@ def run_all_tests():
     
     for test_name, test_func in tests:
         try:
-            result = test_func()
-            results.append((test_name, result))
+            test_func()
+            results.append((test_name, True))
+        except AssertionError as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
         except Exception as e:
             print(f"❌ {test_name} failed with error: {e}")
             results.append((test_name, False))
@@ -233,14 +248,12 @@ def run_all_tests():
     print("Test Results Summary")
     print("=" * 70)
     
-    passed = 0
+    passed = sum(1 for _, result in results if result)
     total = len(results)
     
-    for test_name, result in results:
-        status = "✓ PASSED" if result else "❌ FAILED"
-        print(f"{status}: {test_name}")
-        if result:
-            passed += 1
+    sys.stdout.write("\n".join(
+        f"{'✓ PASSED' if result else '❌ FAILED'}: {test_name}" for test_name, result in results
+    ) + "\n")
     
     print(f"\nOverall: {passed}/{total} tests passed")
     
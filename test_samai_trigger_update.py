@@ -6,47 +6,77 @@ Test script to simulate SAMAI trigger condition update from entry to TP
 from database import db_manager
 from enhanced_order_processing import enhanced_order_processor
 from models import Order, Coin
+from logging.handlers import QueueHandler, QueueListener
 import asyncio
+import logging
+import queue
+
+logger = logging.getLogger(__name__)
+
+TEST_SAMAI_ADDRESS = "test_samai_address"
+ENTRY_TRIGGER_CONDITION = "Buy below $131K"  # Initial entry condition
 
 def create_test_samai_order():
-    """Create a test SAMAI order with entry trigger condition"""
+    """Create a test SAMAI order with entry trigger condition
+
+    The coin and order are written in one transaction, and an ACTIVE test order
+    left behind by an interrupted run is reused instead of inserting another.
+    """
+    db = db_manager.SessionLocal()
     try:
         print("🧪 Creating test SAMAI order...")
         
         # Create or get SAMAI coin
-        coin = db_manager.create_or_update_coin(
-            address="test_samai_address",
-            data={
-                "name": "SAMAI",
-                "bracket": 2,  # Example bracket
-                "market_cap": 50000000  # 50M market cap
-            }
-        )
+        coin = db.query(Coin).filter(Coin.address == TEST_SAMAI_ADDRESS).first()
+        if not coin:
+            coin = Coin(
+                address=TEST_SAMAI_ADDRESS,
+                name="SAMAI",
+                bracket=2,  # Example bracket
+                market_cap=50000000  # 50M market cap
+            )
+            db.add(coin)
+            db.flush()  # Get the coin ID without committing
         
-        # Create test order with entry trigger condition
-        order_data = {
-            "coin_id": coin.id,
-            "strategy_number": 1,
-            "order_type": "BUY_LIMIT",
-            "bracket_id": 1,
-            "market_cap": 50000000,
-            "entry_price": 131000,
-            "take_profit": 200000,
-            "stop_loss": 25000000,
-            "amount": 1.0,
-            "profile_name": "Saruman",
-            "status": "ACTIVE",
-            "trigger_condition": "Buy below $131K"  # Initial entry condition
-        }
+        order = db.query(Order).filter(
+            Order.coin_id == coin.id,
+            Order.status == "ACTIVE"
+        ).first()
         
-        order = db_manager.create_order(order_data)
+        if order:
+            # Start from the entry condition again, whatever the earlier run left behind
+            order.trigger_condition = ENTRY_TRIGGER_CONDITION
+        else:
+            # Create test order with entry trigger condition
+            order = Order(
+                coin_id=coin.id,
+                strategy_number=1,
+                order_type="BUY_LIMIT",
+                bracket_id=1,
+                market_cap=50000000,
+                entry_price=131000,
+                take_profit=200000,
+                stop_loss=25000000,
+                amount=1.0,
+                profile_name="Saruman",
+                status="ACTIVE",
+                trigger_condition=ENTRY_TRIGGER_CONDITION
+            )
+            db.add(order)
+        
+        db.commit()
+        db.refresh(coin)
+        db.refresh(order)
         print(f"✅ Created test order ID {order.id} with trigger: '{order.trigger_condition}'")
         
         return order, coin
         
     except Exception as e:
+        db.rollback()
         print(f"💥 Error creating test order: {e}")
         return None, None
+    finally:
+        db.close()
 
 def simulate_bullx_data():
     """Simulate BullX data showing SAMAI with TP condition"""
@@ -100,20 +130,18 @@ async def test_trigger_condition_update():
             print(f"   Method: {order_match.get('identification_method', 'Unknown')}")
             
             # Step 4: Check if trigger condition was updated
-            updated_order = db_manager.get_order_with_coin(matched_order.id)
-            if updated_order:
-                print(f"\n📝 After identification:")
-                print(f"   Trigger condition: '{updated_order.trigger_condition}'")
-                print(f"   Updated at: {updated_order.updated_at}")
-                
-                if updated_order.trigger_condition == bullx_data['trigger_condition']:
-                    print("✅ Trigger condition successfully updated!")
-                else:
-                    print("❌ Trigger condition NOT updated")
-                    print(f"   Expected: '{bullx_data['trigger_condition']}'")
-                    print(f"   Actual: '{updated_order.trigger_condition}'")
+            # _identify_order loaded the matched order from the database and writes
+            # nothing itself, so it already holds the stored state; no need to re-fetch
+            print(f"\n📝 After identification:")
+            print(f"   Trigger condition: '{matched_order.trigger_condition}'")
+            print(f"   Updated at: {matched_order.updated_at}")
+            
+            if matched_order.trigger_condition == bullx_data['trigger_condition']:
+                print("✅ Trigger condition successfully updated!")
             else:
-                print("❌ Could not retrieve updated order")
+                print("❌ Trigger condition NOT updated")
+                print(f"   Expected: '{bullx_data['trigger_condition']}'")
+                print(f"   Actual: '{matched_order.trigger_condition}'")
         else:
             print("❌ Order identification failed")
             print("   This explains why SAMAI trigger conditions are not being updated")
@@ -125,11 +153,19 @@ async def test_trigger_condition_update():
         
     except Exception as e:
         print(f"💥 Error in test: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in trigger condition update test")
 
 async def main():
     await test_trigger_condition_update()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Log through a queue; the listener thread does the stderr writes for the event loop.
+    # Set up here rather than at import, so importing this module starts no thread
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+    log_listener.start()
+    try:
+        asyncio.run(main())
+    finally:
+        log_listener.stop()
@@ -3,19 +3,37 @@
 Debug script to check trigger_condition field and database updates
 """
 
-from database import db_manager
+from database import db_manager, engine
 from models import Order
 from sqlalchemy import inspect
 import sys
 
+# Checked once on the mapped class; the model can't change while the script runs
+HAS_TRIGGER = hasattr(Order, 'trigger_condition')
+
+# Inspector for the application engine, built on first use. It memoizes what it
+# reflects, so the columns are read from the database once per inspector.
+_inspector = None
+
+def _get_inspector():
+    """Return the shared Inspector, creating it the first time"""
+    global _inspector
+    if _inspector is None:
+        _inspector = inspect(engine)
+    return _inspector
+
+def refresh():
+    """Drop the cached Inspector, e.g. after a migration changed the schema"""
+    global _inspector
+    _inspector = None
+
 def check_database_schema():
     """Check if trigger_condition column exists"""
     print("🔍 Checking database schema...")
     
     try:
-        engine = db_manager.SessionLocal().bind
-        inspector = inspect(engine)
-        columns = inspector.get_columns('orders')
+        # The module's engine directly, instead of opening a session just to read its bind
+        columns = _get_inspector().get_columns('orders')
         
         print(f"📋 Found {len(columns)} columns in orders table:")
         for col in columns:
@@ -39,14 +57,14 @@ def check_active_orders():
     print("\n🔍 Checking active orders...")
     
     try:
-        orders = db_manager.get_active_orders()
-        print(f"📋 Found {len(orders)} active orders:")
+        # Count in SQL, then stream just the printed columns instead of loading every Order
+        order_count = db_manager.count_active_orders()
+        print(f"📋 Found {order_count} active orders:")
         
-        for order in orders:
-            trigger = order.trigger_condition if hasattr(order, 'trigger_condition') else 'NO ATTRIBUTE'
-            print(f"  Order {order.id}: trigger_condition = '{trigger}' | updated_at = {order.updated_at}")
+        for order_id, trigger, updated_at in db_manager.iter_active_order_triggers():
+            print(f"  Order {order_id}: trigger_condition = '{trigger}' | updated_at = {updated_at}")
             
-        return len(orders)
+        return order_count
         
     except Exception as e:
         print(f"💥 Error checking orders: {e}")
@@ -63,43 +81,38 @@ def test_trigger_update():
             return False
         
         test_order = orders[0]
-        original_trigger = test_order.trigger_condition if hasattr(test_order, 'trigger_condition') else None
+        original_trigger = test_order.trigger_condition if HAS_TRIGGER else None
         test_trigger = "TEST: 1 TP, 1 SL"
         
         print(f"📝 Testing with Order {test_order.id}")
         print(f"   Original trigger: '{original_trigger}'")
         print(f"   Test trigger: '{test_trigger}'")
         
-        # Test the update
+        # Test the update through the same method the SAMAI trigger update uses
         success = db_manager.update_order_trigger_condition(test_order.id, test_trigger)
+        if not success:
+            print("❌ Update method returned failure")
+            return False
         
-        if success:
-            print("✅ Update method returned success")
-            
+        print("✅ Update method returned success")
+        try:
             # Verify the update
             updated_order = db_manager.get_order_with_coin(test_order.id)
-            if updated_order and hasattr(updated_order, 'trigger_condition'):
-                actual_trigger = updated_order.trigger_condition
-                print(f"   Verified trigger: '{actual_trigger}'")
-                
-                if actual_trigger == test_trigger:
-                    print("✅ Trigger condition successfully updated!")
-                    
-                    # Restore original
-                    if original_trigger:
-                        db_manager.update_order_trigger_condition(test_order.id, original_trigger)
-                        print(f"🔄 Restored original trigger: '{original_trigger}'")
-                    
-                    return True
-                else:
-                    print(f"❌ Trigger not updated correctly. Expected: '{test_trigger}', Got: '{actual_trigger}'")
-            else:
-                print("❌ Could not verify update - order not found or no trigger_condition attribute")
-        else:
-            print("❌ Update method returned failure")
+            actual_trigger = updated_order.trigger_condition if updated_order else None
+            print(f"   Verified trigger: '{actual_trigger}'")
             
-        return False
+            assert actual_trigger == test_trigger, \
+                f"Trigger not updated correctly. Expected: '{test_trigger}', Got: '{actual_trigger}'"
+            print("✅ Trigger condition successfully updated!")
+            return True
+        finally:
+            # Restore original (even if it was empty or the check failed) through the same method
+            restored = db_manager.update_order_trigger_condition(test_order.id, original_trigger)
+            print(f"🔄 Restored original trigger: '{original_trigger}' ({'ok' if restored else 'failed'})")
         
+    except AssertionError as e:
+        print(f"❌ {e}")
+        return False
     except Exception as e:
         print(f"💥 Error testing trigger update: {e}")
         import traceback
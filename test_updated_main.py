@@ -5,8 +5,10 @@ Test script to verify the updated main.py with enhanced background task system
 
 import asyncio
 import logging
+import queue
 import sys
 import os
+from logging.handlers import QueueHandler, QueueListener
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,8 +17,6 @@ from background_task_monitor import enhanced_order_monitor
 from database import db_manager, create_tables, init_profiles
 from main import start_monitoring_for_active_profiles, ensure_monitoring_for_profile
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def test_updated_system():
@@ -86,25 +86,16 @@ async def test_updated_system():
         print("ALL TESTS COMPLETED SUCCESSFULLY!")
         print("=" * 60)
         
-        # Final status
+        # Final status, read from one consistent snapshot instead of three separate attributes
+        status = enhanced_order_monitor.snapshot()
         print(f"\nFinal Status:")
-        print(f"- Scheduler running: {enhanced_order_monitor.is_running}")
-        print(f"- Monitored profiles: {list(enhanced_order_monitor.monitored_profiles)}")
-        print(f"- Task timeout: {enhanced_order_monitor.task_timeout} seconds")
+        print(f"- Scheduler running: {status.scheduler_running}")
+        print(f"- Monitored profiles: {list(status.monitored_profiles)}")
+        print(f"- Task timeout: {status.task_timeout} seconds")
         
     except Exception as e:
         print(f"\n✗ Test failed with error: {e}")
-        logger.error(f"Test error: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    finally:
-        # Cleanup
-        try:
-            await enhanced_order_monitor.stop_monitoring()
-            print("\n✓ Cleanup completed - all monitoring stopped")
-        except Exception as e:
-            print(f"\n⚠ Cleanup warning: {e}")
+        logger.exception("Test error")
 
 async def test_middleware_simulation():
     """Simulate the middleware behavior"""
@@ -117,12 +108,17 @@ async def test_middleware_simulation():
         # Simulate what happens when a user makes an API call
         print("\n1. Simulating user API call with profile...")
         
-        # Stop all monitoring first
-        await enhanced_order_monitor.stop_monitoring()
-        print("✓ Stopped all monitoring")
-        
         # Simulate middleware detecting a profile and ensuring monitoring
         test_profile = "Gandalf"
+        
+        # Only the test profile's job is removed; the others are paused, so the scheduler
+        # keeps running instead of being shut down and started again
+        paused_profiles = [p for p in enhanced_order_monitor.monitored_profiles if p != test_profile]
+        for profile_name in paused_profiles:
+            await enhanced_order_monitor.pause_profile(profile_name)
+        await enhanced_order_monitor.stop_monitoring_for_profile(test_profile)
+        print(f"✓ Stopped monitoring for {test_profile}, paused {paused_profiles}")
+        
         print(f"Simulating API call from profile: {test_profile}")
         
         await ensure_monitoring_for_profile(test_profile)
@@ -134,8 +130,8 @@ async def test_middleware_simulation():
         
         # Test multiple calls don't create duplicates
         print("\n2. Testing multiple API calls from same profile...")
-        await ensure_monitoring_for_profile(test_profile)
-        await ensure_monitoring_for_profile(test_profile)
+        # Concurrent, like simultaneous requests from one profile hitting the middleware
+        await asyncio.gather(*(ensure_monitoring_for_profile(test_profile) for _ in range(3)))
         
         profile_count = len([p for p in enhanced_order_monitor.monitored_profiles if p == test_profile])
         if profile_count == 1:
@@ -143,20 +139,42 @@ async def test_middleware_simulation():
         else:
             print(f"✗ Multiple calls created duplicates: {profile_count}")
         
+        for profile_name in paused_profiles:
+            await enhanced_order_monitor.resume_profile(profile_name)
+        
         print("\n✓ Middleware simulation tests completed")
         
     except Exception as e:
         print(f"\n✗ Middleware simulation failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Middleware simulation error")
+
+async def main():
+    """Run both phases on one event loop and one monitor, stopping it once at the end"""
+    try:
+        await test_updated_system()
+        await test_middleware_simulation()
+    finally:
+        # Cleanup
+        try:
+            await enhanced_order_monitor.stop_monitoring()
+            print("\n✓ Cleanup completed - all monitoring stopped")
+        except Exception as e:
+            print(f"\n⚠ Cleanup warning: {e}")
 
 if __name__ == "__main__":
     print("Updated Main.py Test Suite")
     print("=" * 80)
     
-    # Run the tests
-    asyncio.run(test_updated_system())
-    asyncio.run(test_middleware_simulation())
+    # Queued logging with its listener thread only for direct runs, not on import
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+    log_listener.start()
+    try:
+        # Run the tests
+        asyncio.run(main())
+    finally:
+        log_listener.stop()
     
     print("\n" + "=" * 80)
     print("TEST SUITE COMPLETED")